@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from apps.core.partitions import MONTHS_AHEAD, ensure_upcoming_partitions, is_supported
+
+
+class Command(BaseCommand):
+    help = (
+        "Pre-create monthly partitions of daily_logs and food_entries (PostgreSQL only)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months",
+            type=int,
+            default=MONTHS_AHEAD,
+            help="Create partitions through this many months after the current one",
+        )
+
+    def handle(self, *args, **options):
+        if not is_supported(connection):
+            self.stdout.write("Partitioning needs PostgreSQL; nothing to do.")
+            return
+
+        created = ensure_upcoming_partitions(connection, months_ahead=options["months"])
+        for table, names in created.items():
+            for name in names:
+                self.stdout.write(f"Created {name}")
+
+        total = sum(len(names) for names in created.values())
+        self.stdout.write(self.style.SUCCESS(f"Created {total} partition(s)."))
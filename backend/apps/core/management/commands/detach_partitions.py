@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils.dateparse import parse_date
+
+from apps.core.partitions import PARTITIONED_TABLES, detach_partitions, is_supported
+
+
+class Command(BaseCommand):
+    help = (
+        "Detach monthly partitions that end on or before a date so they can be "
+        "archived; the detached tables keep their data (PostgreSQL only)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--before",
+            required=True,
+            help="YYYY-MM-DD; partitions whose month ends on or before it are detached",
+        )
+        parser.add_argument(
+            "--table",
+            choices=sorted(PARTITIONED_TABLES),
+            help="Only detach partitions of this table",
+        )
+
+    def handle(self, *args, **options):
+        before = parse_date(options["before"])
+        if before is None:
+            raise CommandError("--before must be a YYYY-MM-DD date.")
+        if not is_supported(connection):
+            self.stdout.write("Partitioning needs PostgreSQL; nothing to do.")
+            return
+
+        tables = [options["table"]] if options["table"] else list(PARTITIONED_TABLES)
+        total = 0
+        for table in tables:
+            for name in detach_partitions(connection, table, before):
+                self.stdout.write(f"Detached {name}")
+                total += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Detached {total} partition(s)."))
@@ -1,3 +1,7 @@
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+
 class OwnerQuerySetMixin:
     """
     Mixin that filters querysets to only return objects owned by the requesting user.
@@ -14,3 +18,60 @@ class OwnerQuerySetMixin:
             return queryset.none()
         lookup = {self.owner_field: self.request.user}
         return queryset.filter(**lookup)
+
+
+class _NotModified(Exception):
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """
+    Mixin that answers GET/HEAD requests with 304 Not Modified when the
+    client's If-None-Match / If-Modified-Since validators still match.
+
+    Views implement `get_validators(request)` returning `(etag, last_modified)`
+    where `last_modified` is an aware datetime or None. Validators are checked
+    after authentication, permissions and throttling but before the handler
+    runs, so an unchanged resource never reaches the service layer or the
+    response renderer.
+    """
+
+    def get_validators(self, request):
+        raise NotImplementedError
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._validators = None
+        if request.method not in ("GET", "HEAD"):
+            return
+        etag, last_modified = self.get_validators(request)
+        self._validators = (etag, last_modified)
+        not_modified = get_conditional_response(
+            request._request,
+            etag=etag,
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        )
+        if not_modified is not None:
+            self._set_validator_headers(not_modified)
+            raise _NotModified(not_modified)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, _NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, "_validators", None) and response.status_code == 200:
+            self._set_validator_headers(response)
+        return response
+
+    def _set_validator_headers(self, response):
+        etag, last_modified = self._validators
+        if etag:
+            response["ETag"] = etag
+        if last_modified:
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+        patch_vary_headers(response, ["Authorization"])
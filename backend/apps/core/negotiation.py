@@ -0,0 +1,18 @@
+from rest_framework.negotiation import BaseContentNegotiation
+
+
+class FirstRendererNegotiation(BaseContentNegotiation):
+    """
+    Content negotiation that always picks the view's first renderer.
+
+    For views that stream their own non-JSON body and use `?format=` as a
+    regular query parameter: DRF would otherwise treat it as a renderer
+    override and answer 404 for values such as `csv`. Errors raised before the
+    body is streamed are still rendered with the first (envelope) renderer.
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0] if parsers else None
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
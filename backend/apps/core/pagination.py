@@ -1,4 +1,12 @@
+import base64
+import binascii
+from datetime import date
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
 
 
 class StandardPagination(PageNumberPagination):
@@ -14,3 +22,97 @@ class StandardPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = "page_size"
     max_page_size = 100
+
+
+class DateCursorPagination(StandardPagination):
+    """
+    Keyset pagination over `(date, id)`, newest first, for date-ordered lists.
+
+    Opt-in per view via `pagination_class`. Requests that send a `cursor`
+    query parameter (empty for the first page) are paged with a
+    `WHERE (date, id) < (cursor)` seek that stays on the `(user, date)` index
+    and skips the COUNT(*); the opaque `next_cursor` / `previous_cursor`
+    tokens are returned in the envelope `meta`. Requests without `cursor`
+    keep the page-number behaviour of `StandardPagination`.
+    """
+
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = self.cursor_query_param in request.query_params
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.page_size_value = self.get_page_size(request)
+        token = request.query_params.get(self.cursor_query_param)
+        position, reverse = self.decode_cursor(token) if token else (None, False)
+        if position:
+            try:
+                position = (position[0], queryset.model._meta.pk.to_python(position[1]))
+            except DjangoValidationError:
+                raise NotFound(self.invalid_cursor_message)
+
+        if reverse:
+            queryset = queryset.order_by("date", "id")
+            if position:
+                queryset = queryset.filter(
+                    Q(date__gt=position[0]) | Q(date=position[0], id__gt=position[1])
+                )
+        else:
+            queryset = queryset.order_by("-date", "-id")
+            if position:
+                queryset = queryset.filter(
+                    Q(date__lt=position[0]) | Q(date=position[0], id__lt=position[1])
+                )
+
+        results = list(queryset[: self.page_size_value + 1])
+        has_more = len(results) > self.page_size_value
+        results = results[: self.page_size_value]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        self.page_items = results
+        return results
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        first = self.page_items[0] if self.page_items else None
+        last = self.page_items[-1] if self.page_items else None
+        return Response(
+            {
+                "results": data,
+                "meta": {
+                    "page_size": self.page_size_value,
+                    "next_cursor": (
+                        self.encode_cursor(last, reverse=False)
+                        if self.has_next and last
+                        else None
+                    ),
+                    "previous_cursor": (
+                        self.encode_cursor(first, reverse=True)
+                        if self.has_previous and first
+                        else None
+                    ),
+                },
+            }
+        )
+
+    def encode_cursor(self, item, reverse):
+        raw = f"{'p' if reverse else 'n'}|{item.date.isoformat()}|{item.pk}"
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, token):
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            direction, day, pk = (
+                base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+            )
+            if direction not in ("n", "p"):
+                raise ValueError
+            return (date.fromisoformat(day), pk), direction == "p"
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
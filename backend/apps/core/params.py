@@ -0,0 +1,15 @@
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+
+
+def parse_date_param(value, name):
+    """Parse an optional YYYY-MM-DD query parameter or raise a 400."""
+    if not value:
+        return None
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({name: "Use the YYYY-MM-DD format."})
+    return parsed
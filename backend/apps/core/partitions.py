@@ -0,0 +1,227 @@
+"""Monthly range partitioning of the date-keyed history tables on PostgreSQL.
+
+``daily_logs`` and ``food_entries`` are partitioned by ``date`` into one
+partition per month named ``<table>_pYYYY_MM``, plus a ``<table>_default``
+partition that catches dates no monthly partition covers (e.g. an import
+of very old history). Queries with a date bound only scan the matching
+months, and a month can be detached to a standalone table for archival.
+
+Partitioning is PostgreSQL-only; on other backends every helper is a no-op
+and the tables stay plain.
+"""
+
+import re
+from datetime import date
+
+from django.utils import timezone
+
+# table -> partition key
+PARTITIONED_TABLES = {
+    "daily_logs": "date",
+    "food_entries": "date",
+}
+MONTHS_AHEAD = 3
+
+_PARTITION_NAME = re.compile(r"_p(\d{4})_(\d{2})$")
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_range(start, end):
+    """First days of every month from ``start``'s month through ``end``'s."""
+    month = month_start(start)
+    while month <= end:
+        yield month
+        month = add_months(month, 1)
+
+
+def partition_name(table, month):
+    return f"{table}_p{month:%Y_%m}"
+
+
+def partition_month(table, name):
+    """The month a ``<table>_pYYYY_MM`` partition covers, or None."""
+    if not name.startswith(f"{table}_p"):
+        return None
+    match = _PARTITION_NAME.search(name)
+    return date(int(match[1]), int(match[2]), 1) if match else None
+
+
+def is_supported(connection):
+    return connection.vendor == "postgresql"
+
+
+def is_partitioned(connection, table):
+    if not is_supported(connection):
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+            [table],
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions(connection, table):
+    """Names of the partitions currently attached to ``table``."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass(%s)
+            ORDER BY c.relname
+            """,
+            [table],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def create_partitions(connection, table, start, end):
+    """Create the missing monthly partitions from ``start`` through ``end``.
+
+    Returns the names created. PostgreSQL refuses to create a month whose
+    rows already sit in the default partition.
+    """
+    if not is_partitioned(connection, table):
+        return []
+    existing = set(list_partitions(connection, table))
+    quote = connection.ops.quote_name
+    created = []
+    with connection.cursor() as cursor:
+        for month in month_range(start, end):
+            name = partition_name(table, month)
+            if name in existing:
+                continue
+            cursor.execute(
+                f"CREATE TABLE {quote(name)} PARTITION OF {quote(table)} "
+                "FOR VALUES FROM (%s) TO (%s)",
+                [month, add_months(month, 1)],
+            )
+            created.append(name)
+    return created
+
+
+def ensure_upcoming_partitions(connection, months_ahead=MONTHS_AHEAD, today=None):
+    """Pre-create partitions from this month through ``months_ahead`` months out."""
+    today = today or timezone.now().date()
+    end = add_months(month_start(today), months_ahead)
+    return {
+        table: create_partitions(connection, table, today, end)
+        for table in PARTITIONED_TABLES
+    }
+
+
+def detach_partitions(connection, table, before):
+    """Detach every monthly partition of ``table`` that ends on or before ``before``.
+
+    The detached tables keep their names and data so they can be dumped and
+    dropped; returns their names.
+    """
+    if not is_partitioned(connection, table):
+        return []
+    quote = connection.ops.quote_name
+    detached = []
+    with connection.cursor() as cursor:
+        for name in list_partitions(connection, table):
+            month = partition_month(table, name)
+            if month is None or add_months(month, 1) > before:
+                continue
+            cursor.execute(f"ALTER TABLE {quote(table)} DETACH PARTITION {quote(name)}")
+            detached.append(name)
+    return detached
+
+
+def _definitions(cursor, table):
+    """Table-level constraints and standalone indexes of ``table``.
+
+    The primary key is rebuilt separately, and NOT NULL constraints (``contype
+    'n'`` from PostgreSQL 18) come back with the column definitions.
+    """
+    cursor.execute(
+        """
+        SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = to_regclass(%s) AND contype IN ('c', 'f', 'u', 'x')
+        ORDER BY conname
+        """,
+        [table],
+    )
+    constraints = cursor.fetchall()
+    cursor.execute(
+        """
+        SELECT indexdef FROM pg_indexes
+        WHERE schemaname = current_schema() AND tablename = %s
+          AND indexname NOT IN (
+              SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s)
+          )
+        ORDER BY indexname
+        """,
+        [table, table],
+    )
+    indexes = [row[0] for row in cursor.fetchall()]
+    return constraints, indexes
+
+
+def _rebuild(schema_editor, table, key, partitioned):
+    connection = schema_editor.connection
+    if not is_supported(connection) or is_partitioned(connection, table) == partitioned:
+        return
+    quote = connection.ops.quote_name
+    staging = f"{table}_rebuild"
+    with connection.cursor() as cursor:
+        constraints, indexes = _definitions(cursor, table)
+        partition_clause = f" PARTITION BY RANGE ({quote(key)})" if partitioned else ""
+        cursor.execute(
+            f"CREATE TABLE {quote(staging)} (LIKE {quote(table)} INCLUDING DEFAULTS)"
+            + partition_clause
+        )
+        if partitioned:
+            cursor.execute(f"SELECT MIN({quote(key)}) FROM {quote(table)}")
+            first = cursor.fetchone()[0] or timezone.now().date()
+            last = add_months(month_start(timezone.now().date()), MONTHS_AHEAD)
+            for month in month_range(first, last):
+                cursor.execute(
+                    f"CREATE TABLE {quote(partition_name(table, month))} "
+                    f"PARTITION OF {quote(staging)} FOR VALUES FROM (%s) TO (%s)",
+                    [month, add_months(month, 1)],
+                )
+            cursor.execute(
+                f"CREATE TABLE {quote(table + '_default')} PARTITION OF {quote(staging)} DEFAULT"
+            )
+        cursor.execute(f"INSERT INTO {quote(staging)} SELECT * FROM {quote(table)}")
+        cursor.execute(f"DROP TABLE {quote(table)}")
+        cursor.execute(f"ALTER TABLE {quote(staging)} RENAME TO {quote(table)}")
+        # A primary key on a partitioned table must include the partition key.
+        key_columns = f"id, {quote(key)}" if partitioned else "id"
+        cursor.execute(
+            f"ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(table + '_pkey')} "
+            f"PRIMARY KEY ({key_columns})"
+        )
+        for name, definition in constraints:
+            cursor.execute(
+                f"ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(name)} {definition}"
+            )
+        for definition in indexes:
+            # Indexes read from a partitioned parent are "ON ONLY" the parent.
+            cursor.execute(definition.replace(" ON ONLY ", " ON ", 1))
+
+
+def partition_table(schema_editor, table, key):
+    """Convert ``table`` into a monthly range-partitioned table, keeping its rows.
+
+    Foreign keys that reference ``table`` must be dropped first: on a
+    partitioned table they would have to include the partition key.
+    """
+    _rebuild(schema_editor, table, key, partitioned=True)
+
+
+def unpartition_table(schema_editor, table, key):
+    """Reverse ``partition_table``: fold all partitions back into a plain table."""
+    _rebuild(schema_editor, table, key, partitioned=False)
@@ -13,6 +13,9 @@ class StandardJSONRenderer(JSONRenderer):
         "errors": <error details on failure>,
         "meta": <optional metadata such as pagination info>
     }
+
+    A view whose data is not a dict (e.g. a plain list) can still fill
+    ``meta`` by setting ``envelope_meta`` on its Response.
     """
 
     def render(self, data, accepted_media_type=None, renderer_context=None):
@@ -31,14 +34,14 @@ class StandardJSONRenderer(JSONRenderer):
                 "message": None,
                 "warning": None,
                 "errors": None,
-                "meta": None,
+                "meta": getattr(response, "envelope_meta", None),
             }
 
             # If the response data is a dict, extract envelope-level keys if present
             if isinstance(data, dict):
                 envelope["message"] = data.pop("message", None)
                 envelope["warning"] = data.pop("warning", None)
-                envelope["meta"] = data.pop("meta", None)
+                envelope["meta"] = data.pop("meta", envelope["meta"])
 
                 # If data is now empty after extracting envelope keys, set to None
                 if not data:
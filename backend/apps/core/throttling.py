@@ -29,3 +29,13 @@ class ReadRateThrottle(UserRateThrottle):
 
     scope = "read"
     rate = "120/min"
+
+
+class TypeaheadRateThrottle(UserRateThrottle):
+    """
+    Throttle for per-keystroke lookups (food autocomplete).
+    Limit: 600 requests per minute.
+    """
+
+    scope = "typeahead"
+    rate = "600/min"
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import MonthlyMetrics
+from .models import MonthlyMetrics, UserStreakState, WeeklyMetrics
 
 
 @admin.register(MonthlyMetrics)
@@ -10,3 +10,19 @@ class MonthlyMetricsAdmin(admin.ModelAdmin):
     search_fields = ["user__email"]
     readonly_fields = ["id", "created_at", "updated_at"]
     ordering = ["-month"]
+
+
+@admin.register(WeeklyMetrics)
+class WeeklyMetricsAdmin(admin.ModelAdmin):
+    list_display = ["user", "week_start", "days_logged", "workouts_done", "consistency_score"]
+    list_filter = ["week_start"]
+    search_fields = ["user__email"]
+    readonly_fields = ["id", "created_at", "updated_at"]
+    ordering = ["-week_start"]
+
+
+@admin.register(UserStreakState)
+class UserStreakStateAdmin(admin.ModelAdmin):
+    list_display = ["user", "anchor_date", "protein_current", "calorie_current", "workout_current"]
+    search_fields = ["user__email"]
+    readonly_fields = ["updated_at"]
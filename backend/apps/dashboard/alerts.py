@@ -0,0 +1,230 @@
+"""Declarative dashboard alert rules.
+
+Each rule declares the data it needs: how many days of DailyLog history,
+which fields, whether it looks at the current Monday-Sunday week, and
+whether it needs the date of the last body measurement. The engine fetches
+the union of those needs once, evaluates every enabled rule against it and
+records per-rule timings, so adding a rule does not add a query.
+
+Rules are enabled and tuned through ``settings.DASHBOARD_ALERT_RULES``::
+
+    DASHBOARD_ALERT_RULES = {"no_workouts": {"enabled": True, "threshold": 5}}
+"""
+
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.logs.models import DailyLog
+from apps.logs.services import summarize_workout_variety
+from apps.measurements.models import BodyMeasurement
+
+_registry = {}
+
+_timings_lock = threading.Lock()
+_timings = {}
+
+
+class AlertRule:
+    """Base class for alert rules; subclasses are registered with ``@register``."""
+
+    name = ""
+    window_days = 0
+    fields = ()
+    current_week = False
+    needs_last_measurement = False
+    default_threshold = None
+
+    def evaluate(self, context, threshold):
+        """Return an alert dict, or None when the rule does not fire."""
+        raise NotImplementedError
+
+
+def register(rule_class):
+    _registry[rule_class.name] = rule_class()
+    return rule_class
+
+
+class AlertContext:
+    """The shared data every rule is evaluated against."""
+
+    def __init__(self, today, rows, last_measurement_date=None):
+        self.today = today
+        self.rows = rows
+        self.last_measurement_date = last_measurement_date
+
+    def rows_since(self, start_date):
+        return [row for row in self.rows if row["date"] >= start_date]
+
+    @property
+    def week_start(self):
+        return self.today - timedelta(days=self.today.weekday())
+
+
+def _rule_config(name):
+    return settings.DASHBOARD_ALERT_RULES.get(name, {})
+
+
+def active_rules():
+    """Registered rules that are enabled, with their configured thresholds."""
+    rules = []
+    for name, rule in _registry.items():
+        config = _rule_config(name)
+        if config.get("enabled", True):
+            rules.append((rule, config.get("threshold", rule.default_threshold)))
+    return rules
+
+
+def requirements(rules, today):
+    """Return (start_date, fields, needs_last_measurement) covering ``rules``."""
+    start_date = today
+    fields = {"date"}
+    needs_measurement = False
+    for rule, _ in rules:
+        start_date = min(start_date, today - timedelta(days=rule.window_days))
+        if rule.current_week:
+            start_date = min(start_date, today - timedelta(days=today.weekday()))
+        fields.update(rule.fields)
+        needs_measurement = needs_measurement or rule.needs_last_measurement
+    return start_date, fields, needs_measurement
+
+
+def evaluate_alerts(user, today=None, rows=None, rows_start=None):
+    """Evaluate all enabled rules for ``user``.
+
+    ``rows``/``rows_start`` let a caller that already loaded a DailyLog window
+    (newest first, as ``.values()`` dicts) share it; the engine only queries
+    when that window does not cover what the rules need.
+    """
+    today = today or timezone.now().date()
+    rules = active_rules()
+    start_date, fields, needs_measurement = requirements(rules, today)
+
+    covered = (
+        rows is not None
+        and rows_start is not None
+        and rows_start <= start_date
+        and (not rows or fields.issubset(rows[0]))
+    )
+    if not covered:
+        rows = list(
+            DailyLog.objects.filter(user=user, date__gte=start_date, date__lte=today)
+            .order_by("-date")
+            .values(*fields)
+        )
+
+    last_measurement_date = None
+    if needs_measurement:
+        last_measurement_date = (
+            BodyMeasurement.objects.filter(user=user)
+            .order_by("-date")
+            .values_list("date", flat=True)
+            .first()
+        )
+
+    context = AlertContext(today, rows, last_measurement_date)
+    alerts = []
+    for rule, threshold in rules:
+        started = time.perf_counter()
+        alert = rule.evaluate(context, threshold)
+        _record_timing(rule.name, time.perf_counter() - started)
+        if alert:
+            alerts.append(alert)
+    return alerts
+
+
+def _record_timing(name, seconds):
+    with _timings_lock:
+        stats = _timings.setdefault(name, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+        stats["calls"] += 1
+        stats["total_ms"] += seconds * 1000
+        stats["max_ms"] = max(stats["max_ms"], seconds * 1000)
+
+
+def get_rule_timings():
+    """Return this process's per-rule evaluation timings."""
+    with _timings_lock:
+        return {name: dict(stats) for name, stats in _timings.items()}
+
+
+def reset_rule_timings():
+    with _timings_lock:
+        _timings.clear()
+
+
+@register
+class CaloriesOffTargetRule(AlertRule):
+    name = "calories_off_target"
+    window_days = 7
+    fields = ("calories_ok",)
+    default_threshold = 3
+
+    def evaluate(self, context, threshold):
+        rows = context.rows_since(context.today - timedelta(days=self.window_days))
+        off_target_days = sum(1 for row in rows if not row["calories_ok"])
+        if off_target_days >= threshold:
+            return {
+                "type": "warning",
+                "message": f"{off_target_days} days off calorie target in the last week",
+            }
+        return None
+
+
+@register
+class NoWorkoutsRule(AlertRule):
+    name = "no_workouts"
+    window_days = 7
+    fields = ("workout",)
+    default_threshold = 5
+
+    def evaluate(self, context, threshold):
+        rows = context.rows_since(context.today - timedelta(days=self.window_days))
+        no_workout_days = sum(1 for row in rows if not row["workout"])
+        if no_workout_days >= threshold:
+            return {
+                "type": "warning",
+                "message": f"No workouts in {no_workout_days} days",
+            }
+        return None
+
+
+@register
+class WorkoutVarietyRule(AlertRule):
+    name = "workout_variety"
+    fields = ("workout", "workout_type")
+    current_week = True
+    default_threshold = 2
+
+    def evaluate(self, context, threshold):
+        variety = summarize_workout_variety(
+            (
+                row["workout_type"]
+                for row in context.rows_since(context.week_start)
+                if row["workout"] and row["workout_type"]
+            ),
+            min_types=threshold,
+        )
+        if not variety["meets_rule"]:
+            return {"type": "warning", "message": variety["message"]}
+        return None
+
+
+@register
+class MeasurementOverdueRule(AlertRule):
+    name = "measurement_overdue"
+    needs_last_measurement = True
+    default_threshold = 30
+
+    def evaluate(self, context, threshold):
+        if context.last_measurement_date is None:
+            return {"type": "info", "message": "No body measurements recorded yet"}
+        days_since = (context.today - context.last_measurement_date).days
+        if days_since >= threshold:
+            return {
+                "type": "info",
+                "message": f"No body measurement in {days_since} days",
+            }
+        return None
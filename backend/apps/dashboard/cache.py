@@ -0,0 +1,198 @@
+"""Per-user result cache for dashboard service functions.
+
+Entries are keyed by user, a per-user data version and the current UTC
+date. Writes to any model a dashboard answer depends on call
+``bump_data_version`` (see ``signals.py``), which orphans every cached
+entry for that user at once; the date component makes entries roll over
+at midnight because "today" changes the answers. The backend is the
+``DASHBOARD_CACHE_ALIAS`` entry in ``CACHES``.
+"""
+
+import functools
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, time as dt_time, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from apps.core.mixins import ConditionalGetMixin
+from apps.foods.models import FoodEntry
+from apps.logs.models import DailyLog
+from apps.measurements.models import BodyMeasurement
+from apps.users.models import User, UserTarget
+
+from .models import MonthlyMetrics
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def _cache():
+    return caches[settings.DASHBOARD_CACHE_ALIAS]
+
+
+def _version_key(user_id):
+    return f"dashboard:version:{user_id}"
+
+
+def _bumped_key(user_id):
+    return f"dashboard:bumped:{user_id}"
+
+
+def get_data_version(user_id):
+    """Return the user's current data version, initialising it if missing.
+
+    Versions start from a nanosecond timestamp so a version lost to cache
+    eviction can never be reissued and resurrect stale entries.
+    """
+    cache = _cache()
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_data_version(user_id):
+    """Invalidate every cached dashboard result for the user.
+
+    Also records when it happened, so ``Last-Modified`` moves on changes
+    that leave no newer timestamp behind (deletes, rollup refreshes).
+    """
+    cache = _cache()
+    key = _version_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+    # Whole seconds, as in HTTP dates, and strictly increasing per bump so
+    # two changes within one second still yield distinct Last-Modified values.
+    previous = cache.get(_bumped_key(user_id))
+    stamp = math.ceil(time.time())
+    if previous is not None:
+        stamp = max(stamp, previous + 1)
+    cache.set(_bumped_key(user_id), stamp, timeout=None)
+
+
+def get_last_bump(user_id):
+    """When the user's data version last moved, or None if unknown."""
+    stamp = _cache().get(_bumped_key(user_id))
+    return (
+        datetime.fromtimestamp(stamp, tz=dt_timezone.utc) if stamp is not None else None
+    )
+
+
+def _record(outcome):
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def get_cache_stats():
+    """Return this process's hit/miss counters."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        for outcome in _stats:
+            _stats[outcome] = 0
+
+
+def cached_per_user(name):
+    """Cache ``func(user, *args, **kwargs)`` per user, data version and UTC date.
+
+    The undecorated function stays reachable as ``wrapper.uncached``.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(user, *args, **kwargs):
+            parts = [str(arg) for arg in args]
+            parts += [f"{k}={v}" for k, v in sorted(kwargs.items())]
+            key = ":".join(
+                [
+                    "dashboard",
+                    name,
+                    str(user.pk),
+                    str(get_data_version(user.pk)),
+                    timezone.now().date().isoformat(),
+                    *parts,
+                ]
+            )
+            cache = _cache()
+            result = cache.get(key)
+            if result is not None:
+                _record("hits")
+                return result
+            _record("misses")
+            result = func(user, *args, **kwargs)
+            cache.set(key, result, timeout=settings.DASHBOARD_CACHE_TIMEOUT)
+            return result
+
+        wrapper.uncached = func
+        return wrapper
+
+    return decorator
+
+
+def _latest(queryset, field):
+    return Subquery(queryset.order_by(f"-{field}").values(field)[:1])
+
+
+def user_data_validators(user):
+    """Return ``(etag, last_modified)`` describing the user's logged data.
+
+    The fingerprint is the newest write timestamp across DailyLog, FoodEntry,
+    BodyMeasurement, UserTarget and MonthlyMetrics (one query), the data
+    version (which also moves on deletes) and today's date.
+    ``last_modified`` is the newest of those timestamps and of the last
+    version bump, and never predates the start of the current UTC day, so
+    deletes and date-relative answers move it too.
+    """
+    user_ref = OuterRef("pk")
+    stamps = (
+        User.objects.filter(pk=user.pk)
+        .values_list(
+            _latest(DailyLog.objects.filter(user=user_ref), "updated_at"),
+            _latest(FoodEntry.objects.filter(daily_log__user=user_ref), "created_at"),
+            _latest(BodyMeasurement.objects.filter(user=user_ref), "created_at"),
+            _latest(UserTarget.objects.filter(user=user_ref), "updated_at"),
+            _latest(MonthlyMetrics.objects.filter(user=user_ref), "updated_at"),
+        )
+        .first()
+    ) or ()
+    today = timezone.now().date()
+    day_start = datetime.combine(today, dt_time.min, tzinfo=dt_timezone.utc)
+    bumped = get_last_bump(user.pk)
+    last_modified = max(
+        [day_start, bumped or day_start, *(stamp for stamp in stamps if stamp)]
+    )
+
+    fingerprint = ":".join(
+        [
+            str(user.pk),
+            str(get_data_version(user.pk)),
+            today.isoformat(),
+            *(stamp.isoformat() if stamp else "-" for stamp in stamps),
+        ]
+    )
+    etag = hashlib.sha1(fingerprint.encode()).hexdigest()
+    return etag, last_modified
+
+
+class UserDataConditionalMixin(ConditionalGetMixin):
+    """Conditional GET keyed on ``user_data_validators`` and the request URL."""
+
+    def get_validators(self, request):
+        fingerprint, last_modified = user_data_validators(request.user)
+        digest = hashlib.sha1(
+            f"{fingerprint}:{request.get_full_path()}".encode()
+        ).hexdigest()
+        return f'"{digest}"', last_modified
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from apps.dashboard.weekly import backfill_weekly_metrics
+
+
+class Command(BaseCommand):
+    help = "Build the weekly metrics rollup from existing DailyLog history"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of WeeklyMetrics rows written per bulk upsert",
+        )
+
+    def handle(self, *args, **options):
+        written = backfill_weekly_metrics(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} weekly metrics rows."))
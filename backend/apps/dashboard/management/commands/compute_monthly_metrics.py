@@ -3,26 +3,41 @@ from datetime import timedelta
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
-from apps.dashboard.services import compute_monthly_metrics
+from apps.dashboard.services import compute_monthly_metrics_batch
 from apps.users.models import User
 
 
 class Command(BaseCommand):
     help = "Compute monthly metrics for all users (current + previous month)"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of MonthlyMetrics rows written per bulk upsert",
+        )
+
     def handle(self, *args, **options):
         today = timezone.now().date()
         current_month = today.replace(day=1)
         prev_month = (current_month - timedelta(days=1)).replace(day=1)
 
         users = User.objects.filter(is_active=True, is_onboarded=True)
-        count = 0
 
-        for user in users:
-            compute_monthly_metrics(user, current_month)
-            compute_monthly_metrics(user, prev_month)
-            count += 1
+        # Previous month first so its averages feed the current month's weight change.
+        prev_avg_weights = compute_monthly_metrics_batch(
+            prev_month, users, chunk_size=options["chunk_size"]
+        )
+        avg_weights = compute_monthly_metrics_batch(
+            current_month,
+            users,
+            prev_avg_weights=prev_avg_weights,
+            chunk_size=options["chunk_size"],
+        )
 
         self.stdout.write(
-            self.style.SUCCESS(f"Computed monthly metrics for {count} users.")
+            self.style.SUCCESS(
+                f"Computed monthly metrics for {len(avg_weights)} users."
+            )
         )
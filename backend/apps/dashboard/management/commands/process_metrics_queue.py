@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.dashboard.services import drain_dirty_months, drain_reevaluations
+from apps.logs.stats import refresh_metric_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-evaluate log flags for users whose targets changed, then recompute "
+        "monthly metrics for (user, month) pairs queued by DailyLog writes and "
+        "refresh stale custom metric statistics"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--daemon",
+            action="store_true",
+            help="Keep polling the queue instead of exiting once it is empty",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds to sleep between polls when the queue is empty",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Queued months processed per batch",
+        )
+
+    def handle(self, *args, **options):
+        total = reevaluated = refreshed = 0
+        try:
+            while True:
+                # Re-evaluations queue months of their own, so run them first.
+                users = drain_reevaluations()
+                reevaluated += users
+                processed = drain_dirty_months(batch_size=options["batch_size"])
+                total += processed
+                stats = refresh_metric_stats(batch_size=options["batch_size"])
+                refreshed += stats
+                if users or processed or stats:
+                    continue
+                if not options["daemon"]:
+                    break
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Re-evaluated {reevaluated} users; processed {total} queued months; "
+                f"refreshed {refreshed} custom metric stats."
+            )
+        )
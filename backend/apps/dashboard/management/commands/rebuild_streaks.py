@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from apps.dashboard.streaks import rebuild_streak_state
+from apps.users.models import User
+
+
+class Command(BaseCommand):
+    help = "Rebuild stored streak counters from each user's full DailyLog history"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--email",
+            help="Only rebuild the streak state of the user with this email",
+        )
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(is_active=True)
+        if options["email"]:
+            users = users.filter(email=options["email"])
+
+        count = 0
+        for user_id in users.values_list("id", flat=True).iterator():
+            rebuild_streak_state(user_id)
+            count += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt streak state for {count} users.")
+        )
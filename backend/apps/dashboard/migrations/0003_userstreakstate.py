@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:10
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_usertarget_carbs_target_usertarget_fats_target_and_more"),
+        ("dashboard", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserStreakState",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="streak_state",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("anchor_date", models.DateField(null=True)),
+                ("logged_recent", models.BigIntegerField(default=0)),
+                ("protein_current", models.IntegerField(default=0)),
+                ("protein_best", models.IntegerField(default=0)),
+                ("protein_recent", models.BigIntegerField(default=0)),
+                ("protein_tail", models.IntegerField(default=0)),
+                ("protein_settled_best", models.IntegerField(default=0)),
+                ("calorie_current", models.IntegerField(default=0)),
+                ("calorie_best", models.IntegerField(default=0)),
+                ("calorie_recent", models.BigIntegerField(default=0)),
+                ("calorie_tail", models.IntegerField(default=0)),
+                ("calorie_settled_best", models.IntegerField(default=0)),
+                ("workout_current", models.IntegerField(default=0)),
+                ("workout_best", models.IntegerField(default=0)),
+                ("workout_recent", models.BigIntegerField(default=0)),
+                ("workout_tail", models.IntegerField(default=0)),
+                ("workout_settled_best", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "user_streak_states",
+            },
+        ),
+    ]
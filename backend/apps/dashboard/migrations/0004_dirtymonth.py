@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:14
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("dashboard", "0003_userstreakstate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DirtyMonth",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("month", models.DateField(help_text="First day of the month")),
+                ("marked_at", models.DateTimeField()),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="dirty_months",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "dirty_months",
+                "indexes": [
+                    models.Index(
+                        fields=["marked_at"], name="idx_dirty_months_marked_at"
+                    )
+                ],
+                "unique_together": {("user", "month")},
+            },
+        ),
+    ]
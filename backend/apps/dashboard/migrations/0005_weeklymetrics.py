@@ -0,0 +1,72 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:16
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("dashboard", "0004_dirtymonth"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WeeklyMetrics",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("week_start", models.DateField(help_text="Monday of the ISO week")),
+                ("days_logged", models.IntegerField(default=0)),
+                ("avg_calories", models.IntegerField(default=0)),
+                ("avg_protein", models.IntegerField(default=0)),
+                ("workouts_done", models.IntegerField(default=0)),
+                ("protein_hit_days", models.IntegerField(default=0)),
+                ("workout_types", models.JSONField(default=list)),
+                (
+                    "first_weight",
+                    models.DecimalField(decimal_places=1, max_digits=5, null=True),
+                ),
+                (
+                    "last_weight",
+                    models.DecimalField(decimal_places=1, max_digits=5, null=True),
+                ),
+                (
+                    "weight_change",
+                    models.DecimalField(decimal_places=1, max_digits=5, null=True),
+                ),
+                ("consistency_score", models.IntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="weekly_metrics",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "weekly_metrics",
+                "ordering": ["-week_start"],
+                "indexes": [
+                    models.Index(
+                        fields=["user", "week_start"],
+                        name="idx_weekly_metrics_user_week",
+                    )
+                ],
+                "unique_together": {("user", "week_start")},
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:25
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_usertarget_carbs_target_usertarget_fats_target_and_more"),
+        ("dashboard", "0005_weeklymetrics"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PendingReevaluation",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="pending_reevaluation",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("requested_at", models.DateTimeField()),
+            ],
+            options={
+                "db_table": "pending_reevaluations",
+                "indexes": [
+                    models.Index(
+                        fields=["requested_at"], name="idx_pending_reeval_requested"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -36,3 +36,127 @@ class MonthlyMetrics(models.Model):
 
     def __str__(self):
         return f"{self.user.email} - {self.month.strftime('%Y-%m')}"
+
+
+class UserStreakState(models.Model):
+    """Incrementally maintained streak counters for a user.
+
+    ``anchor_date`` is the newest day the state has seen; bit ``i`` of each
+    ``*_recent`` mask describes ``anchor_date - i``. ``*_tail`` is the run of
+    hits ending on the day just before the mask window and ``*_settled_best``
+    the longest run that finished before it, so current and best streaks can
+    be re-derived after any edit inside the window. ``*_current`` and
+    ``*_best`` are those derived values, stored for single-row reads.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="streak_state",
+    )
+    anchor_date = models.DateField(null=True)
+    logged_recent = models.BigIntegerField(default=0)
+    protein_current = models.IntegerField(default=0)
+    protein_best = models.IntegerField(default=0)
+    protein_recent = models.BigIntegerField(default=0)
+    protein_tail = models.IntegerField(default=0)
+    protein_settled_best = models.IntegerField(default=0)
+    calorie_current = models.IntegerField(default=0)
+    calorie_best = models.IntegerField(default=0)
+    calorie_recent = models.BigIntegerField(default=0)
+    calorie_tail = models.IntegerField(default=0)
+    calorie_settled_best = models.IntegerField(default=0)
+    workout_current = models.IntegerField(default=0)
+    workout_best = models.IntegerField(default=0)
+    workout_recent = models.BigIntegerField(default=0)
+    workout_tail = models.IntegerField(default=0)
+    workout_settled_best = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "user_streak_states"
+
+    def __str__(self):
+        return f"Streaks for {self.user.email}"
+
+
+class DirtyMonth(models.Model):
+    """A (user, month) whose MonthlyMetrics must be recomputed by the worker."""
+
+    id = models.BigAutoField(primary_key=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="dirty_months",
+    )
+    month = models.DateField(help_text="First day of the month")
+    marked_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "dirty_months"
+        unique_together = ["user", "month"]
+        indexes = [
+            models.Index(fields=["marked_at"], name="idx_dirty_months_marked_at"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.month.strftime('%Y-%m')}"
+
+
+class PendingReevaluation(models.Model):
+    """A user whose DailyLog flags must be re-evaluated after a target change."""
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="pending_reevaluation",
+    )
+    requested_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "pending_reevaluations"
+        indexes = [
+            models.Index(fields=["requested_at"], name="idx_pending_reeval_requested"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} @ {self.requested_at:%Y-%m-%d %H:%M}"
+
+
+class WeeklyMetrics(models.Model):
+    """Per ISO week rollup of a user's daily logs, kept current on every write."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="weekly_metrics",
+    )
+    week_start = models.DateField(help_text="Monday of the ISO week")
+    days_logged = models.IntegerField(default=0)
+    avg_calories = models.IntegerField(default=0)
+    avg_protein = models.IntegerField(default=0)
+    workouts_done = models.IntegerField(default=0)
+    protein_hit_days = models.IntegerField(default=0)
+    workout_types = models.JSONField(default=list)
+    first_weight = models.DecimalField(max_digits=5, decimal_places=1, null=True)
+    last_weight = models.DecimalField(max_digits=5, decimal_places=1, null=True)
+    weight_change = models.DecimalField(max_digits=5, decimal_places=1, null=True)
+    consistency_score = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "weekly_metrics"
+        unique_together = ["user", "week_start"]
+        ordering = ["-week_start"]
+        indexes = [
+            models.Index(
+                fields=["user", "week_start"], name="idx_weekly_metrics_user_week"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user.email} - week of {self.week_start}"
@@ -1,55 +1,101 @@
 import calendar
-from datetime import date, timedelta
-from decimal import Decimal
+from datetime import timedelta
 
-from django.db.models import Avg, Count, Q, Sum
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Avg, Count, FloatField, Q
+from django.db.models.functions import Cast
 from django.utils import timezone
 
 from apps.logs.models import DailyLog
-from apps.measurements.models import BodyMeasurement
+from apps.logs.services import reevaluate_daily_logs
+from apps.users.models import UserTarget
+
+from .alerts import evaluate_alerts
+from .cache import bump_data_version, cached_per_user
+from .models import (
+    DirtyMonth,
+    MonthlyMetrics,
+    PendingReevaluation,
+    UserStreakState,
+    WeeklyMetrics,
+)
+from .streaks import rebuild_streak_state, streaks_from_state
+from .timeseries import exponential_moving_average, lttb_indices, rolling_sum
+
+
+WINDOW_FIELDS = (
+    "date",
+    "weight",
+    "calories",
+    "protein",
+    "carbs",
+    "fats",
+    "fibre",
+    "steps",
+    "water",
+    "sleep",
+    "workout",
+    "workout_type",
+    "protein_hit",
+    "calories_ok",
+)
+
+BUNDLE_WINDOW_DAYS = 30
+
+
+def load_log_window(user, start_date, end_date, fields=WINDOW_FIELDS):
+    """Return the user's DailyLog rows between two dates as dicts, newest first."""
+    return list(
+        DailyLog.objects.filter(user=user, date__gte=start_date, date__lte=end_date)
+        .order_by("-date")
+        .values(*fields)
+    )
 
-from .models import MonthlyMetrics
 
+def _log_data(row):
+    return {
+        "weight": float(row["weight"]),
+        "calories": row["calories"],
+        "protein": row["protein"],
+        "carbs": row["carbs"],
+        "fats": row["fats"],
+        "fibre": row["fibre"],
+        "steps": row["steps"],
+        "water": float(row["water"]),
+        "sleep": float(row["sleep"]),
+        "workout": row["workout"],
+        "protein_hit": row["protein_hit"],
+        "calories_ok": row["calories_ok"],
+    }
 
-def get_dashboard_summary(user):
-    """Return today's data vs targets."""
-    today = timezone.now().date()
-    try:
-        log = DailyLog.objects.get(user=user, date=today)
-        log_data = {
-            "weight": float(log.weight),
-            "calories": log.calories,
-            "protein": log.protein,
-            "carbs": log.carbs,
-            "fats": log.fats,
-            "fibre": log.fibre,
-            "steps": log.steps,
-            "water": float(log.water),
-            "sleep": float(log.sleep),
-            "workout": log.workout,
-            "protein_hit": log.protein_hit,
-            "calories_ok": log.calories_ok,
-        }
-    except DailyLog.DoesNotExist:
-        log_data = None
 
-    target_data = None
+def _target_data(user):
     try:
         target = user.target
-        target_data = {
-            "calorie_target": target.calorie_target,
-            "protein_target": target.protein_target,
-            "goal_weight": float(target.goal_weight),
-            "carbs_target": target.carbs_target,
-            "fats_target": target.fats_target,
-            "fibre_target": target.fibre_target,
-            "water_target": float(target.water_target) if target.water_target else None,
-            "sleep_target": float(target.sleep_target) if target.sleep_target else None,
-            "steps_target": target.steps_target,
-        }
     except Exception:
-        pass
+        return None
+    return {
+        "calorie_target": target.calorie_target,
+        "protein_target": target.protein_target,
+        "goal_weight": float(target.goal_weight),
+        "carbs_target": target.carbs_target,
+        "fats_target": target.fats_target,
+        "fibre_target": target.fibre_target,
+        "water_target": float(target.water_target) if target.water_target else None,
+        "sleep_target": float(target.sleep_target) if target.sleep_target else None,
+        "steps_target": target.steps_target,
+    }
+
 
+def summary_from_window(rows, today, target_data):
+    """Build the dashboard summary from preloaded window rows."""
+    log_data = None
+    for row in rows:
+        if row["date"] == today:
+            log_data = _log_data(row)
+            break
     return {
         "today": log_data,
         "targets": target_data,
@@ -57,239 +103,510 @@ def get_dashboard_summary(user):
     }
 
 
+def weight_trends_from_window(rows, start_date):
+    """Build the weight trend series (oldest first) from preloaded window rows."""
+    return [
+        {"date": str(row["date"]), "weight": float(row["weight"])}
+        for row in reversed(rows)
+        if row["date"] >= start_date
+    ]
+
+
+def weekly_review_from_window(rows, today):
+    """Compute the 7-day weekly review from preloaded window rows."""
+    start_date = today - timedelta(days=6)  # last 7 days inclusive
+    log_list = [row for row in rows if start_date <= row["date"] <= today]
+
+    if not log_list:
+        return {
+            "period": {"start": str(start_date), "end": str(today)},
+            "days_logged": 0,
+            "message": "No logs found for the past week.",
+        }
+
+    days_logged = len(log_list)
+    avg_calories = round(sum(l["calories"] for l in log_list) / days_logged)
+    avg_protein = round(sum(l["protein"] for l in log_list) / days_logged)
+    workouts_done = sum(1 for l in log_list if l["workout"])
+
+    workout_types_used = list(set(
+        l["workout_type"] for l in log_list
+        if l["workout"] and l["workout_type"]
+    ))
+
+    # Weight change: first vs last logged weight
+    sorted_logs = sorted(log_list, key=lambda l: l["date"])
+    weight_change = round(float(sorted_logs[-1]["weight"]) - float(sorted_logs[0]["weight"]), 1) if len(sorted_logs) >= 2 else None
+
+    # Consistency score (7-day version)
+    protein_hit_days = sum(1 for l in log_list if l["protein_hit"])
+    consistency_score = compute_consistency_score(
+        days_logged, 7, protein_hit_days, workouts_done
+    )
+
+    return {
+        "period": {"start": str(start_date), "end": str(today)},
+        "days_logged": days_logged,
+        "avg_calories": avg_calories,
+        "avg_protein": avg_protein,
+        "workouts_done": workouts_done,
+        "workout_types_used": workout_types_used,
+        "weight_change": weight_change,
+        "consistency_score": min(consistency_score, 100),
+        "protein_hit_days": protein_hit_days,
+    }
+
+
+@cached_per_user("summary")
+def get_dashboard_summary(user):
+    """Return today's data vs targets."""
+    today = timezone.now().date()
+    rows = load_log_window(user, today, today)
+    return summary_from_window(rows, today, _target_data(user))
+
+
+@cached_per_user("trends")
 def get_weight_trends(user, days=7):
     """Return weight data for the last N days."""
-    start_date = timezone.now().date() - timedelta(days=days)
-    logs = (
-        DailyLog.objects.filter(user=user, date__gte=start_date)
+    today = timezone.now().date()
+    start_date = today - timedelta(days=days)
+    rows = load_log_window(user, start_date, today, fields=("date", "weight"))
+    return weight_trends_from_window(rows, start_date)
+
+
+# Smoothing factor of the "trend weight" EMA (~10-day memory).
+TREND_WEIGHT_ALPHA = 0.1
+
+
+@cached_per_user("weight_series")
+def get_weight_series(user, start_date, end_date, points=200, smooth=False):
+    """Return weight between two dates, downsampled to at most ``points`` points.
+
+    Rows are read as ``values_list`` arrays with the weight cast to float in
+    SQL, downsampled with largest-triangle-three-buckets and, when ``smooth``
+    is set, paired with an exponentially smoothed trend weight computed over
+    the full-resolution series.
+    """
+    rows = list(
+        DailyLog.objects.filter(user=user, date__gte=start_date, date__lte=end_date)
         .order_by("date")
-        .values("date", "weight")
+        .values_list("date", Cast("weight", FloatField()))
     )
+    if not rows:
+        return []
+
+    dates, weights = zip(*rows)
+    days = np.array(dates, dtype="datetime64[D]")
+    weights = np.array(weights, dtype=float)
+    trend = exponential_moving_average(weights, TREND_WEIGHT_ALPHA) if smooth else None
+
+    keep = lttb_indices(days.astype(np.int64), weights, points)
+    labels = days[keep].astype(str)
+    series = [
+        {"date": label, "weight": round(weight, 1)}
+        for label, weight in zip(labels.tolist(), weights[keep].tolist())
+    ]
+    if smooth:
+        for point, value in zip(series, np.round(trend[keep], 2).tolist()):
+            point["trend"] = value
+    return series
+
+
+@cached_per_user("consistency")
+def get_consistency_series(user, start_date, end_date, window=7):
+    """Return the rolling ``window``-day consistency score for each day in range.
+
+    History from ``window - 1`` days before ``start_date`` is read once as
+    flag tuples, scattered into day-indexed arrays and scored with cumulative
+    sums, so the cost does not grow with the window size.
+    """
+    load_start = start_date - timedelta(days=window - 1)
+    rows = DailyLog.objects.filter(
+        user=user, date__gte=load_start, date__lte=end_date
+    ).values_list("date", "protein_hit", "workout")
+
+    length = (end_date - load_start).days + 1
+    logged = np.zeros(length, dtype=bool)
+    protein_hit = np.zeros(length, dtype=bool)
+    workout = np.zeros(length, dtype=bool)
+    for log_date, hit, worked_out in rows:
+        i = (log_date - load_start).days
+        logged[i] = True
+        protein_hit[i] = hit
+        workout[i] = worked_out
+
+    scores = rolling_consistency_scores(logged, protein_hit, workout, window)
+    days = np.arange(
+        np.datetime64(start_date, "D"), np.datetime64(end_date, "D") + 1
+    ).astype(str)
     return [
-        {"date": str(log["date"]), "weight": float(log["weight"])} for log in logs
+        {"date": day, "consistency_score": score}
+        for day, score in zip(days.tolist(), scores[window - 1:].tolist())
     ]
 
 
+@cached_per_user("streaks")
 def compute_streaks(user):
-    """Compute protein, calorie, and workout streaks ending today or yesterday."""
-    today = timezone.now().date()
-    logs = (
-        DailyLog.objects.filter(user=user, date__lte=today)
-        .order_by("-date")
-        .values("date", "protein_hit", "calories_ok", "workout")[:60]
-    )
+    """Return current and best protein, calorie, and workout streaks."""
+    state = UserStreakState.objects.filter(user=user).first()
+    if state is None:
+        state = rebuild_streak_state(user.pk)
+    return streaks_from_state(state, timezone.now().date())
+
+
+@cached_per_user("alerts")
+def get_alerts(user):
+    """Generate alerts for the user."""
+    return evaluate_alerts(user)
+
 
-    log_list = list(logs)
-
-    def streak_count(field):
-        count = 0
-        expected_date = today
-        for log in log_list:
-            if log["date"] == expected_date and log[field]:
-                count += 1
-                expected_date -= timedelta(days=1)
-            elif log["date"] == expected_date and not log[field]:
-                break
-            elif log["date"] < expected_date:
-                # Gap day — check if it's yesterday and we haven't started
-                if count == 0 and expected_date == today:
-                    expected_date = today - timedelta(days=1)
-                    if log["date"] == expected_date and log[field]:
-                        count += 1
-                        expected_date -= timedelta(days=1)
-                    else:
-                        break
-                else:
-                    break
-        return count
+@cached_per_user("bundle")
+def get_dashboard_bundle(user, trend_days=7):
+    """Return summary, trends, streaks, alerts and weekly review in one pass.
 
+    Loads the user's DailyLog window once as ``.values()`` rows and derives
+    every home-screen section from it. Targets and streak state come with the
+    user in one joined read, so a page load costs three queries instead of
+    one round trip per section.
+    """
+    today = timezone.now().date()
+    user = type(user).objects.select_related("target", "streak_state").get(pk=user.pk)
+    state = getattr(user, "streak_state", None)
+    if state is None:
+        state = rebuild_streak_state(user.pk)
+    window_start = today - timedelta(days=BUNDLE_WINDOW_DAYS)
+    rows = load_log_window(user, window_start, today)
     return {
-        "protein_streak": streak_count("protein_hit"),
-        "calorie_streak": streak_count("calories_ok"),
-        "workout_streak": streak_count("workout"),
+        "summary": summary_from_window(rows, today, _target_data(user)),
+        "trends": weight_trends_from_window(rows, today - timedelta(days=trend_days)),
+        "streaks": streaks_from_state(state, today),
+        "alerts": evaluate_alerts(user, today, rows=rows, rows_start=window_start),
+        "weekly_review": weekly_review_from_window(rows, today),
     }
 
 
-def get_alerts(user):
-    """Generate alerts for the user."""
-    from apps.logs.services import check_weekly_workout_variety
+MONTHLY_METRIC_FIELDS = [
+    "avg_weight",
+    "bmi",
+    "bmi_category",
+    "weight_change",
+    "consistency_score",
+    "days_logged",
+    "protein_hit_days",
+    "workout_days",
+    "total_days_in_month",
+]
 
-    today = timezone.now().date()
-    alerts = []
-
-    # Days off calorie target
-    recent_logs = DailyLog.objects.filter(
-        user=user, date__gte=today - timedelta(days=7)
-    ).order_by("-date")
-
-    off_target_days = sum(1 for log in recent_logs if not log.calories_ok)
-    if off_target_days >= 3:
-        alerts.append(
-            {
-                "type": "warning",
-                "message": f"{off_target_days} days off calorie target in the last week",
-            }
-        )
 
-    # No workout warning
-    no_workout_days = sum(1 for log in recent_logs if not log.workout)
-    if no_workout_days >= 5:
-        alerts.append(
-            {"type": "warning", "message": f"No workouts in {no_workout_days} days"}
-        )
+def compute_consistency_score(days_logged, total_days, protein_hit_days, workout_days):
+    """40% logging coverage, 30% protein-hit rate, 30% workout rate."""
+    if days_logged == 0:
+        return 0
+    return round(
+        (days_logged / total_days) * 40
+        + (protein_hit_days / days_logged) * 30
+        + (workout_days / days_logged) * 30
+    )
 
-    # Workout variety check
-    variety = check_weekly_workout_variety(user)
-    if not variety["meets_rule"]:
-        alerts.append(
-            {"type": "warning", "message": variety["message"]}
-        )
 
-    # No measurement in 30+ days
-    last_measurement = (
-        BodyMeasurement.objects.filter(user=user).order_by("-date").first()
+def rolling_consistency_scores(logged, protein_hit, workout, window):
+    """Vectorised ``compute_consistency_score`` over trailing ``window``-day spans.
+
+    Takes day-indexed boolean arrays and returns one integer score per day,
+    capped at 100 like the weekly and monthly scores.
+    """
+    days_logged = rolling_sum(logged, window)
+    protein_days = rolling_sum(protein_hit, window)
+    workout_days = rolling_sum(workout, window)
+    safe_logged = np.maximum(days_logged, 1)
+    scores = np.round(
+        (days_logged / window) * 40
+        + (protein_days / safe_logged) * 30
+        + (workout_days / safe_logged) * 30
     )
-    if last_measurement:
-        days_since = (today - last_measurement.date).days
-        if days_since >= 30:
-            alerts.append(
-                {
-                    "type": "info",
-                    "message": f"No body measurement in {days_since} days",
-                }
-            )
+    scores[days_logged == 0] = 0
+    return np.minimum(scores, 100).astype(int)
+
+
+def compute_bmi(avg_weight, height_cm):
+    """Return (bmi, bmi_category) for a weight in kg and height in cm."""
+    if not avg_weight or not height_cm:
+        return None, ""
+    height_m = float(height_cm) / 100
+    bmi = round(float(avg_weight) / (height_m * height_m), 1)
+    if bmi < 18.5:
+        bmi_category = "Underweight"
+    elif bmi < 25:
+        bmi_category = "Normal"
+    elif bmi < 30:
+        bmi_category = "Overweight"
     else:
-        alerts.append(
-            {"type": "info", "message": "No body measurements recorded yet"}
-        )
+        bmi_category = "Obese"
+    return bmi, bmi_category
 
-    return alerts
 
-
-def compute_monthly_metrics(user, month_date):
-    """Compute and store monthly metrics for a user for a given month."""
+def _month_bounds(month_date):
     first_day = month_date.replace(day=1)
     total_days = calendar.monthrange(first_day.year, first_day.month)[1]
-    last_day = first_day.replace(day=total_days)
-
-    logs = DailyLog.objects.filter(user=user, date__gte=first_day, date__lte=last_day)
+    return first_day, first_day.replace(day=total_days), total_days
 
-    days_logged = logs.count()
-    protein_hit_days = logs.filter(protein_hit=True).count()
-    workout_days = logs.filter(workout=True).count()
-    avg_weight_result = logs.aggregate(avg=Avg("weight"))
-    avg_weight = (
-        round(avg_weight_result["avg"], 1) if avg_weight_result["avg"] else None
-    )
-
-    # Consistency score
-    if days_logged == 0:
-        consistency_score = 0
-    else:
-        consistency_score = round(
-            (days_logged / total_days) * 40
-            + (protein_hit_days / days_logged) * 30
-            + (workout_days / days_logged) * 30
-        )
 
-    # BMI
-    bmi = None
-    bmi_category = ""
-    if avg_weight and user.height_cm:
-        height_m = float(user.height_cm) / 100
-        bmi = round(float(avg_weight) / (height_m * height_m), 1)
-        if bmi < 18.5:
-            bmi_category = "Underweight"
-        elif bmi < 25:
-            bmi_category = "Normal"
-        elif bmi < 30:
-            bmi_category = "Overweight"
-        else:
-            bmi_category = "Obese"
+def _monthly_values(counts, total_days, height_cm, prev_avg_weight):
+    days_logged = counts["days_logged"]
+    avg_weight = round(counts["avg_weight"], 1) if counts["avg_weight"] else None
+    bmi, bmi_category = compute_bmi(avg_weight, height_cm)
 
     # Weight change vs previous month
     weight_change = None
+    if prev_avg_weight and avg_weight:
+        weight_change = round(float(avg_weight) - float(prev_avg_weight), 1)
+
+    return {
+        "avg_weight": avg_weight,
+        "bmi": bmi,
+        "bmi_category": bmi_category,
+        "weight_change": weight_change,
+        "consistency_score": compute_consistency_score(
+            days_logged,
+            total_days,
+            counts["protein_hit_days"],
+            counts["workout_days"],
+        ),
+        "days_logged": days_logged,
+        "protein_hit_days": counts["protein_hit_days"],
+        "workout_days": counts["workout_days"],
+        "total_days_in_month": total_days,
+    }
+
+
+_MONTHLY_AGGREGATES = {
+    "days_logged": Count("id"),
+    "protein_hit_days": Count("id", filter=Q(protein_hit=True)),
+    "workout_days": Count("id", filter=Q(workout=True)),
+    "avg_weight": Avg("weight"),
+}
+
+_NO_LOGS = {"days_logged": 0, "protein_hit_days": 0, "workout_days": 0, "avg_weight": None}
+
+
+def compute_monthly_metrics(user, month_date):
+    """Compute and store monthly metrics for a user for a given month."""
+    first_day, last_day, total_days = _month_bounds(month_date)
+
+    counts = DailyLog.objects.filter(
+        user=user, date__gte=first_day, date__lte=last_day
+    ).aggregate(**_MONTHLY_AGGREGATES)
+
     prev_month = (first_day - timedelta(days=1)).replace(day=1)
     prev_metrics = MonthlyMetrics.objects.filter(user=user, month=prev_month).first()
-    if prev_metrics and prev_metrics.avg_weight and avg_weight:
-        weight_change = round(float(avg_weight) - float(prev_metrics.avg_weight), 1)
 
     metrics, _ = MonthlyMetrics.objects.update_or_create(
         user=user,
         month=first_day,
-        defaults={
-            "avg_weight": avg_weight,
-            "bmi": bmi,
-            "bmi_category": bmi_category,
-            "weight_change": weight_change,
-            "consistency_score": consistency_score,
-            "days_logged": days_logged,
-            "protein_hit_days": protein_hit_days,
-            "workout_days": workout_days,
-            "total_days_in_month": total_days,
-        },
+        defaults=_monthly_values(
+            counts,
+            total_days,
+            user.height_cm,
+            prev_metrics.avg_weight if prev_metrics else None,
+        ),
     )
     return metrics
 
 
-def get_weekly_review(user):
-    """Compute weekly summary for the last 7 days."""
-    today = timezone.now().date()
-    start_date = today - timedelta(days=6)  # last 7 days inclusive
+def compute_monthly_metrics_batch(month_date, users, prev_avg_weights=None, chunk_size=1000):
+    """Compute and upsert monthly metrics for many users with set-based queries.
 
-    logs = DailyLog.objects.filter(user=user, date__gte=start_date, date__lte=today)
-    log_list = list(logs)
+    ``users`` is a User queryset. Log counts and average weight for the whole
+    set come from one grouped query over ``daily_logs``; BMI, consistency and
+    weight change are derived in memory and the rows are written with chunked
+    ``bulk_create(update_conflicts=True)``. ``prev_avg_weights`` maps user id to
+    the previous month's average weight; when omitted it is read in one query.
 
-    if not log_list:
-        return {
-            "period": {"start": str(start_date), "end": str(today)},
-            "days_logged": 0,
-            "message": "No logs found for the past week.",
+    Returns a dict of user id to the month's average weight, which can be fed
+    back in as ``prev_avg_weights`` for the following month.
+    """
+    first_day, last_day, total_days = _month_bounds(month_date)
+
+    counts_by_user = {
+        row.pop("user_id"): row
+        for row in DailyLog.objects.filter(
+            user__in=users, date__gte=first_day, date__lte=last_day
+        )
+        .order_by()
+        .values("user_id")
+        .annotate(**_MONTHLY_AGGREGATES)
+    }
+
+    if prev_avg_weights is None:
+        prev_month = (first_day - timedelta(days=1)).replace(day=1)
+        prev_avg_weights = dict(
+            MonthlyMetrics.objects.filter(user__in=users, month=prev_month).values_list(
+                "user_id", "avg_weight"
+            )
+        )
+
+    avg_weights = {}
+    batch = []
+
+    def flush():
+        MonthlyMetrics.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=["user", "month"],
+            update_fields=MONTHLY_METRIC_FIELDS + ["updated_at"],
+        )
+        batch.clear()
+
+    for user_id, height_cm in users.values_list("id", "height_cm").iterator(
+        chunk_size=chunk_size
+    ):
+        values = _monthly_values(
+            counts_by_user.get(user_id, _NO_LOGS),
+            total_days,
+            height_cm,
+            prev_avg_weights.get(user_id),
+        )
+        avg_weights[user_id] = values["avg_weight"]
+        batch.append(MonthlyMetrics(user_id=user_id, month=first_day, **values))
+        if len(batch) >= chunk_size:
+            flush()
+    if batch:
+        flush()
+
+    return avg_weights
+
+
+@cached_per_user("weekly_history")
+def get_weekly_history(user, weeks=12):
+    """Return the stored weekly rollups for the last ``weeks`` ISO weeks, newest first."""
+    today = timezone.now().date()
+    first_week = today - timedelta(days=today.weekday(), weeks=weeks - 1)
+    rows = WeeklyMetrics.objects.filter(user=user, week_start__gte=first_week).values(
+        "week_start",
+        "days_logged",
+        "avg_calories",
+        "avg_protein",
+        "workouts_done",
+        "protein_hit_days",
+        "workout_types",
+        "weight_change",
+        "consistency_score",
+    )
+    return [
+        {
+            "period": {
+                "start": str(row["week_start"]),
+                "end": str(row["week_start"] + timedelta(days=6)),
+            },
+            "days_logged": row["days_logged"],
+            "avg_calories": row["avg_calories"],
+            "avg_protein": row["avg_protein"],
+            "workouts_done": row["workouts_done"],
+            "workout_types_used": row["workout_types"],
+            "weight_change": (
+                float(row["weight_change"]) if row["weight_change"] is not None else None
+            ),
+            "consistency_score": row["consistency_score"],
+            "protein_hit_days": row["protein_hit_days"],
         }
+        for row in rows.order_by("-week_start")
+    ]
 
-    days_logged = len(log_list)
-    avg_calories = round(sum(l.calories for l in log_list) / days_logged)
-    avg_protein = round(sum(l.protein for l in log_list) / days_logged)
-    workouts_done = sum(1 for l in log_list if l.workout)
 
-    workout_types_used = list(set(
-        l.workout_type for l in log_list
-        if l.workout and l.workout_type
-    ))
+@cached_per_user("weekly_review")
+def get_weekly_review(user):
+    """Compute weekly summary for the last 7 days."""
+    today = timezone.now().date()
+    rows = load_log_window(user, today - timedelta(days=6), today)
+    return weekly_review_from_window(rows, today)
+
+
+def mark_months_dirty(user_id, dates):
+    """Queue the months containing ``dates`` for recomputation by the worker.
+
+    The following month is queued too when it has already started, because
+    its weight change is measured against this month's average.
+    """
+    current_month = timezone.now().date().replace(day=1)
+    months = set()
+    for day in dates:
+        month = day.replace(day=1)
+        months.add(month)
+        next_month = (month + timedelta(days=32)).replace(day=1)
+        if next_month <= current_month:
+            months.add(next_month)
+
+    now = timezone.now()
+    DirtyMonth.objects.bulk_create(
+        [DirtyMonth(user_id=user_id, month=month, marked_at=now) for month in months],
+        update_conflicts=True,
+        unique_fields=["user", "month"],
+        update_fields=["marked_at"],
+    )
 
-    # Weight change: first vs last logged weight
-    sorted_logs = sorted(log_list, key=lambda l: l.date)
-    weight_change = round(float(sorted_logs[-1].weight) - float(sorted_logs[0].weight), 1) if len(sorted_logs) >= 2 else None
 
-    # Consistency score (7-day version)
-    protein_hit_days = sum(1 for l in log_list if l.protein_hit)
-    consistency_score = round(
-        (days_logged / 7) * 40
-        + (protein_hit_days / days_logged) * 30
-        + (workouts_done / days_logged) * 30
+def drain_dirty_months(batch_size=500):
+    """Recompute one batch of queued months; returns how many were processed.
+
+    Months are processed oldest first so each month's weight change sees the
+    freshly computed previous month. A queue row is only removed if it was not
+    re-marked while its month was being computed.
+    """
+    claimed_at = timezone.now()
+    rows = list(
+        DirtyMonth.objects.filter(marked_at__lte=claimed_at)
+        .order_by("marked_at")
+        .values_list("id", "user_id", "month")[:batch_size]
     )
 
-    return {
-        "period": {"start": str(start_date), "end": str(today)},
-        "days_logged": days_logged,
-        "avg_calories": avg_calories,
-        "avg_protein": avg_protein,
-        "workouts_done": workouts_done,
-        "workout_types_used": workout_types_used,
-        "weight_change": weight_change,
-        "consistency_score": min(consistency_score, 100),
-        "protein_hit_days": protein_hit_days,
-    }
+    by_month = {}
+    for row_id, user_id, month in rows:
+        ids, user_ids = by_month.setdefault(month, ([], []))
+        ids.append(row_id)
+        user_ids.append(user_id)
+
+    User = get_user_model()
+    for month in sorted(by_month):
+        ids, user_ids = by_month[month]
+        with transaction.atomic():
+            compute_monthly_metrics_batch(month, User.objects.filter(pk__in=user_ids))
+            DirtyMonth.objects.filter(id__in=ids, marked_at__lte=claimed_at).delete()
+        for user_id in user_ids:
+            bump_data_version(user_id)
+
+    return len(rows)
+
+
+def request_reevaluation(user_id):
+    """Queue the user's DailyLog flags for re-evaluation against their targets."""
+    PendingReevaluation.objects.bulk_create(
+        [PendingReevaluation(user_id=user_id, requested_at=timezone.now())],
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=["requested_at"],
+    )
 
 
-def refresh_if_stale(user):
-    """Refresh monthly metrics if stale (> 24h old)."""
-    today = timezone.now().date()
-    current_month = today.replace(day=1)
-    metrics = MonthlyMetrics.objects.filter(user=user, month=current_month).first()
-
-    if not metrics or (timezone.now() - metrics.updated_at).total_seconds() > 86400:
-        compute_monthly_metrics(user, today)
-        # Also recompute previous month
-        prev_month = (current_month - timedelta(days=1)).replace(day=1)
-        compute_monthly_metrics(user, prev_month)
+def drain_reevaluations(batch_size=100):
+    """Re-evaluate one batch of queued users; returns how many were processed.
+
+    Each user's history is updated set-based by ``reevaluate_daily_logs``,
+    which in turn queues the affected months. As with the month queue, a
+    request re-made while it was being processed stays queued.
+    """
+    claimed_at = timezone.now()
+    user_ids = list(
+        PendingReevaluation.objects.filter(requested_at__lte=claimed_at)
+        .order_by("requested_at")
+        .values_list("user_id", flat=True)[:batch_size]
+    )
+    targets = UserTarget.objects.in_bulk(user_ids, field_name="user_id")
+    for user_id in user_ids:
+        with transaction.atomic():
+            target = targets.get(user_id)
+            if target is not None:
+                reevaluate_daily_logs(user_id, target)
+            PendingReevaluation.objects.filter(
+                user_id=user_id, requested_at__lte=claimed_at
+            ).delete()
+    return len(user_ids)
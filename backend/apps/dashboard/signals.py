@@ -0,0 +1,116 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.foods.models import FoodEntry
+from apps.foods.signals import food_entries_bulk_changed
+from apps.logs.models import CustomMetricEntry, DailyLog
+from apps.logs.signals import custom_entries_bulk_changed, daily_logs_bulk_changed
+from apps.measurements.models import BodyMeasurement
+from apps.users.models import User, UserTarget
+
+from .cache import bump_data_version
+from .services import mark_months_dirty, request_reevaluation
+from .streaks import rebuild_streak_state, record_log_deleted, record_log_saved
+from .weekly import refresh_weeks
+
+
+@receiver(post_save, sender=DailyLog)
+def update_streaks_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous_date = getattr(instance, "_loaded_values", {}).get("date")
+    record_log_saved(instance, previous_date=previous_date)
+
+
+@receiver(post_delete, sender=DailyLog)
+def update_streaks_on_delete(sender, instance, **kwargs):
+    record_log_deleted(instance)
+
+
+def _touched_dates(instance):
+    dates = {instance.date}
+    previous_date = getattr(instance, "_loaded_values", {}).get("date")
+    if previous_date is not None:
+        dates.add(previous_date)
+    return dates
+
+
+@receiver(post_save, sender=DailyLog)
+def update_rollups_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    dates = _touched_dates(instance)
+    mark_months_dirty(instance.user_id, dates)
+    refresh_weeks(instance.user_id, dates)
+
+
+@receiver(post_delete, sender=DailyLog)
+def update_rollups_on_delete(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, User):
+        # The user is being deleted; its rollups are going with it.
+        return
+    mark_months_dirty(instance.user_id, [instance.date])
+    refresh_weeks(instance.user_id, [instance.date])
+
+
+def _log_owner_id(instance):
+    """User id for models that hang off a DailyLog."""
+    if type(instance).daily_log.is_cached(instance):
+        return instance.daily_log.user_id
+    return (
+        DailyLog.objects.filter(pk=instance.daily_log_id)
+        .values_list("user_id", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=DailyLog)
+@receiver(post_delete, sender=DailyLog)
+@receiver(post_save, sender=BodyMeasurement)
+@receiver(post_delete, sender=BodyMeasurement)
+@receiver(post_save, sender=UserTarget)
+@receiver(post_delete, sender=UserTarget)
+def invalidate_dashboard_cache(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_data_version(instance.user_id)
+
+
+@receiver(post_save, sender=FoodEntry)
+@receiver(post_delete, sender=FoodEntry)
+@receiver(post_save, sender=CustomMetricEntry)
+@receiver(post_delete, sender=CustomMetricEntry)
+def invalidate_dashboard_cache_for_entry(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    user_id = _log_owner_id(instance)
+    if user_id is not None:
+        bump_data_version(user_id)
+
+
+@receiver(custom_entries_bulk_changed, sender=CustomMetricEntry)
+@receiver(food_entries_bulk_changed, sender=FoodEntry)
+def invalidate_dashboard_cache_for_bulk_entries(sender, user_id, **kwargs):
+    bump_data_version(user_id)
+
+
+@receiver(daily_logs_bulk_changed, sender=DailyLog)
+def refresh_after_bulk_change(sender, user_id, dates, **kwargs):
+    rebuild_streak_state(user_id)
+    mark_months_dirty(user_id, dates)
+    refresh_weeks(user_id, dates)
+    bump_data_version(user_id)
+
+
+@receiver(post_save, sender=UserTarget)
+def queue_reevaluation_on_target_change(
+    sender, instance, created=False, raw=False, **kwargs
+):
+    if raw:
+        return
+    loaded = getattr(instance, "_loaded_values", {})
+    changed = created or any(
+        loaded.get(field) != getattr(instance, field)
+        for field in ("calorie_target", "protein_target")
+    )
+    if changed:
+        request_reevaluation(instance.user_id)
@@ -0,0 +1,211 @@
+"""Incremental maintenance of ``UserStreakState``.
+
+Every DailyLog write is folded into the stored state without rescanning
+history: a new day shifts the recent-day bitmasks, and an edit or delete
+inside the window flips one bit. Current and best streaks are then
+re-derived from the masks, the run just outside the window (``tail``) and
+the longest run that already left it (``settled_best``). Only writes older
+than the window, or deleting the newest logged day, replay the history via
+``rebuild_streak_state``.
+"""
+
+from datetime import timedelta
+
+from django.db import transaction
+
+from apps.logs.models import DailyLog
+
+from .models import UserStreakState
+
+STREAK_WINDOW = 62
+_FULL_MASK = (1 << STREAK_WINDOW) - 1
+
+# (state prefix, DailyLog flag)
+STREAK_METRICS = (
+    ("protein", "protein_hit"),
+    ("calorie", "calories_ok"),
+    ("workout", "workout"),
+)
+
+
+def _lowest_bit(mask):
+    return (mask & -mask).bit_length() - 1
+
+
+def _runs(mask, tail):
+    """Yield ``(newest_position, length)`` for each run of hits in the window.
+
+    A run touching the oldest bit is extended by ``tail``.
+    """
+    i = 0
+    while i < STREAK_WINDOW:
+        if not mask & (1 << i):
+            i += 1
+            continue
+        start = i
+        while i < STREAK_WINDOW and mask & (1 << i):
+            i += 1
+        length = i - start
+        if i == STREAK_WINDOW:
+            length += tail
+        yield start, length
+
+
+def _refresh_derived(state):
+    """Recompute the stored current and best streaks from the window state."""
+    newest = _lowest_bit(state.logged_recent) if state.logged_recent else None
+    for metric, _ in STREAK_METRICS:
+        mask = getattr(state, f"{metric}_recent")
+        tail = getattr(state, f"{metric}_tail")
+        best = getattr(state, f"{metric}_settled_best")
+        current = 0
+        for start, length in _runs(mask, tail):
+            best = max(best, length)
+            if start == newest:
+                current = length
+        setattr(state, f"{metric}_current", current)
+        setattr(state, f"{metric}_best", best)
+
+
+def _reset(state):
+    state.anchor_date = None
+    state.logged_recent = 0
+    for metric, _ in STREAK_METRICS:
+        setattr(state, f"{metric}_recent", 0)
+        setattr(state, f"{metric}_tail", 0)
+        setattr(state, f"{metric}_settled_best", 0)
+    _refresh_derived(state)
+
+
+def _advance(state, log_date, flags):
+    """Move the window forward so ``log_date`` becomes the anchor, then record it."""
+    gap = (
+        (log_date - state.anchor_date).days if state.anchor_date else STREAK_WINDOW + 1
+    )
+    # Days at positions >= boundary slide out of the window.
+    boundary = STREAK_WINDOW - gap
+    for metric, field in STREAK_METRICS:
+        mask = getattr(state, f"{metric}_recent")
+        tail = getattr(state, f"{metric}_tail")
+        settled = getattr(state, f"{metric}_settled_best")
+        new_tail = 0
+        for start, length in _runs(mask, tail):
+            if start >= boundary:
+                settled = max(settled, length)
+            if start <= boundary < start + length:
+                # The run covering the new outside day, measured from that day back.
+                new_tail = length - (boundary - start)
+        mask = (mask << gap) & _FULL_MASK if gap < STREAK_WINDOW else 0
+        if flags[field]:
+            mask |= 1
+        setattr(state, f"{metric}_recent", mask)
+        setattr(state, f"{metric}_tail", new_tail)
+        setattr(state, f"{metric}_settled_best", settled)
+    logged = state.logged_recent
+    logged = (logged << gap) & _FULL_MASK if gap < STREAK_WINDOW else 0
+    state.logged_recent = logged | 1
+    state.anchor_date = log_date
+
+
+def _set_day(state, i, flags):
+    """Overwrite position ``i`` of the window; ``flags=None`` clears the day."""
+    bit = 1 << i
+    for metric, field in STREAK_METRICS:
+        mask = getattr(state, f"{metric}_recent")
+        if flags and flags[field]:
+            mask |= bit
+        else:
+            mask &= ~bit
+        setattr(state, f"{metric}_recent", mask)
+    if flags is None:
+        state.logged_recent &= ~bit
+    else:
+        state.logged_recent |= bit
+
+
+def _apply_save(state, log_date, flags):
+    if state.anchor_date is None or log_date > state.anchor_date:
+        _advance(state, log_date, flags)
+        return True
+    i = (state.anchor_date - log_date).days
+    if i >= STREAK_WINDOW:
+        return False
+    _set_day(state, i, flags)
+    return True
+
+
+def _apply_delete(state, log_date):
+    if state.anchor_date is None or log_date > state.anchor_date:
+        return True
+    i = (state.anchor_date - log_date).days
+    if i >= STREAK_WINDOW:
+        return False
+    _set_day(state, i, None)
+    # With no logged day left in the window the newest log is unknown.
+    return state.logged_recent != 0
+
+
+def rebuild_streak_state(user_id):
+    """Replay a user's full DailyLog history into a fresh ``UserStreakState``."""
+    state = UserStreakState(user_id=user_id)
+    _reset(state)
+    rows = (
+        DailyLog.objects.filter(user_id=user_id)
+        .order_by("date")
+        .values("date", "protein_hit", "calories_ok", "workout")
+    )
+    for row in rows.iterator():
+        _advance(state, row["date"], row)
+    _refresh_derived(state)
+    state.save()
+    return state
+
+
+def _locked_state(user_id):
+    return UserStreakState.objects.select_for_update().filter(user_id=user_id).first()
+
+
+def record_log_saved(log, previous_date=None):
+    """Fold a created or updated DailyLog into the user's streak state."""
+    flags = {field: getattr(log, field) for _, field in STREAK_METRICS}
+    # Runs from post_save inside the log's own write, so no savepoint: an
+    # error here aborts that write either way.
+    with transaction.atomic(savepoint=False):
+        state = _locked_state(log.user_id)
+        if state is None:
+            return rebuild_streak_state(log.user_id)
+        ok = True
+        if previous_date is not None and previous_date != log.date:
+            ok = _apply_delete(state, previous_date)
+        if ok and _apply_save(state, log.date, flags):
+            _refresh_derived(state)
+            state.save()
+            return state
+        return rebuild_streak_state(log.user_id)
+
+
+def record_log_deleted(log):
+    """Remove a deleted DailyLog from the user's streak state."""
+    with transaction.atomic(savepoint=False):
+        state = _locked_state(log.user_id)
+        if state is None:
+            return None
+        if _apply_delete(state, log.date):
+            _refresh_derived(state)
+            state.save()
+            return state
+        return rebuild_streak_state(log.user_id)
+
+
+def streaks_from_state(state, today):
+    """Return the streak payload; a run only counts if it ends today or yesterday."""
+    active = False
+    if state is not None and state.logged_recent:
+        newest = state.anchor_date - timedelta(days=_lowest_bit(state.logged_recent))
+        active = newest >= today - timedelta(days=1)
+    data = {}
+    for metric, _ in STREAK_METRICS:
+        data[f"{metric}_streak"] = getattr(state, f"{metric}_current") if active else 0
+    for metric, _ in STREAK_METRICS:
+        data[f"best_{metric}_streak"] = getattr(state, f"{metric}_best") if state else 0
+    return data
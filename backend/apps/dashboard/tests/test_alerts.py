@@ -0,0 +1,84 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from apps.dashboard.alerts import evaluate_alerts, get_rule_timings, reset_rule_timings
+from apps.logs.models import DailyLog
+from apps.measurements.models import BodyMeasurement
+
+RULES = {
+    "calories_off_target": {"enabled": True, "threshold": 3},
+    "no_workouts": {"enabled": True, "threshold": 5},
+    "workout_variety": {"enabled": True, "threshold": 2},
+    "measurement_overdue": {"enabled": True, "threshold": 30},
+}
+
+
+def _seed_off_target(user, days):
+    today = timezone.now().date()
+    for offset in range(days):
+        DailyLog.objects.create(
+            user=user, date=today - timedelta(days=offset), weight=Decimal("75.0")
+        )
+
+
+@pytest.mark.django_db
+class TestAlertEngine:
+    def test_all_rules_share_two_queries(
+        self, create_onboarded_user, django_assert_num_queries
+    ):
+        user, _ = create_onboarded_user()
+        _seed_off_target(user, 7)
+
+        with django_assert_num_queries(2):
+            alerts = evaluate_alerts(user)
+
+        messages = [alert["message"] for alert in alerts]
+        assert "7 days off calorie target in the last week" in messages
+        assert "No workouts in 7 days" in messages
+        assert "No body measurements recorded yet" in messages
+
+    def test_rules_can_be_disabled_and_tuned(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        _seed_off_target(user, 2)
+        BodyMeasurement.objects.create(
+            user=user, date=timezone.now().date() - timedelta(days=10)
+        )
+        rules = {
+            **RULES,
+            "calories_off_target": {"enabled": True, "threshold": 2},
+            "workout_variety": {"enabled": False},
+            "measurement_overdue": {"enabled": True, "threshold": 7},
+        }
+
+        with override_settings(DASHBOARD_ALERT_RULES=rules):
+            messages = [alert["message"] for alert in evaluate_alerts(user)]
+
+        assert messages == [
+            "2 days off calorie target in the last week",
+            "No body measurement in 10 days",
+        ]
+
+    def test_measurement_query_skipped_when_rule_disabled(
+        self, create_onboarded_user, django_assert_num_queries
+    ):
+        user, _ = create_onboarded_user()
+        rules = {**RULES, "measurement_overdue": {"enabled": False}}
+
+        with override_settings(DASHBOARD_ALERT_RULES=rules), django_assert_num_queries(
+            1
+        ):
+            evaluate_alerts(user)
+
+    def test_timings_are_recorded_per_rule(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        reset_rule_timings()
+
+        evaluate_alerts(user)
+
+        timings = get_rule_timings()
+        assert set(timings) == set(RULES)
+        assert all(stats["calls"] == 1 for stats in timings.values())
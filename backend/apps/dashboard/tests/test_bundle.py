@@ -0,0 +1,65 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+
+from apps.dashboard import services
+from apps.logs.models import DailyLog
+from apps.measurements.models import BodyMeasurement
+
+
+def _seed_logs(user, days):
+    today = timezone.now().date()
+    for offset in range(days):
+        DailyLog.objects.create(
+            user=user,
+            date=today - timedelta(days=offset),
+            weight=Decimal("75.0") - Decimal(offset) / 10,
+            calories=2000 if offset % 3 else 2600,
+            protein=160 if offset % 4 else 90,
+            workout=offset % 2 == 0,
+            workout_type="cardio" if offset % 2 == 0 else None,
+            protein_hit=bool(offset % 4),
+            calories_ok=bool(offset % 3),
+        )
+
+
+@pytest.mark.django_db
+class TestDashboardBundle:
+    def test_bundle_matches_individual_sections(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        _seed_logs(user, 20)
+        BodyMeasurement.objects.create(
+            user=user, date=timezone.now().date() - timedelta(days=40)
+        )
+
+        bundle = services.get_dashboard_bundle(user, trend_days=14)
+
+        assert bundle["summary"] == services.get_dashboard_summary(user)
+        assert bundle["trends"] == services.get_weight_trends(user, 14)
+        assert bundle["streaks"] == services.compute_streaks(user)
+        assert bundle["alerts"] == services.get_alerts(user)
+        assert bundle["weekly_review"] == services.get_weekly_review(user)
+
+    def test_bundle_query_count(
+        self, create_onboarded_user, django_assert_max_num_queries
+    ):
+        user, _ = create_onboarded_user()
+        _seed_logs(user, 30)
+        user.refresh_from_db()
+
+        with django_assert_max_num_queries(3):
+            services.get_dashboard_bundle(user)
+
+    def test_bundle_endpoint(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        _seed_logs(user, 3)
+
+        response = client.get("/api/v1/dashboard/bundle/?days=30")
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert set(data) == {"summary", "trends", "streaks", "alerts", "weekly_review"}
+        assert data["summary"]["has_logged_today"] is True
+        assert len(data["trends"]) == 3
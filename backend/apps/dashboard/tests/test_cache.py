@@ -0,0 +1,58 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from django.utils import timezone
+
+from apps.dashboard import services
+from apps.dashboard.cache import get_cache_stats, reset_cache_stats
+from apps.logs.models import DailyLog
+from apps.measurements.models import BodyMeasurement
+
+
+@pytest.mark.django_db
+class TestDashboardCache:
+    def setup_method(self):
+        reset_cache_stats()
+
+    def test_repeat_call_is_served_from_cache(
+        self, create_onboarded_user, django_assert_num_queries
+    ):
+        user, _ = create_onboarded_user()
+        services.get_alerts(user)
+
+        with django_assert_num_queries(0):
+            services.get_alerts(user)
+
+        assert get_cache_stats() == {"hits": 1, "misses": 1}
+
+    def test_arguments_are_part_of_the_key(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        services.get_weight_trends(user, 7)
+        services.get_weight_trends(user, 30)
+
+        assert get_cache_stats()["misses"] == 2
+
+    def test_writes_invalidate(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        assert services.get_dashboard_summary(user)["has_logged_today"] is False
+
+        DailyLog.objects.create(
+            user=user, date=timezone.now().date(), weight=Decimal("75.0")
+        )
+        assert services.get_dashboard_summary(user)["has_logged_today"] is True
+
+        alerts = services.get_alerts(user)
+        BodyMeasurement.objects.create(user=user, date=timezone.now().date())
+        assert services.get_alerts(user) != alerts
+
+    def test_entries_roll_over_at_utc_midnight(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        services.compute_streaks(user)
+
+        tomorrow = timezone.now() + timedelta(days=1)
+        with mock.patch("django.utils.timezone.now", return_value=tomorrow):
+            services.compute_streaks(user)
+
+        assert get_cache_stats() == {"hits": 0, "misses": 2}
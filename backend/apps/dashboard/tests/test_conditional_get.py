@@ -0,0 +1,114 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from django.utils import timezone
+
+from apps.dashboard.models import MonthlyMetrics
+from apps.logs.models import DailyLog
+
+
+def _log(user, offset=0, **kwargs):
+    return DailyLog.objects.create(
+        user=user,
+        date=timezone.now().date() - timedelta(days=offset),
+        weight=Decimal("75.0"),
+        calories=2000,
+        protein=150,
+        **kwargs,
+    )
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    def test_repeat_poll_returns_304_without_running_services(
+        self, create_onboarded_user
+    ):
+        user, client = create_onboarded_user()
+        _log(user)
+
+        first = client.get("/api/v1/dashboard/summary/")
+        assert first.status_code == 200
+        etag = first["ETag"]
+        assert first["Last-Modified"]
+
+        with mock.patch("apps.dashboard.services.get_dashboard_summary") as summary:
+            second = client.get("/api/v1/dashboard/summary/", HTTP_IF_NONE_MATCH=etag)
+
+        assert second.status_code == 304
+        assert second["ETag"] == etag
+        assert second.content == b""
+        summary.assert_not_called()
+
+    def test_writes_and_deletes_change_the_etag(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        old_log = _log(user, offset=1)
+        etag = client.get("/api/v1/dashboard/streaks/")["ETag"]
+
+        _log(user)
+        after_write = client.get("/api/v1/dashboard/streaks/", HTTP_IF_NONE_MATCH=etag)
+        assert after_write.status_code == 200
+        assert after_write["ETag"] != etag
+
+        old_log.delete()
+        after_delete = client.get(
+            "/api/v1/dashboard/streaks/", HTTP_IF_NONE_MATCH=after_write["ETag"]
+        )
+        assert after_delete.status_code == 200
+
+    def test_etag_is_per_url(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        _log(user)
+
+        week = client.get("/api/v1/dashboard/trends/?days=7")["ETag"]
+        month = client.get("/api/v1/dashboard/trends/?days=30", HTTP_IF_NONE_MATCH=week)
+
+        assert month.status_code == 200
+        assert month["ETag"] != week
+
+    def test_logs_today(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        _log(user)
+
+        first = client.get("/api/v1/logs/today/")
+        second = client.get("/api/v1/logs/today/", HTTP_IF_NONE_MATCH=first["ETag"])
+
+        assert first.status_code == 200
+        assert second.status_code == 304
+
+    def test_if_modified_since(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        _log(user)
+
+        first = client.get("/api/v1/logs/")
+        second = client.get(
+            "/api/v1/logs/", HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]
+        )
+
+        assert second.status_code == 304
+
+    def test_if_modified_since_sees_deletes(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        _log(user, offset=1)
+        latest = _log(user)
+        url = "/api/v1/dashboard/weekly-review/"
+
+        first = client.get(url)
+        latest.delete()
+        second = client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+
+        assert second.status_code == 200
+        assert second["Last-Modified"] != first["Last-Modified"]
+
+    def test_monthly_rollup_writes_change_the_etag(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        _log(user)
+        url = "/api/v1/dashboard/monthly/"
+        etag = client.get(url)["ETag"]
+
+        MonthlyMetrics.objects.create(
+            user=user, month=timezone.now().date().replace(day=1)
+        )
+
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
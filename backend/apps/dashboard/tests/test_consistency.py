@@ -0,0 +1,80 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+
+from apps.dashboard import services
+from apps.logs.models import DailyLog
+
+
+def _seed(user, start, days):
+    for offset in range(days):
+        if offset % 5 == 4:
+            continue
+        DailyLog.objects.create(
+            user=user,
+            date=start + timedelta(days=offset),
+            weight=Decimal("75.0"),
+            calories=2000,
+            protein=150,
+            protein_hit=offset % 3 != 0,
+            workout=offset % 2 == 0,
+        )
+
+
+def _expected(user, day, window):
+    logs = DailyLog.objects.filter(
+        user=user, date__gt=day - timedelta(days=window), date__lte=day
+    )
+    days_logged = logs.count()
+    return min(
+        services.compute_consistency_score(
+            days_logged,
+            window,
+            logs.filter(protein_hit=True).count(),
+            logs.filter(workout=True).count(),
+        ),
+        100,
+    )
+
+
+@pytest.mark.django_db
+class TestConsistencySeries:
+    def test_matches_per_window_formula(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        start = timezone.now().date() - timedelta(days=40)
+        _seed(user, start, 40)
+
+        series = services.get_consistency_series(
+            user, start + timedelta(days=3), start + timedelta(days=45), window=7
+        )
+
+        assert len(series) == 43
+        for offset, point in enumerate(series):
+            day = start + timedelta(days=3 + offset)
+            assert point["date"] == day.isoformat()
+            assert point["consistency_score"] == _expected(user, day, 7)
+
+    def test_single_query(self, create_onboarded_user, django_assert_num_queries):
+        user, _ = create_onboarded_user()
+        today = timezone.now().date()
+        _seed(user, today - timedelta(days=800), 800)
+
+        with django_assert_num_queries(1):
+            series = services.get_consistency_series.uncached(
+                user, today - timedelta(days=730), today, window=30
+            )
+        assert len(series) == 731
+
+    def test_endpoint_validation(self, create_onboarded_user):
+        _, client = create_onboarded_user()
+
+        assert client.get("/api/v1/dashboard/consistency/").status_code == 200
+        assert client.get("/api/v1/dashboard/consistency/?window=0").status_code == 400
+        assert (
+            client.get(
+                "/api/v1/dashboard/consistency/?from=2024-02-01&to=2024-01-01"
+            ).status_code
+            == 400
+        )
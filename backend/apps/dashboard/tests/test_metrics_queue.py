@@ -0,0 +1,75 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.dashboard.models import DirtyMonth, MonthlyMetrics
+from apps.dashboard.services import drain_dirty_months, mark_months_dirty
+from apps.logs.models import DailyLog
+
+
+@pytest.mark.django_db
+class TestMetricsQueue:
+    def test_log_write_marks_month_dirty(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        today = timezone.now().date()
+        DailyLog.objects.create(user=user, date=today, weight=Decimal("75.0"))
+
+        assert list(
+            DirtyMonth.objects.filter(user=user).values_list("month", flat=True)
+        ) == [today.replace(day=1)]
+
+    def test_past_month_also_marks_following_month(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        last_month = (timezone.now().date().replace(day=1) - timedelta(days=1)).replace(
+            day=1
+        )
+        mark_months_dirty(user.pk, [last_month])
+
+        assert DirtyMonth.objects.filter(user=user).count() == 2
+
+    def test_worker_drains_queue(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        DailyLog.objects.create(
+            user=user,
+            date=timezone.now().date(),
+            weight=Decimal("75.0"),
+            protein=200,
+            protein_hit=True,
+        )
+
+        call_command("process_metrics_queue")
+
+        assert not DirtyMonth.objects.exists()
+        metrics = MonthlyMetrics.objects.get(user=user)
+        assert metrics.days_logged == 1
+        assert metrics.protein_hit_days == 1
+
+    def test_remark_during_processing_is_kept(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        mark_months_dirty(user.pk, [timezone.now().date()])
+        DirtyMonth.objects.update(marked_at=timezone.now() + timedelta(minutes=1))
+
+        assert drain_dirty_months() == 0
+        assert DirtyMonth.objects.count() == 1
+
+    def test_view_never_computes_inline(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        DailyLog.objects.create(
+            user=user, date=timezone.now().date(), weight=Decimal("75.0")
+        )
+
+        response = client.get("/api/v1/dashboard/monthly/")
+
+        body = response.json()
+        assert response.status_code == 200
+        assert body["data"] == []
+        assert body["meta"] == {"computed_at": None, "refresh_pending": True}
+
+        drain_dirty_months()
+        body = client.get("/api/v1/dashboard/monthly/").json()
+        assert len(body["data"]) == 1
+        assert body["meta"]["computed_at"] is not None
+        assert body["meta"]["refresh_pending"] is False
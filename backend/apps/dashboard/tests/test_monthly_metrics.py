@@ -0,0 +1,88 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+
+from apps.dashboard.models import MonthlyMetrics
+from apps.dashboard.services import (
+    compute_monthly_metrics,
+    compute_monthly_metrics_batch,
+)
+from apps.logs.models import DailyLog
+from apps.users.models import User
+
+COMPARED_FIELDS = [
+    "avg_weight",
+    "bmi",
+    "bmi_category",
+    "weight_change",
+    "consistency_score",
+    "days_logged",
+    "protein_hit_days",
+    "workout_days",
+    "total_days_in_month",
+]
+
+
+def _seed_month(user, first_day, days, weight):
+    for offset in range(days):
+        DailyLog.objects.create(
+            user=user,
+            date=first_day + timedelta(days=offset),
+            weight=Decimal(weight) + Decimal(offset) / 10,
+            protein_hit=offset % 2 == 0,
+            workout=offset % 3 == 0,
+        )
+
+
+def _rows(month):
+    return {
+        m.user_id: [getattr(m, field) for field in COMPARED_FIELDS]
+        for m in MonthlyMetrics.objects.filter(month=month)
+    }
+
+
+@pytest.mark.django_db
+class TestMonthlyMetricsBatch:
+    def test_batch_matches_per_user_computation(self, create_onboarded_user):
+        prev_month, month = date(2026, 1, 1), date(2026, 2, 1)
+        users = []
+        for i in range(3):
+            user, _ = create_onboarded_user()
+            _seed_month(user, prev_month, 10 + i, "80.0")
+            _seed_month(user, month, 5 * i, "79.0")
+            users.append(user)
+
+        for user in users:
+            compute_monthly_metrics(user, prev_month)
+            compute_monthly_metrics(user, month)
+        expected = _rows(month)
+        MonthlyMetrics.objects.all().delete()
+
+        queryset = User.objects.filter(pk__in=[u.pk for u in users])
+        prev_avg = compute_monthly_metrics_batch(prev_month, queryset, chunk_size=2)
+        compute_monthly_metrics_batch(
+            month, queryset, prev_avg_weights=prev_avg, chunk_size=2
+        )
+
+        assert _rows(month) == expected
+        assert expected[users[2].pk][3] is not None
+
+    def test_batch_query_count_is_independent_of_users(
+        self, create_onboarded_user, django_assert_max_num_queries
+    ):
+        month = date(2026, 3, 1)
+        for _ in range(6):
+            user, _ = create_onboarded_user()
+            _seed_month(user, month, 4, "70.0")
+
+        with django_assert_max_num_queries(5):
+            compute_monthly_metrics_batch(month, User.objects.all(), chunk_size=100)
+
+    def test_command_upserts_existing_rows(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        call_command("compute_monthly_metrics")
+        call_command("compute_monthly_metrics")
+
+        assert MonthlyMetrics.objects.filter(user=user).count() == 2
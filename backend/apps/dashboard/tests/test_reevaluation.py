@@ -0,0 +1,76 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+
+from apps.dashboard import services
+from apps.dashboard.models import DirtyMonth, PendingReevaluation, UserStreakState
+from apps.logs.models import DailyLog
+from apps.logs.services import compute_daily_evaluations, reevaluate_daily_logs
+from apps.users.models import UserTarget
+
+
+def _seed(user, days):
+    today = timezone.now().date()
+    for offset in range(days):
+        DailyLog.objects.create(
+            user=user,
+            date=today - timedelta(days=offset),
+            weight=Decimal("75.0"),
+            calories=1700 + offset * 7 % 700,
+            protein=80 + offset * 3 % 90,
+        )
+
+
+@pytest.mark.django_db
+class TestReevaluation:
+    def test_set_based_update_matches_python_rules(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        _seed(user, 400)
+        target = UserTarget(calorie_target=2003, protein_target=120)
+
+        changed = reevaluate_daily_logs(user.pk, target, chunk_days=90)
+
+        assert changed
+        for log in DailyLog.objects.filter(user=user):
+            assert (log.protein_hit, log.calories_ok) == compute_daily_evaluations(
+                {"protein": log.protein, "calories": log.calories}, target
+            )
+        assert reevaluate_daily_logs(user.pk, target) == set()
+
+    def test_target_change_is_queued_and_drained(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        _seed(user, 60)
+        PendingReevaluation.objects.all().delete()
+        DirtyMonth.objects.all().delete()
+
+        response = client.put(
+            "/api/v1/targets/",
+            {"calorie_target": 1800, "protein_target": 90, "goal_weight": 70.0},
+            format="json",
+        )
+        assert response.status_code == 200
+        assert PendingReevaluation.objects.filter(user=user).exists()
+        assert not DailyLog.objects.filter(user=user, protein_hit=True).exists()
+
+        assert services.drain_reevaluations() == 1
+
+        assert not PendingReevaluation.objects.exists()
+        expected = sum(
+            1 for log in DailyLog.objects.filter(user=user) if log.protein >= 90
+        )
+        assert DailyLog.objects.filter(user=user, protein_hit=True).count() == expected
+        assert DirtyMonth.objects.filter(user=user).exists()
+        state = UserStreakState.objects.get(user=user)
+        assert state.protein_best > 0
+
+    def test_unrelated_target_fields_do_not_queue(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        PendingReevaluation.objects.all().delete()
+
+        target = UserTarget.objects.get(user=user)
+        target.steps_target = 12000
+        target.save()
+
+        assert not PendingReevaluation.objects.exists()
@@ -0,0 +1,96 @@
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+
+from apps.dashboard.models import UserStreakState
+from apps.dashboard.services import compute_streaks
+from apps.dashboard.streaks import rebuild_streak_state
+from apps.logs.models import DailyLog
+
+STATE_FIELDS = [
+    f"{metric}_{part}"
+    for metric in ("protein", "calorie", "workout")
+    for part in ("current", "best")
+]
+
+
+def _log(user, day, hit=True, **kwargs):
+    defaults = {
+        "weight": Decimal("75.0"),
+        "protein_hit": hit,
+        "calories_ok": hit,
+        "workout": hit,
+    }
+    defaults.update(kwargs)
+    log, _ = DailyLog.objects.update_or_create(user=user, date=day, defaults=defaults)
+    return log
+
+
+def _snapshot(user):
+    state = UserStreakState.objects.get(user=user)
+    return {field: getattr(state, field) for field in STATE_FIELDS}
+
+
+@pytest.mark.django_db
+class TestStreakState:
+    def test_long_streak_is_not_capped(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        today = timezone.now().date()
+        for offset in range(90, -1, -1):
+            _log(user, today - timedelta(days=offset))
+
+        streaks = compute_streaks(user)
+
+        assert streaks["protein_streak"] == 91
+        assert streaks["best_workout_streak"] == 91
+
+    def test_streak_starts_yesterday_when_today_missing(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        today = timezone.now().date()
+        for offset in range(5, 0, -1):
+            _log(user, today - timedelta(days=offset))
+
+        assert compute_streaks(user)["calorie_streak"] == 5
+
+    def test_edit_inside_window_updates_without_rebuild(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        today = timezone.now().date()
+        for offset in range(10, -1, -1):
+            _log(user, today - timedelta(days=offset))
+
+        _log(user, today - timedelta(days=3), hit=False)
+        streaks = compute_streaks(user)
+
+        assert streaks["protein_streak"] == 3
+        assert streaks["best_protein_streak"] == 7
+
+    def test_deleting_today_falls_back_to_yesterday(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        today = timezone.now().date()
+        for offset in range(4, -1, -1):
+            _log(user, today - timedelta(days=offset))
+
+        DailyLog.objects.get(user=user, date=today).delete()
+
+        assert compute_streaks(user)["workout_streak"] == 4
+
+    def test_incremental_state_matches_rebuild(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        today = timezone.now().date()
+        rng = random.Random(7)
+        for offset in range(150, -1, -1):
+            if rng.random() < 0.85:
+                _log(user, today - timedelta(days=offset), hit=rng.random() < 0.8)
+        for _ in range(40):
+            day = today - timedelta(days=rng.randrange(0, 10) ** 2)
+            if rng.random() < 0.3:
+                DailyLog.objects.filter(user=user, date=day).delete()
+            else:
+                _log(user, day, hit=rng.random() < 0.5)
+
+            incremental = _snapshot(user)
+            rebuild_streak_state(user.pk)
+            assert incremental == _snapshot(user)
@@ -0,0 +1,101 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+
+from apps.dashboard.models import WeeklyMetrics
+from apps.dashboard.weekly import backfill_weekly_metrics, week_start_for
+from apps.logs.models import DailyLog
+
+ROLLUP_FIELDS = [
+    "days_logged",
+    "avg_calories",
+    "avg_protein",
+    "workouts_done",
+    "protein_hit_days",
+    "workout_types",
+    "weight_change",
+    "consistency_score",
+]
+
+
+def _seed(user, days):
+    today = timezone.now().date()
+    for offset in range(days):
+        DailyLog.objects.create(
+            user=user,
+            date=today - timedelta(days=offset),
+            weight=Decimal("80.0") - Decimal(offset) / 10,
+            calories=1800 + offset * 10,
+            protein=120 + offset,
+            workout=offset % 2 == 0,
+            workout_type=(
+                ("cardio", "weight_training")[offset % 4 // 2]
+                if offset % 2 == 0
+                else None
+            ),
+            protein_hit=offset % 3 == 0,
+        )
+
+
+def _rollups(user):
+    return {
+        m.week_start: [getattr(m, field) for field in ROLLUP_FIELDS]
+        for m in WeeklyMetrics.objects.filter(user=user)
+    }
+
+
+@pytest.mark.django_db
+class TestWeeklyMetrics:
+    def test_incremental_rollup_matches_backfill(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        _seed(user, 30)
+        DailyLog.objects.filter(user=user).order_by("date").first().delete()
+        incremental = _rollups(user)
+
+        WeeklyMetrics.objects.all().delete()
+        backfill_weekly_metrics(chunk_size=2)
+
+        assert _rollups(user) == incremental
+
+    def test_deleting_last_log_of_week_removes_row(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        log = DailyLog.objects.create(
+            user=user, date=timezone.now().date(), weight=Decimal("75.0")
+        )
+        assert WeeklyMetrics.objects.filter(user=user).count() == 1
+
+        log.delete()
+
+        assert not WeeklyMetrics.objects.filter(user=user).exists()
+
+    def test_backfill_drops_weeks_without_logs(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        other, _ = create_onboarded_user()
+        _seed(user, 3)
+        current = week_start_for(timezone.now().date())
+        # Left behind by a write that bypassed the DailyLog signals.
+        orphan_week = current - timedelta(weeks=10)
+        WeeklyMetrics.objects.create(user=user, week_start=orphan_week, days_logged=2)
+        WeeklyMetrics.objects.create(user=other, week_start=orphan_week, days_logged=2)
+
+        backfill_weekly_metrics(user_ids=[user.pk])
+
+        assert not WeeklyMetrics.objects.filter(
+            user=user, week_start=orphan_week
+        ).exists()
+        assert WeeklyMetrics.objects.filter(user=user).exists()
+        assert WeeklyMetrics.objects.filter(user=other, week_start=orphan_week).exists()
+
+    def test_history_endpoint(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        _seed(user, 40)
+
+        response = client.get("/api/v1/dashboard/weekly-review/?weeks=4")
+
+        data = response.json()["data"]
+        assert response.status_code == 200
+        assert len(data) == 4
+        assert data[0]["period"]["start"] == str(week_start_for(timezone.now().date()))
+        assert data[1]["days_logged"] == 7
@@ -0,0 +1,85 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from django.utils import timezone
+
+from apps.dashboard.timeseries import exponential_moving_average, lttb_indices
+from apps.logs.models import DailyLog
+
+
+class TestTimeseries:
+    def test_lttb_keeps_endpoints_and_extremes(self):
+        x = np.arange(1000)
+        y = np.zeros(1000)
+        y[437] = 50.0
+
+        keep = lttb_indices(x, y, 50)
+
+        assert len(keep) == 50
+        assert keep[0] == 0 and keep[-1] == 999
+        assert 437 in keep
+
+    def test_lttb_returns_everything_below_threshold(self):
+        assert list(lttb_indices(np.arange(5), np.arange(5), 10)) == [0, 1, 2, 3, 4]
+
+    def test_ema_matches_recurrence(self):
+        values = np.linspace(80, 70, 400) + np.sin(np.arange(400))
+        expected = []
+        current = values[0]
+        for value in values:
+            current += 0.1 * (value - current)
+            expected.append(current)
+
+        assert np.allclose(exponential_moving_average(values, 0.1), expected)
+
+
+@pytest.mark.django_db
+class TestWeightTrendRange:
+    def test_long_range_is_downsampled(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        today = timezone.now().date()
+        DailyLog.objects.bulk_create(
+            DailyLog(
+                user=user,
+                date=today - timedelta(days=offset),
+                weight=Decimal("80.0") - Decimal(offset % 50) / 10,
+            )
+            for offset in range(1100)
+        )
+
+        response = client.get(
+            "/api/v1/dashboard/trends/",
+            {
+                "from": str(today - timedelta(days=1200)),
+                "to": str(today),
+                "points": 200,
+                "smooth": "true",
+            },
+        )
+
+        data = response.json()["data"]
+        assert response.status_code == 200
+        assert len(data) == 200
+        assert data[-1]["date"] == str(today)
+        assert set(data[0]) == {"date", "weight", "trend"}
+
+    def test_legacy_days_parameter_still_works(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        DailyLog.objects.create(
+            user=user, date=timezone.now().date(), weight=Decimal("75.0")
+        )
+
+        response = client.get("/api/v1/dashboard/trends/?days=14")
+
+        assert response.json()["data"] == [
+            {"date": str(timezone.now().date()), "weight": 75.0}
+        ]
+
+    def test_invalid_range_is_rejected(self, create_onboarded_user):
+        _, client = create_onboarded_user()
+
+        response = client.get("/api/v1/dashboard/trends/?from=2026-05-01&to=2026-01-01")
+
+        assert response.status_code == 400
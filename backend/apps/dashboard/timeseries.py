@@ -0,0 +1,78 @@
+"""NumPy helpers for long chart series: downsampling, smoothing and rolling sums."""
+
+import numpy as np
+
+# Block length for the closed-form EMA; keeps (1 - alpha) ** -n well inside float64.
+_EMA_BLOCK = 128
+
+
+def lttb_indices(x, y, threshold):
+    """Pick ``threshold`` indices with the largest-triangle-three-buckets algorithm.
+
+    ``x`` must be increasing. The first and last points are always kept; every
+    bucket in between contributes the point forming the largest triangle with
+    the previously selected point and the average of the next bucket, which
+    preserves peaks and dips far better than plain striding.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # Bucket edges over the interior points 1 .. n-2.
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        bx = x[start:end]
+        by = y[start:end]
+        areas = np.abs((x[a] - avg_x) * (by - y[a]) - (x[a] - bx) * (avg_y - y[a]))
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+    return selected
+
+
+def exponential_moving_average(values, alpha=0.1):
+    """Return the EMA of ``values`` seeded with the first value (0 < alpha < 1).
+
+    Computed block-wise in closed form: within a block the recurrence
+    ``s[k] = s[k-1] + alpha * (v[k] - s[k-1])`` unrolls to a cumulative sum
+    weighted by powers of ``1 - alpha``.
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.empty_like(values)
+    if not len(values):
+        return out
+    decay = 1.0 - alpha
+    previous = values[0]
+    for start in range(0, len(values), _EMA_BLOCK):
+        stop = min(start + _EMA_BLOCK, len(values))
+        block = values[start:stop]
+        powers = decay ** np.arange(1, len(block) + 1)
+        out[start:stop] = powers * (previous + np.cumsum(alpha * block / powers))
+        previous = out[stop - 1]
+    return out
+
+
+def rolling_sum(values, window):
+    """Return the sum of each trailing ``window``-long slice of ``values``.
+
+    Element ``i`` covers ``values[i - window + 1 : i + 1]``; the first
+    ``window - 1`` elements are partial sums. One cumulative sum, no loop.
+    """
+    totals = np.cumsum(np.asarray(values, dtype=np.int64))
+    out = totals.copy()
+    out[window:] -= totals[:-window]
+    return out
@@ -1,15 +1,21 @@
-from rest_framework import generics, status
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework import generics
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from apps.core.params import parse_date_param
 from apps.core.permissions import IsEmailVerified, IsOnboarded
 from apps.core.throttling import ReadRateThrottle
 
 from . import services
-from .models import MonthlyMetrics
+from .cache import UserDataConditionalMixin
+from .models import DirtyMonth, MonthlyMetrics
 
 
-class DashboardSummaryView(generics.GenericAPIView):
+class DashboardSummaryView(UserDataConditionalMixin, generics.GenericAPIView):
     """Today's summary — weight, calories, protein vs targets."""
 
     permission_classes = [IsAuthenticated, IsEmailVerified, IsOnboarded]
@@ -21,22 +27,91 @@ class DashboardSummaryView(generics.GenericAPIView):
         return Response(data)
 
 
-class WeightTrendView(generics.GenericAPIView):
-    """Weight trend data for 7/14/30 days."""
+class WeightTrendView(UserDataConditionalMixin, generics.GenericAPIView):
+    """Weight trend data for 7/14/30 days, or any range via ?from=&to=.
+
+    Ranged requests are downsampled to ``points`` (default 200) and accept
+    ``smooth=true`` to add an exponentially smoothed trend weight.
+    """
 
     permission_classes = [IsAuthenticated, IsEmailVerified, IsOnboarded]
     throttle_classes = [ReadRateThrottle]
     swagger_schema = None
 
+    MAX_RANGE_DAYS = 366 * 5
+    DEFAULT_POINTS = 200
+    MAX_POINTS = 1000
+
     def get(self, request):
-        days = int(request.query_params.get("days", 7))
-        if days not in (7, 14, 30):
-            days = 7
-        data = services.get_weight_trends(request.user, days)
+        params = request.query_params
+        if "from" not in params and "to" not in params:
+            days = int(params.get("days", 7))
+            if days not in (7, 14, 30):
+                days = 7
+            data = services.get_weight_trends(request.user, days)
+            return Response(data)
+
+        today = timezone.now().date()
+        end_date = parse_date_param(params.get("to"), "to") or today
+        start_date = parse_date_param(params.get("from"), "from") or (
+            end_date - timedelta(days=365)
+        )
+        if start_date > end_date:
+            raise ValidationError({"from": "Must not be after 'to'."})
+        if (end_date - start_date).days > self.MAX_RANGE_DAYS:
+            raise ValidationError(
+                {"from": f"Range may span at most {self.MAX_RANGE_DAYS} days."}
+            )
+        try:
+            points = int(params.get("points", self.DEFAULT_POINTS))
+        except ValueError:
+            raise ValidationError({"points": "Must be an integer."})
+        points = min(max(points, 3), self.MAX_POINTS)
+        smooth = params.get("smooth", "").lower() in ("1", "true", "yes")
+
+        data = services.get_weight_series(
+            request.user, start_date, end_date, points=points, smooth=smooth
+        )
+        return Response(data)
+
+
+class ConsistencyView(UserDataConditionalMixin, generics.GenericAPIView):
+    """Rolling consistency score for every day in ?from=&to= over ?window= days."""
+
+    permission_classes = [IsAuthenticated, IsEmailVerified, IsOnboarded]
+    throttle_classes = [ReadRateThrottle]
+    swagger_schema = None
+
+    MAX_RANGE_DAYS = 366 * 5
+    MAX_WINDOW = 90
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            window = int(params.get("window", 7))
+        except ValueError:
+            raise ValidationError({"window": "Must be an integer."})
+        if not 1 <= window <= self.MAX_WINDOW:
+            raise ValidationError({"window": f"Must be between 1 and {self.MAX_WINDOW}."})
+
+        end_date = parse_date_param(params.get("to"), "to") or timezone.now().date()
+        start_date = parse_date_param(params.get("from"), "from") or (
+            end_date - timedelta(days=89)
+        )
+        if start_date > end_date:
+            raise ValidationError({"from": "Must not be after 'to'."})
+        if (end_date - start_date).days > self.MAX_RANGE_DAYS:
+            raise ValidationError(
+                {"from": f"Range may span at most {self.MAX_RANGE_DAYS} days."}
+            )
+
+        data = services.get_consistency_series(
+            request.user, start_date, end_date, window=window
+        )
         return Response(data)
 
 
-class StreakView(generics.GenericAPIView):
+class StreakView(UserDataConditionalMixin, generics.GenericAPIView):
     """Protein, calorie, and workout streak data."""
 
     permission_classes = [IsAuthenticated, IsEmailVerified, IsOnboarded]
@@ -48,7 +123,7 @@ class StreakView(generics.GenericAPIView):
         return Response(data)
 
 
-class AlertView(generics.GenericAPIView):
+class AlertView(UserDataConditionalMixin, generics.GenericAPIView):
     """Active alerts and warnings."""
 
     permission_classes = [IsAuthenticated, IsEmailVerified, IsOnboarded]
@@ -60,28 +135,55 @@ class AlertView(generics.GenericAPIView):
         return Response(data)
 
 
-class WeeklyReviewView(generics.GenericAPIView):
-    """Weekly summary for the last 7 days."""
+class WeeklyReviewView(UserDataConditionalMixin, generics.GenericAPIView):
+    """Weekly summary for the last 7 days, or ?weeks=N of ISO-week history."""
 
     permission_classes = [IsAuthenticated, IsEmailVerified, IsOnboarded]
     throttle_classes = [ReadRateThrottle]
     swagger_schema = None
 
+    MAX_WEEKS = 104
+
     def get(self, request):
-        data = services.get_weekly_review(request.user)
+        weeks = request.query_params.get("weeks")
+        if weeks is None:
+            data = services.get_weekly_review(request.user)
+            return Response(data)
+        try:
+            weeks = int(weeks)
+        except ValueError:
+            raise ValidationError({"weeks": "Must be an integer."})
+        weeks = min(max(weeks, 1), self.MAX_WEEKS)
+        data = services.get_weekly_history(request.user, weeks)
         return Response(data)
 
 
-class MonthlyMetricsView(generics.GenericAPIView):
-    """Monthly metrics with on-demand compute if stale."""
+class DashboardBundleView(UserDataConditionalMixin, generics.GenericAPIView):
+    """Summary, trends, streaks, alerts and weekly review in a single response."""
 
     permission_classes = [IsAuthenticated, IsEmailVerified, IsOnboarded]
     throttle_classes = [ReadRateThrottle]
     swagger_schema = None
 
     def get(self, request):
-        services.refresh_if_stale(request.user)
-        metrics = MonthlyMetrics.objects.filter(user=request.user).order_by("-month")[:12]
+        days = int(request.query_params.get("days", 7))
+        if days not in (7, 14, 30):
+            days = 7
+        data = services.get_dashboard_bundle(request.user, trend_days=days)
+        return Response(data)
+
+
+class MonthlyMetricsView(UserDataConditionalMixin, generics.GenericAPIView):
+    """Monthly metrics as last computed by the background worker."""
+
+    permission_classes = [IsAuthenticated, IsEmailVerified, IsOnboarded]
+    throttle_classes = [ReadRateThrottle]
+    swagger_schema = None
+
+    def get(self, request):
+        metrics = list(
+            MonthlyMetrics.objects.filter(user=request.user).order_by("-month")[:12]
+        )
         data = [
             {
                 "month": str(m.month),
@@ -97,4 +199,10 @@ class MonthlyMetricsView(generics.GenericAPIView):
             }
             for m in metrics
         ]
-        return Response(data)
+        computed_at = max((m.updated_at for m in metrics), default=None)
+        response = Response(data)
+        response.envelope_meta = {
+            "computed_at": computed_at.isoformat() if computed_at else None,
+            "refresh_pending": DirtyMonth.objects.filter(user=request.user).exists(),
+        }
+        return response
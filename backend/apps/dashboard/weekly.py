@@ -0,0 +1,170 @@
+"""Maintenance of the ``WeeklyMetrics`` rollup.
+
+A DailyLog write only touches its own ISO week, so the week is re-rolled
+from its (at most seven) rows and upserted. ``backfill_weekly_metrics``
+streams existing history through the same rollup in one ordered pass.
+"""
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.logs.models import DailyLog
+
+from .models import WeeklyMetrics
+from .services import compute_consistency_score
+
+WEEK_FIELDS = (
+    "date",
+    "weight",
+    "calories",
+    "protein",
+    "workout",
+    "workout_type",
+    "protein_hit",
+)
+
+WEEKLY_METRIC_FIELDS = [
+    "days_logged",
+    "avg_calories",
+    "avg_protein",
+    "workouts_done",
+    "protein_hit_days",
+    "workout_types",
+    "first_weight",
+    "last_weight",
+    "weight_change",
+    "consistency_score",
+]
+
+
+def week_start_for(day):
+    """Monday of the ISO week containing ``day``."""
+    return day - timedelta(days=day.weekday())
+
+
+def rollup_week(rows):
+    """Aggregate one week of DailyLog rows (dicts ordered by date)."""
+    days_logged = len(rows)
+    workouts_done = sum(1 for row in rows if row["workout"])
+    protein_hit_days = sum(1 for row in rows if row["protein_hit"])
+    first_weight = rows[0]["weight"]
+    last_weight = rows[-1]["weight"]
+    return {
+        "days_logged": days_logged,
+        "avg_calories": round(sum(row["calories"] for row in rows) / days_logged),
+        "avg_protein": round(sum(row["protein"] for row in rows) / days_logged),
+        "workouts_done": workouts_done,
+        "protein_hit_days": protein_hit_days,
+        "workout_types": sorted(
+            {
+                row["workout_type"]
+                for row in rows
+                if row["workout"] and row["workout_type"]
+            }
+        ),
+        "first_weight": first_weight,
+        "last_weight": last_weight,
+        "weight_change": last_weight - first_weight if days_logged >= 2 else None,
+        "consistency_score": min(
+            compute_consistency_score(days_logged, 7, protein_hit_days, workouts_done),
+            100,
+        ),
+    }
+
+
+def _upsert(objs):
+    WeeklyMetrics.objects.bulk_create(
+        objs,
+        update_conflicts=True,
+        unique_fields=["user", "week_start"],
+        update_fields=WEEKLY_METRIC_FIELDS + ["updated_at"],
+    )
+
+
+def refresh_weeks(user_id, dates):
+    """Re-roll the ISO weeks containing ``dates`` for one user."""
+    week_starts = {week_start_for(day) for day in dates}
+    rows_by_week = {week_start: [] for week_start in week_starts}
+    rows = (
+        DailyLog.objects.filter(
+            user_id=user_id,
+            date__gte=min(week_starts),
+            date__lte=max(week_starts) + timedelta(days=6),
+        )
+        .order_by("date")
+        .values(*WEEK_FIELDS)
+    )
+    for row in rows:
+        week_start = week_start_for(row["date"])
+        if week_start in rows_by_week:
+            rows_by_week[week_start].append(row)
+
+    empty = [
+        week_start for week_start, week_rows in rows_by_week.items() if not week_rows
+    ]
+    # Joins the triggering write's transaction instead of adding a savepoint.
+    with transaction.atomic(savepoint=False):
+        if empty:
+            WeeklyMetrics.objects.filter(user_id=user_id, week_start__in=empty).delete()
+        objs = [
+            WeeklyMetrics(
+                user_id=user_id, week_start=week_start, **rollup_week(week_rows)
+            )
+            for week_start, week_rows in rows_by_week.items()
+            if week_rows
+        ]
+        if objs:
+            _upsert(objs)
+
+
+def backfill_weekly_metrics(user_ids=None, chunk_size=1000):
+    """Rebuild WeeklyMetrics from all history in a single ordered scan.
+
+    Rows for the same users that the scan did not rewrite belong to weeks
+    with no logs left and are deleted in the same transaction. Returns the
+    number of weekly rows written.
+    """
+    logs = DailyLog.objects.all()
+    stale = WeeklyMetrics.objects.all()
+    if user_ids is not None:
+        logs = logs.filter(user_id__in=user_ids)
+        stale = stale.filter(user_id__in=user_ids)
+    rows = logs.order_by("user_id", "date").values("user_id", *WEEK_FIELDS)
+
+    written = 0
+    batch = []
+    current_key = None
+    week_rows = []
+
+    def close_week():
+        nonlocal written
+        if week_rows:
+            user_id, week_start = current_key
+            batch.append(
+                WeeklyMetrics(
+                    user_id=user_id, week_start=week_start, **rollup_week(week_rows)
+                )
+            )
+        if len(batch) >= chunk_size:
+            _upsert(batch)
+            written += len(batch)
+            batch.clear()
+
+    with transaction.atomic():
+        # Every upsert below stamps updated_at at or after this point.
+        started = timezone.now()
+        for row in rows.iterator(chunk_size=chunk_size):
+            key = (row["user_id"], week_start_for(row["date"]))
+            if key != current_key:
+                close_week()
+                current_key = key
+                week_rows = []
+            week_rows.append(row)
+        close_week()
+        if batch:
+            _upsert(batch)
+            written += len(batch)
+        stale.filter(updated_at__lt=started).delete()
+    return written
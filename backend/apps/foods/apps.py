@@ -5,3 +5,6 @@ class FoodsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.foods"
     verbose_name = "Foods"
+
+    def ready(self):
+        from . import signals  # noqa: F401
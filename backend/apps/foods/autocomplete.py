@@ -0,0 +1,95 @@
+"""Prefix index behind the ``/foods/autocomplete/`` typeahead.
+
+Names are normalized (lowercased, accents stripped, punctuation collapsed
+to single spaces) and stored in two sorted arrays: the whole name, and
+each tail of the name starting at a later word ("chicken breast" is also
+filed under "breast"). A lookup is a ``bisect`` into each array followed
+by a scan of at most a few entries past ``limit``, so it costs
+O(log n + limit) however large the catalog is.
+
+Whole-name matches rank before word matches; within each tier the sorted
+order keeps shorter, alphabetically earlier names first. The system-food
+index is built once per catalog snapshot; a user's custom foods get a
+small index of their own that is merged in per request.
+"""
+
+import unicodedata
+from bisect import bisect_left
+
+from django.conf import settings
+
+from .catalog import custom_foods, get_catalog
+
+_HEAD, _TAIL = 0, 1
+
+
+def normalize(text):
+    """Lowercase, strip accents and reduce everything else to single spaces."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    chars = [
+        ch if ch.isalnum() else " " for ch in text if not unicodedata.combining(ch)
+    ]
+    return " ".join("".join(chars).split())
+
+
+class PrefixIndex:
+    """Sorted-array prefix index over food names."""
+
+    def __init__(self, foods):
+        heads = []
+        tails = []
+        for food in foods:
+            key = normalize(food.name)
+            if not key:
+                continue
+            row = (
+                str(food.id),
+                food.name,
+                food.calories_per_100g,
+                float(food.protein_per_100g),
+            )
+            heads.append((key, row))
+            space = key.find(" ")
+            while space != -1:
+                start = space + 1
+                tails.append((key[start:], row))
+                space = key.find(" ", start)
+        heads.sort(key=lambda entry: entry[0])
+        tails.sort(key=lambda entry: entry[0])
+        self._keys = ([key for key, _ in heads], [key for key, _ in tails])
+        self._rows = ([row for _, row in heads], [row for _, row in tails])
+
+    def __len__(self):
+        return len(self._keys[_HEAD])
+
+    def matches(self, prefix, limit):
+        """Up to ``limit`` ``(tier, key, row)`` per tier for names matching ``prefix``."""
+        found = []
+        seen = set()
+        for tier in (_HEAD, _TAIL):
+            keys = self._keys[tier]
+            rows = self._rows[tier]
+            taken = 0
+            i = bisect_left(keys, prefix)
+            while i < len(keys) and taken < limit and keys[i].startswith(prefix):
+                row = rows[i]
+                if row[0] not in seen:
+                    seen.add(row[0])
+                    found.append((tier, keys[i], row))
+                    taken += 1
+                i += 1
+        return found
+
+
+def autocomplete(user, query, limit=None):
+    """Top ``limit`` ``(id, name, kcal, protein)`` rows visible to ``user``."""
+    limit = limit or settings.FOOD_AUTOCOMPLETE_RESULTS
+    prefix = normalize(query)
+    if not prefix:
+        return []
+    found = get_catalog().prefix_index().matches(prefix, limit)
+    custom = custom_foods(user.pk)
+    if custom:
+        found += PrefixIndex(custom).matches(prefix, limit)
+    found.sort(key=lambda match: (match[0], match[1]))
+    return [row for _, _, row in found[:limit]]
@@ -0,0 +1,259 @@
+"""Process-wide snapshot of the system food catalog with a per-user overlay.
+
+System foods (``is_custom=False``) only change when ``seed_foods`` or an
+admin edits them, so each process keeps an immutable snapshot of them as
+``__slots__`` records, loaded lazily. Every system-food write bumps the
+``FoodCatalogVersion`` row; a process re-reads that row at most every
+``FOOD_CATALOG_RECHECK_SECONDS`` and reloads the snapshot when it moved.
+Writes made by this process drop its snapshot straight away.
+
+A user's custom foods are kept in the ``FOOD_CATALOG_CACHE_ALIAS`` cache,
+deleted on every write to one of them, and merged in by the helpers here,
+so listing, detail lookups, search and meal-entry saves resolve foods
+without a query in the common case.
+"""
+
+import heapq
+import threading
+import time
+from itertools import islice
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import F, Q
+
+from .models import Food, FoodCatalogVersion
+
+_FIELDS = tuple(field.attname for field in Food._meta.concrete_fields)
+
+
+class CatalogFood:
+    """Read-only record of one food, with the same attributes as ``Food``."""
+
+    __slots__ = _FIELDS
+
+    def __init__(self, values):
+        for name, value in zip(_FIELDS, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CatalogFood records are read-only")
+
+    @property
+    def pk(self):
+        return self.id
+
+    def as_model(self):
+        """A ``Food`` instance as if loaded from the database, e.g. for a FK."""
+        return Food.from_db(
+            DEFAULT_DB_ALIAS, _FIELDS, [getattr(self, name) for name in _FIELDS]
+        )
+
+
+def food_order(food):
+    """Sort key for listings; applied in Python so it never depends on DB collation."""
+    return (food.name, str(food.id))
+
+
+def _matches(food, diet_type, category):
+    return (not diet_type or food.diet_type == diet_type) and (
+        not category or food.category == category
+    )
+
+
+class CatalogSnapshot:
+    """The system foods at one catalog version."""
+
+    def __init__(self, version, rows):
+        self.version = version
+        self.checked_at = time.monotonic()
+        self.foods = sorted((CatalogFood(row) for row in rows), key=food_order)
+        self.by_id = {food.id: food for food in self.foods}
+        self._filtered = {}
+        self._ngram_index = None
+        self._prefix_index = None
+
+    def filtered(self, diet_type=None, category=None):
+        """The foods matching the list filters, in order; kept per filter pair."""
+        key = (diet_type or None, category or None)
+        foods = self._filtered.get(key)
+        if foods is None:
+            if key == (None, None):
+                foods = self.foods
+            else:
+                foods = [food for food in self.foods if _matches(food, *key)]
+            self._filtered[key] = foods
+        return foods
+
+    def ngram_index(self):
+        """Trigram index over the snapshot, built on first use (see ``search.py``)."""
+        if self._ngram_index is None:
+            from .search import NgramIndex
+
+            self._ngram_index = NgramIndex((food.id, food.name) for food in self.foods)
+        return self._ngram_index
+
+    def prefix_index(self):
+        """Typeahead index over the snapshot, built on first use (see ``autocomplete.py``)."""
+        if self._prefix_index is None:
+            from .autocomplete import PrefixIndex
+
+            self._prefix_index = PrefixIndex(self.foods)
+        return self._prefix_index
+
+
+_lock = threading.Lock()
+_snapshot = None
+
+
+def current_version():
+    return (
+        FoodCatalogVersion.objects.filter(pk=1)
+        .values_list("version", flat=True)
+        .first()
+        or 0
+    )
+
+
+def get_catalog():
+    """Return this process's snapshot, reloading it if the catalog version moved."""
+    global _snapshot
+    snapshot = _snapshot
+    if (
+        snapshot is not None
+        and time.monotonic() - snapshot.checked_at
+        < settings.FOOD_CATALOG_RECHECK_SECONDS
+    ):
+        return snapshot
+    with _lock:
+        snapshot = _snapshot
+        version = current_version()
+        if snapshot is not None and snapshot.version == version:
+            snapshot.checked_at = time.monotonic()
+            return snapshot
+        rows = Food.objects.filter(is_custom=False).values_list(*_FIELDS)
+        _snapshot = CatalogSnapshot(version, rows)
+        return _snapshot
+
+
+def bump_catalog_version():
+    """Record a system-food change so every process reloads its snapshot."""
+    global _snapshot
+    updated = FoodCatalogVersion.objects.filter(pk=1).update(version=F("version") + 1)
+    if not updated:
+        FoodCatalogVersion.objects.get_or_create(pk=1, defaults={"version": 1})
+    with _lock:
+        _snapshot = None
+
+
+def reset_catalog():
+    """Drop this process's snapshot; the next lookup reloads it."""
+    global _snapshot
+    with _lock:
+        _snapshot = None
+
+
+def _cache():
+    return caches[settings.FOOD_CATALOG_CACHE_ALIAS]
+
+
+def _custom_key(user_id):
+    return f"foods:custom:{user_id}"
+
+
+def custom_foods(user_id):
+    """The user's custom foods, from the cache when possible."""
+    key = _custom_key(user_id)
+    rows = _cache().get(key)
+    if rows is None:
+        rows = list(
+            Food.objects.filter(is_custom=True, created_by_id=user_id).values_list(
+                *_FIELDS
+            )
+        )
+        _cache().set(key, rows, timeout=settings.FOOD_CATALOG_CACHE_TIMEOUT)
+    return sorted((CatalogFood(row) for row in rows), key=food_order)
+
+
+def invalidate_custom_foods(user_id):
+    _cache().delete(_custom_key(user_id))
+
+
+class VisibleFoods:
+    """Two sorted food lists read as one, merged only as far as a slice needs.
+
+    ``len()`` is a sum and ``foods[a:b]`` walks the merge up to ``b``, so a
+    paginated list request never materializes the whole catalog.
+    """
+
+    def __init__(self, system, custom):
+        self.system = system
+        self.custom = custom
+
+    def __len__(self):
+        return len(self.system) + len(self.custom)
+
+    def __iter__(self):
+        return heapq.merge(self.system, self.custom, key=food_order)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            return list(islice(iter(self), start, stop, step))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("food index out of range")
+        return next(islice(iter(self), index, None))
+
+
+def visible_foods(user, diet_type=None, category=None):
+    """System foods plus the user's custom foods, by name, optionally filtered."""
+    custom = [
+        food for food in custom_foods(user.pk) if _matches(food, diet_type, category)
+    ]
+    return VisibleFoods(get_catalog().filtered(diet_type, category), custom)
+
+
+def catalog_food(food_id):
+    """The system food with this id from the snapshot, or None."""
+    return get_catalog().by_id.get(food_id)
+
+
+def resolve_food(user, food_id):
+    """The food with this id if ``user`` may see it, else None."""
+    food = catalog_food(food_id)
+    if food is not None:
+        return food
+    for food in custom_foods(user.pk):
+        if food.id == food_id:
+            return food
+    # Created after this process's snapshot or cache entry was taken.
+    row = (
+        Food.objects.filter(Q(is_custom=False) | Q(created_by=user), pk=food_id)
+        .values_list(*_FIELDS)
+        .first()
+    )
+    return CatalogFood(row) if row else None
+
+
+def resolve_foods(user, food_ids):
+    """``{id: Food}`` for the ids ``user`` may see; misses cost one ``in_bulk``."""
+    catalog = get_catalog()
+    custom = {food.id: food for food in custom_foods(user.pk)}
+    foods = {}
+    missing = []
+    for food_id in set(food_ids):
+        food = catalog.by_id.get(food_id) or custom.get(food_id)
+        if food is None:
+            missing.append(food_id)
+        else:
+            foods[food_id] = food.as_model()
+    if missing:
+        foods.update(
+            Food.objects.filter(Q(is_custom=False) | Q(created_by=user)).in_bulk(
+                missing
+            )
+        )
+    return foods
@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from apps.foods.services import (
+    TOTAL_FIELDS,
+    find_total_drift,
+    recompute_daily_log_totals,
+)
+from apps.logs.models import DailyLog
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare each DailyLog's meal totals, which meal writes maintain by "
+        "deltas, with a full re-aggregation of its entries; report drifted logs "
+        "and optionally repair them"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=8,
+            help="Only check logs dated within this many days (0 checks all history)",
+        )
+        parser.add_argument(
+            "--email",
+            help="Only check the logs of the user with this email",
+        )
+        parser.add_argument(
+            "--repair",
+            action="store_true",
+            help="Recompute the totals of drifted logs from their entries",
+        )
+
+    def handle(self, *args, **options):
+        logs = DailyLog.objects.select_related("user")
+        if options["days"]:
+            logs = logs.filter(
+                date__gte=timezone.now().date() - timedelta(days=options["days"])
+            )
+        if options["email"]:
+            logs = logs.filter(user__email=options["email"])
+
+        drifted = 0
+        for log in find_total_drift(logs).order_by("date").iterator():
+            drifted += 1
+            differences = ", ".join(
+                f"{field} {getattr(log, f'food_{field}')} != {getattr(log, f'entry_{field}')}"
+                for field in TOTAL_FIELDS
+                if getattr(log, f"food_{field}") != getattr(log, f"entry_{field}")
+            )
+            self.stdout.write(f"{log.user.email} {log.date}: {differences}")
+            if options["repair"]:
+                with transaction.atomic():
+                    recompute_daily_log_totals(log)
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS("No drifted daily totals."))
+        elif options["repair"]:
+            self.stdout.write(self.style.SUCCESS(f"Repaired {drifted} drifted log(s)."))
+        else:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Found {drifted} drifted log(s); rerun with --repair."
+                )
+            )
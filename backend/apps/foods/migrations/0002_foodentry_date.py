@@ -0,0 +1,29 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_entry_dates(apps, schema_editor):
+    FoodEntry = apps.get_model("foods", "FoodEntry")
+    DailyLog = apps.get_model("logs", "DailyLog")
+    FoodEntry.objects.update(
+        date=Subquery(
+            DailyLog.objects.filter(pk=OuterRef("daily_log_id")).values("date")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("foods", "0001_initial"),
+        ("logs", "0006_custommetricstats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="foodentry",
+            name="date",
+            field=models.DateField(null=True),
+        ),
+        migrations.RunPython(backfill_entry_dates, migrations.RunPython.noop),
+    ]
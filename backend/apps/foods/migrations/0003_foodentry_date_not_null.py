@@ -0,0 +1,27 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("foods", "0002_foodentry_date"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="foodentry",
+            name="date",
+            field=models.DateField(),
+        ),
+        migrations.AlterField(
+            model_name="foodentry",
+            name="daily_log",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="food_entries",
+                to="logs.dailylog",
+            ),
+        ),
+    ]
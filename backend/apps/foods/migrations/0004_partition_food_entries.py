@@ -0,0 +1,23 @@
+from django.db import migrations
+
+from apps.core.partitions import partition_table, unpartition_table
+
+
+def partition(apps, schema_editor):
+    partition_table(schema_editor, "food_entries", "date")
+
+
+def unpartition(apps, schema_editor):
+    unpartition_table(schema_editor, "food_entries", "date")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("foods", "0003_foodentry_date_not_null"),
+        ("logs", "0007_partition_daily_logs"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, unpartition),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # UPPER(name) so Django's icontains (UPPER(name) LIKE UPPER(%s)) can use it too.
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_foods_name_trgm "
+        "ON foods USING gin (UPPER(name) gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS idx_foods_name_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("foods", "0004_partition_food_entries"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:52
+
+from django.db import migrations, models
+
+
+def create_version_row(apps, schema_editor):
+    FoodCatalogVersion = apps.get_model("foods", "FoodCatalogVersion")
+    FoodCatalogVersion.objects.get_or_create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("foods", "0005_food_name_trgm"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FoodCatalogVersion",
+            fields=[
+                (
+                    "id",
+                    models.PositiveSmallIntegerField(
+                        default=1, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                ("version", models.BigIntegerField(default=1)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "food_catalog_version",
+            },
+        ),
+        migrations.RunPython(create_version_row, migrations.RunPython.noop),
+    ]
@@ -71,11 +71,16 @@ class FoodEntry(models.Model):
         DINNER = "dinner", "Dinner"
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # No database constraint: daily_logs is partitioned on PostgreSQL and its
+    # primary key is (id, date). Deletes still cascade through the ORM.
     daily_log = models.ForeignKey(
         "logs.DailyLog",
         on_delete=models.CASCADE,
         related_name="food_entries",
+        db_constraint=False,
     )
+    # Denormalized from daily_log.date; the partition key of food_entries.
+    date = models.DateField()
     food = models.ForeignKey(
         Food,
         on_delete=models.PROTECT,
@@ -107,13 +112,39 @@ class FoodEntry(models.Model):
         return f"{self.food.name} ({self.meal_type}) - {self.quantity_grams}g"
 
     def compute_nutrients(self):
+        from .catalog import catalog_food
+
+        food = None
+        if not FoodEntry.food.is_cached(self):
+            food = catalog_food(self.food_id)
+        food = food or self.food
         ratio = float(self.quantity_grams) / 100.0
-        self.calories = round(self.food.calories_per_100g * ratio)
-        self.protein = round(float(self.food.protein_per_100g) * ratio, 1)
-        self.carbs = round(float(self.food.carbs_per_100g) * ratio, 1)
-        self.fats = round(float(self.food.fats_per_100g) * ratio, 1)
-        self.fibre = round(float(self.food.fibre_per_100g) * ratio, 1)
+        self.calories = round(food.calories_per_100g * ratio)
+        self.protein = round(float(food.protein_per_100g) * ratio, 1)
+        self.carbs = round(float(food.carbs_per_100g) * ratio, 1)
+        self.fats = round(float(food.fats_per_100g) * ratio, 1)
+        self.fibre = round(float(food.fibre_per_100g) * ratio, 1)
 
     def save(self, *args, **kwargs):
+        if self.date is None and self.daily_log_id:
+            self.date = self.daily_log.date
         self.compute_nutrients()
         super().save(*args, **kwargs)
+
+
+class FoodCatalogVersion(models.Model):
+    """Single row whose version is bumped whenever a system food changes.
+
+    Processes compare it with the version of their in-memory catalog
+    snapshot (see ``catalog.py``) to know when to reload.
+    """
+
+    id = models.PositiveSmallIntegerField(primary_key=True, default=1, editable=False)
+    version = models.BigIntegerField(default=1)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "food_catalog_version"
+
+    def __str__(self):
+        return f"catalog v{self.version}"
@@ -0,0 +1,175 @@
+"""Ranked, typo-tolerant food search.
+
+Candidates are foods whose name contains the query or is trigram-similar
+to it (``word_similarity`` >= ``FOOD_SEARCH_SIMILARITY``, so "panner"
+still finds "Paneer Tikka"). On PostgreSQL both conditions are served by
+the ``pg_trgm`` GIN index ``idx_foods_name_trgm`` on ``UPPER(name)``;
+elsewhere an in-process trigram index over the catalog snapshot stands in.
+
+The best candidates by similarity are then re-ranked with a bonus for
+prefix matches and for foods the user logged recently.
+"""
+
+import re
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connection, transaction
+from django.db.models import Count, Q, Value
+from django.db.models.functions import Upper
+from django.utils import timezone
+
+from .catalog import custom_foods, get_catalog, resolve_food
+from .models import Food, FoodEntry
+
+USAGE_DAYS = 90
+PREFIX_BONUS = 0.5
+WORD_PREFIX_BONUS = 0.25
+USAGE_BONUS = 0.02
+MAX_USAGE_BONUS = 0.4
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def trigrams(text):
+    """pg_trgm-style trigrams: lowercased words padded with two leading blanks."""
+    grams = set()
+    for word in _WORD.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(map("".join, zip(padded, padded[1:], padded[2:])))
+    return grams
+
+
+def rank_score(query, name, similarity, uses=0):
+    """Similarity plus bonuses for prefix matches and the user's own usage."""
+    query = query.lower()
+    name = name.lower()
+    score = similarity
+    if name.startswith(query):
+        score += PREFIX_BONUS
+    elif any(word.startswith(query) for word in _WORD.findall(name)):
+        score += WORD_PREFIX_BONUS
+    return score + min(uses * USAGE_BONUS, MAX_USAGE_BONUS)
+
+
+class NgramIndex:
+    """Inverted trigram index over food names, for backends without pg_trgm."""
+
+    def __init__(self, rows):
+        # rows: (id, name)
+        self.names = {}
+        self.postings = {}
+        for food_id, name in rows:
+            self.names[food_id] = name.lower()
+            for gram in trigrams(name):
+                self.postings.setdefault(gram, []).append(food_id)
+
+    def candidates(self, query, threshold):
+        """``[(food_id, similarity)]`` for names containing or resembling ``query``."""
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(self.postings.get(gram, ()))
+        needle = query.lower()
+        # A substring of three or more characters shares at least one trigram.
+        pool = shared if len(needle) >= 3 else self.names
+        matches = []
+        for food_id in pool:
+            similarity = shared.get(food_id, 0) / len(query_grams)
+            if similarity >= threshold or needle in self.names[food_id]:
+                matches.append((food_id, similarity))
+        return matches
+
+
+def recent_usage(user):
+    """``{food_id: entries}`` for the user's last ``USAGE_DAYS`` days of meals."""
+    since = timezone.now().date() - timedelta(days=USAGE_DAYS)
+    return dict(
+        FoodEntry.objects.filter(daily_log__user=user, date__gte=since)
+        .order_by()
+        .values("food_id")
+        .annotate(uses=Count("id"))
+        .values_list("food_id", "uses")
+    )
+
+
+def _trigram_candidates(user, query, filters, limit):
+    needle = Upper(Value(query))
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SET LOCAL pg_trgm.word_similarity_threshold = %s",
+                [settings.FOOD_SEARCH_SIMILARITY],
+            )
+        rows = list(
+            Food.objects.filter(Q(is_custom=False) | Q(created_by=user), **filters)
+            .filter(
+                Q(name__icontains=query) | Q(TrigramWordSimilar(Upper("name"), needle))
+            )
+            .annotate(similarity=TrigramWordSimilarity(needle, Upper("name")))
+            .order_by("-similarity", "name")
+            .values_list("id", "similarity")[:limit]
+        )
+    candidates = []
+    for food_id, similarity in rows:
+        food = resolve_food(user, food_id)
+        if food is not None:
+            candidates.append((food, similarity))
+    return candidates
+
+
+def _ngram_candidates(user, query, filters, limit):
+    threshold = settings.FOOD_SEARCH_SIMILARITY
+    catalog = get_catalog()
+    custom = custom_foods(user.pk)
+    matches = [
+        (catalog.by_id[food_id], similarity)
+        for food_id, similarity in catalog.ngram_index().candidates(query, threshold)
+    ]
+    if custom:
+        by_id = {food.id: food for food in custom}
+        index = NgramIndex((food.id, food.name) for food in custom)
+        matches += [
+            (by_id[food_id], similarity)
+            for food_id, similarity in index.candidates(query, threshold)
+        ]
+    matches = [
+        (food, similarity)
+        for food, similarity in matches
+        if all(getattr(food, field) == value for field, value in filters.items())
+    ]
+    matches.sort(key=lambda match: (-match[1], match[0].name))
+    return matches[:limit]
+
+
+def search_foods(user, query, diet_type=None, category=None, limit=None):
+    """Foods visible to ``user`` matching ``query``, best first.
+
+    At most ``limit`` (``FOOD_SEARCH_RESULTS``) foods are returned, resolved
+    from the catalog snapshot and the user's custom foods (``catalog.py``).
+    """
+    limit = limit or settings.FOOD_SEARCH_RESULTS
+    filters = {
+        field: value
+        for field, value in (("diet_type", diet_type), ("category", category))
+        if value
+    }
+    # Re-rank a wider pool so usage can lift a slightly weaker match.
+    pool = limit * 2
+    if connection.vendor == "postgresql":
+        candidates = _trigram_candidates(user, query, filters, pool)
+    else:
+        candidates = _ngram_candidates(user, query, filters, pool)
+    usage = recent_usage(user) if candidates else {}
+    candidates.sort(
+        key=lambda match: (
+            -rank_score(query, match[0].name, match[1], usage.get(match[0].id, 0)),
+            match[0].name,
+        )
+    )
+    return [food for food, _ in candidates[:limit]]
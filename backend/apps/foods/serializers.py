@@ -1,5 +1,8 @@
+import uuid
+
 from rest_framework import serializers
 
+from .catalog import catalog_food, resolve_food, resolve_foods
 from .models import Food, FoodEntry
 
 
@@ -27,8 +30,23 @@ class FoodSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class CatalogFoodField(serializers.PrimaryKeyRelatedField):
+    """Food by id, resolved through the catalog; only foods the user may see."""
+
+    def to_internal_value(self, data):
+        try:
+            food_id = uuid.UUID(str(data))
+        except ValueError:
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        food = resolve_food(self.context["request"].user, food_id)
+        if food is None:
+            self.fail("does_not_exist", pk_value=data)
+        return food.as_model()
+
+
 class FoodEntrySerializer(serializers.ModelSerializer):
-    food_name = serializers.CharField(source="food.name", read_only=True)
+    food = CatalogFoodField(queryset=Food.objects.all())
+    food_name = serializers.SerializerMethodField()
 
     class Meta:
         model = FoodEntry
@@ -49,3 +67,102 @@ class FoodEntrySerializer(serializers.ModelSerializer):
             "id", "food_name", "calories", "protein",
             "carbs", "fats", "fibre", "created_at",
         ]
+
+    def get_food_name(self, obj):
+        food = catalog_food(obj.food_id)
+        return food.name if food is not None else obj.food.name
+
+
+class MealBatchCreateSerializer(serializers.ModelSerializer):
+    food = serializers.UUIDField()
+
+    class Meta:
+        model = FoodEntry
+        fields = ["food", "meal_type", "quantity_grams"]
+
+
+class MealBatchUpdateSerializer(serializers.ModelSerializer):
+    id = serializers.UUIDField()
+    food = serializers.UUIDField(required=False)
+
+    class Meta:
+        model = FoodEntry
+        fields = ["id", "food", "meal_type", "quantity_grams"]
+        extra_kwargs = {
+            "meal_type": {"required": False},
+            "quantity_grams": {"required": False},
+        }
+
+
+class MealBatchSerializer(serializers.Serializer):
+    """Meal entry writes for one day, applied together.
+
+    Validation resolves every food and existing entry up front (see
+    ``validate``), so ``validated_data`` holds ready ``FoodEntry`` objects
+    under ``create``, ``update`` and ``delete``.
+    """
+
+    MAX_OPERATIONS = 100
+
+    create = MealBatchCreateSerializer(many=True, required=False)
+    update = MealBatchUpdateSerializer(many=True, required=False)
+    delete = serializers.ListField(child=serializers.UUIDField(), required=False)
+
+    def validate(self, attrs):
+        create = attrs.get("create", [])
+        update = attrs.get("update", [])
+        delete = attrs.get("delete", [])
+        if not create and not update and not delete:
+            raise serializers.ValidationError("Nothing to do.")
+        if len(create) + len(update) + len(delete) > self.MAX_OPERATIONS:
+            raise serializers.ValidationError(
+                f"At most {self.MAX_OPERATIONS} operations per batch."
+            )
+        entry_ids = [item["id"] for item in update] + delete
+        if len(set(entry_ids)) != len(entry_ids):
+            raise serializers.ValidationError("Each entry may appear only once.")
+
+        entries = (
+            FoodEntry.objects.filter(daily_log=self.context["daily_log"]).in_bulk(entry_ids)
+            if entry_ids
+            else {}
+        )
+        unknown_entries = sorted(str(pk) for pk in entry_ids if pk not in entries)
+        if unknown_entries:
+            raise serializers.ValidationError(
+                {"id": [f"No meal entry {pk} on this day." for pk in unknown_entries]}
+            )
+
+        # Updates keeping their food still need it to recompute nutrients.
+        for item in update:
+            item.setdefault("food", entries[item["id"]].food_id)
+        foods = resolve_foods(
+            self.context["request"].user, [item["food"] for item in (*create, *update)]
+        )
+        unknown_foods = sorted(
+            {str(item["food"]) for item in (*create, *update) if item["food"] not in foods}
+        )
+        if unknown_foods:
+            raise serializers.ValidationError(
+                {"food": [f"Invalid food: {pk}" for pk in unknown_foods]}
+            )
+
+        updated = []
+        for item in update:
+            entry = entries[item.pop("id")]
+            entry.food = foods[item.pop("food")]
+            for field, value in item.items():
+                setattr(entry, field, value)
+            updated.append(entry)
+        return {
+            "create": [
+                FoodEntry(
+                    food=foods[item["food"]],
+                    meal_type=item["meal_type"],
+                    quantity_grams=item["quantity_grams"],
+                )
+                for item in create
+            ],
+            "update": updated,
+            "delete": [entries[pk] for pk in delete],
+        }
@@ -1,23 +1,63 @@
-from django.db.models import Sum
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db.models import Case, F, IntegerField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Abs, Cast, Coalesce, Round
+from django.db.models.lookups import GreaterThanOrEqual, IsNull, LessThanOrEqual
+from django.db.models.signals import post_save
+from django.utils import timezone
 
 from apps.logs.services import compute_daily_evaluations
 
+# Nutrients summed from a day's meal entries into its DailyLog. Each has an
+# exact running sum ``food_<name>`` and a rounded display column ``<name>``.
+TOTAL_FIELDS = ("calories", "protein", "carbs", "fats", "fibre")
+_UPDATED_FIELDS = (
+    *(f"food_{field}" for field in TOTAL_FIELDS),
+    *TOTAL_FIELDS,
+    "protein_hit",
+    "calories_ok",
+    "updated_at",
+)
+
+
+def round_total(value):
+    """Round a summed nutrient the way the database's ROUND does (half up)."""
+    return int(Decimal(value).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def entry_nutrients(entry):
+    """An entry's nutrients as ``int`` calories and ``Decimal`` grams.
+
+    Freshly computed entries hold floats; grams go through ``str`` so they
+    match the stored one-decimal values exactly.
+    """
+    return {
+        field: int(entry.calories) if field == "calories" else Decimal(str(getattr(entry, field)))
+        for field in TOTAL_FIELDS
+    }
+
+
+def nutrient_delta(old=None, new=None):
+    """``new - old`` per nutrient; either side may be None (create / delete)."""
+    return {
+        field: (new[field] if new else 0) - (old[field] if old else 0)
+        for field in TOTAL_FIELDS
+    }
+
 
 def recompute_daily_log_totals(daily_log):
-    """Recompute DailyLog macro totals from all FoodEntry records."""
+    """Recompute DailyLog macro totals from all FoodEntry records.
+
+    The repair path: meal writes maintain the totals with
+    ``apply_totals_delta``; this re-aggregates every entry of the day and is
+    what ``verify_daily_totals --repair`` uses on drifted logs.
+    """
     totals = daily_log.food_entries.aggregate(
-        total_calories=Sum("calories"),
-        total_protein=Sum("protein"),
-        total_carbs=Sum("carbs"),
-        total_fats=Sum("fats"),
-        total_fibre=Sum("fibre"),
+        **{field: Sum(field) for field in TOTAL_FIELDS}
     )
-
-    daily_log.calories = totals["total_calories"] or 0
-    daily_log.protein = round(totals["total_protein"] or 0)
-    daily_log.carbs = round(totals["total_carbs"] or 0)
-    daily_log.fats = round(totals["total_fats"] or 0)
-    daily_log.fibre = round(totals["total_fibre"] or 0)
+    for field in TOTAL_FIELDS:
+        setattr(daily_log, f"food_{field}", totals[field] or 0)
+        setattr(daily_log, field, round_total(totals[field] or 0))
 
     # Recompute evaluations
     try:
@@ -31,9 +71,125 @@ def recompute_daily_log_totals(daily_log):
     except Exception:
         pass
 
-    daily_log.save(
-        update_fields=[
-            "calories", "protein", "carbs", "fats", "fibre",
-            "protein_hit", "calories_ok", "updated_at",
-        ]
+    daily_log.save(update_fields=list(_UPDATED_FIELDS))
+
+
+def apply_totals_delta(daily_log, delta):
+    """Add a meal-entry nutrient ``delta`` to ``daily_log``'s totals in one UPDATE.
+
+    The exact ``food_*`` sums move by the delta with ``F()`` expressions, so
+    concurrent meal writes cannot lose each other's changes, and the rounded
+    columns and ``protein_hit``/``calories_ok`` are derived from the new sums
+    in the same statement, reading the user's targets through a subquery
+    (same rules as ``compute_daily_evaluations``; flags are left alone when
+    the user has no targets). The instance is then refreshed and
+    ``post_save`` sent as ``save(update_fields=...)`` would.
+    """
+    from apps.logs.models import DailyLog
+    from apps.users.models import UserTarget
+
+    sums = {
+        field: F(f"food_{field}") + Value(delta.get(field, 0))
+        for field in TOTAL_FIELDS
+    }
+    rounded = {
+        field: Cast(Round(sums[field]), IntegerField()) if field != "calories" else sums[field]
+        for field in TOTAL_FIELDS
+    }
+    targets = UserTarget.objects.filter(user_id=OuterRef("user_id"))
+    protein_target = Subquery(targets.values("protein_target")[:1])
+    calorie_target = Subquery(targets.values("calorie_target")[:1])
+    DailyLog.objects.filter(pk=daily_log.pk).update(
+        **{f"food_{field}": sums[field] for field in TOTAL_FIELDS},
+        **rounded,
+        protein_hit=Case(
+            When(IsNull(protein_target, True), then=F("protein_hit")),
+            When(GreaterThanOrEqual(rounded["protein"], protein_target), then=Value(True)),
+            default=Value(False),
+        ),
+        calories_ok=Case(
+            When(IsNull(calorie_target, True), then=F("calories_ok")),
+            # |calories - target| <= 10% of target, in integers.
+            When(
+                LessThanOrEqual(Abs(rounded["calories"] - calorie_target) * 10, calorie_target),
+                then=Value(True),
+            ),
+            default=Value(False),
+        ),
+        updated_at=timezone.now(),
+    )
+    daily_log.refresh_from_db(fields=_UPDATED_FIELDS)
+    post_save.send(
+        sender=DailyLog,
+        instance=daily_log,
+        created=False,
+        update_fields=frozenset(_UPDATED_FIELDS),
+        raw=False,
+        using=DailyLog.objects.db,
+    )
+
+
+def find_total_drift(logs):
+    """The logs in ``logs`` whose ``food_*`` sums differ from their entries."""
+    from apps.logs.models import DailyLog
+
+    from .models import FoodEntry
+
+    entries = FoodEntry.objects.filter(daily_log_id=OuterRef("pk")).order_by().values("daily_log_id")
+    drifted = Q()
+    annotations = {}
+    for field in TOTAL_FIELDS:
+        annotations[f"entry_{field}"] = Coalesce(
+            Subquery(entries.annotate(total=Sum(field)).values("total")),
+            Value(0),
+            output_field=DailyLog._meta.get_field(f"food_{field}"),
+        )
+        drifted |= ~Q(**{f"food_{field}": F(f"entry_{field}")})
+    return logs.annotate(**annotations).filter(drifted)
+
+
+def apply_meal_batch(daily_log, create=(), update=(), delete=()):
+    """Create, update and delete a day's meal entries, then update totals once.
+
+    ``create`` holds unsaved ``FoodEntry`` objects, ``update`` saved entries
+    with their changes already applied and ``delete`` saved entries; every
+    ``food`` must already be set. Nutrients are computed in memory and the
+    writes are one statement each. Creates and updates skip the per-row
+    signals, so ``food_entries_bulk_changed`` is sent with every saved and
+    deleted id. Call inside a transaction.
+    """
+    from .models import FoodEntry
+    from .signals import food_entries_bulk_changed
+
+    delta = nutrient_delta()
+    for entry in update:
+        for field, amount in nutrient_delta(old=entry_nutrients(entry)).items():
+            delta[field] += amount
+    for entry in delete:
+        for field, amount in nutrient_delta(old=entry_nutrients(entry)).items():
+            delta[field] += amount
+    for entry in (*create, *update):
+        entry.compute_nutrients()
+        for field, amount in entry_nutrients(entry).items():
+            delta[field] += amount
+    if create:
+        for entry in create:
+            entry.daily_log = daily_log
+            entry.date = daily_log.date
+        FoodEntry.objects.bulk_create(create)
+    if update:
+        FoodEntry.objects.bulk_update(
+            update,
+            ["food", "meal_type", "quantity_grams", "calories", "protein", "carbs", "fats", "fibre"],
+        )
+    if delete:
+        # A regular delete, so post_delete receivers still see each entry.
+        FoodEntry.objects.filter(pk__in=[entry.pk for entry in delete]).delete()
+    apply_totals_delta(daily_log, delta)
+    food_entries_bulk_changed.send(
+        sender=FoodEntry,
+        user_id=daily_log.user_id,
+        daily_log_id=daily_log.pk,
+        saved=[entry.pk for entry in (*create, *update)],
+        deleted=[entry.pk for entry in delete],
     )
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .catalog import bump_catalog_version, invalidate_custom_foods
+from .models import Food
+
+# Sent with sender=FoodEntry after a batch of meal entry writes that bypassed
+# post_save/post_delete. Receivers get ``user_id``, ``daily_log_id``,
+# ``saved`` (ids created or updated) and ``deleted`` (ids removed).
+food_entries_bulk_changed = Signal()
+
+
+@receiver(post_save, sender=Food)
+@receiver(post_delete, sender=Food)
+def refresh_catalog(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    if instance.is_custom:
+        if instance.created_by_id:
+            invalidate_custom_foods(instance.created_by_id)
+    else:
+        bump_catalog_version()
@@ -0,0 +1,40 @@
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+
+from apps.foods.models import Food
+from apps.logs.models import DailyLog
+
+
+@pytest.fixture
+def create_food(db):
+    """Factory fixture that creates and returns a system food.
+
+    Nutrient and other fields can be overridden by keyword arguments.
+    """
+
+    def _create_food(name, **fields):
+        defaults = {
+            "category": "protein_source",
+            "diet_type": "vegetarian",
+            "calories_per_100g": 200,
+            "protein_per_100g": Decimal("10"),
+            "carbs_per_100g": Decimal("10"),
+            "fats_per_100g": Decimal("10"),
+            "fibre_per_100g": Decimal("1"),
+        }
+        defaults.update(fields)
+        return Food.objects.create(name=name, **defaults)
+
+    return _create_food
+
+
+@pytest.fixture
+def meal_day(create_onboarded_user):
+    """Return ``(user, client, log)`` with a DailyLog for today to log meals on."""
+    user, client = create_onboarded_user()
+    log = DailyLog.objects.create(
+        user=user, date=timezone.now().date(), weight=Decimal("75.0")
+    )
+    return user, client, log
@@ -0,0 +1,87 @@
+from decimal import Decimal
+
+import pytest
+
+from apps.foods.autocomplete import PrefixIndex, autocomplete, normalize
+from apps.foods.catalog import CatalogFood, custom_foods, get_catalog
+
+URL = "/api/v1/foods/autocomplete/"
+
+
+def _names(response):
+    return [row[1] for row in response.json()["data"]]
+
+
+class TestPrefixIndex:
+    def test_normalize_folds_case_accents_and_punctuation(self):
+        assert normalize("  Crème-Brûlée (Classic) ") == "creme brulee classic"
+
+    def test_whole_name_matches_rank_before_word_matches(self):
+        foods = [
+            CatalogFood(
+                (i, name, "", "", 100, Decimal("5"), 0, 0, 0, False, None, None)
+            )
+            for i, name in enumerate(
+                ["Roast Chicken", "Chicken Breast", "Chickpeas", "Rice"]
+            )
+        ]
+        index = PrefixIndex(foods)
+
+        names = [row[1] for _, _, row in sorted(index.matches("chick", 10))]
+
+        assert names == ["Chicken Breast", "Chickpeas", "Roast Chicken"]
+        assert len(index.matches("chick", 1)) == 2  # at most one per tier
+
+
+@pytest.mark.django_db
+class TestFoodAutocomplete:
+    def test_returns_compact_rows_by_prefix(self, create_onboarded_user, create_food):
+        _, client = create_onboarded_user()
+        paneer = create_food(
+            "Paneer Tikka", calories_per_100g=250, protein_per_100g=Decimal("18.5")
+        )
+        create_food("Palak Paneer")
+        create_food("Banana", category="fruit")
+
+        response = client.get(URL, {"q": "paneer t"})
+
+        assert response.status_code == 200
+        assert response.json()["data"] == [[str(paneer.pk), "Paneer Tikka", 250, 18.5]]
+        assert _names(client.get(URL, {"q": "PANEER"})) == [
+            "Paneer Tikka",
+            "Palak Paneer",
+        ]
+        assert client.get(URL, {"q": " "}).json()["data"] == []
+
+    def test_layers_only_the_users_custom_foods(
+        self, create_onboarded_user, create_food
+    ):
+        user, client = create_onboarded_user()
+        other, _ = create_onboarded_user()
+        create_food("Oats", category="grain")
+        create_food("Oat Milk", is_custom=True, created_by=user)
+        create_food("Oat Bar", is_custom=True, created_by=other)
+
+        assert _names(client.get(URL, {"q": "oat"})) == ["Oat Milk", "Oats"]
+
+    def test_limit(self, create_onboarded_user, create_food):
+        _, client = create_onboarded_user()
+        for name in ("Rice", "Rice Flakes", "Rice Pudding"):
+            create_food(name, category="grain")
+
+        assert _names(client.get(URL, {"q": "rice", "limit": 2})) == [
+            "Rice",
+            "Rice Flakes",
+        ]
+        assert client.get(URL, {"q": "rice", "limit": 0}).status_code == 400
+
+    def test_warm_lookups_make_no_queries(
+        self, create_onboarded_user, django_assert_num_queries, create_food
+    ):
+        user, _ = create_onboarded_user()
+        create_food("Dal Makhani")
+        get_catalog().prefix_index()
+        custom_foods(user.pk)
+
+        with django_assert_num_queries(0):
+            assert [row[1] for row in autocomplete(user, "makh")] == ["Dal Makhani"]
@@ -0,0 +1,95 @@
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from apps.foods.services import recompute_daily_log_totals
+from apps.logs.models import DailyLog
+
+SOY_CHUNKS = {
+    "calories_per_100g": 500,
+    "protein_per_100g": Decimal("50.5"),
+    "carbs_per_100g": Decimal("20.3"),
+    "fats_per_100g": Decimal("10.1"),
+    "fibre_per_100g": Decimal("2.5"),
+}
+
+
+def _totals(log):
+    log.refresh_from_db()
+    return {
+        field: getattr(log, field)
+        for field in (
+            "calories",
+            "protein",
+            "carbs",
+            "fats",
+            "fibre",
+            "food_protein",
+            "protein_hit",
+            "calories_ok",
+        )
+    }
+
+
+@pytest.mark.django_db
+class TestDeltaTotals:
+    def test_meal_writes_match_a_full_recompute(self, meal_day, create_food):
+        _, client, log = meal_day
+        url = f"/api/v1/logs/{log.date}/meals/"
+        food = create_food("Soy Chunks", **SOY_CHUNKS)
+        ids = []
+        for grams in ("100", "100", "100"):
+            response = client.post(
+                url,
+                {"food": str(food.pk), "meal_type": "lunch", "quantity_grams": grams},
+            )
+            ids.append(response.json()["data"]["id"])
+
+        # 3 x 500 kcal / 50.5 g protein: inside the calorie band and over the protein target.
+        after_adds = _totals(log)
+        assert after_adds["calories"] == 1500
+        assert after_adds["food_protein"] == Decimal("151.5")
+        assert after_adds["protein"] == 152
+        assert after_adds["protein_hit"] is True
+        assert after_adds["calories_ok"] is False
+
+        client.patch(f"{url}{ids[0]}/", {"quantity_grams": "200"})
+        assert _totals(log)["calories"] == 2000
+        assert _totals(log)["calories_ok"] is True
+
+        client.delete(f"{url}{ids[1]}/")
+        client.delete(f"{url}{ids[2]}/")
+        maintained = _totals(log)
+        assert maintained["protein"] == 101
+        assert maintained["protein_hit"] is False
+
+        recompute_daily_log_totals(log)
+        assert _totals(log) == maintained
+
+    def test_verifier_reports_and_repairs_drift(self, meal_day, create_food):
+        _, client, log = meal_day
+        url = f"/api/v1/logs/{log.date}/meals/"
+        food = create_food("Soy Chunks", **SOY_CHUNKS)
+        client.post(
+            url, {"food": str(food.pk), "meal_type": "lunch", "quantity_grams": "100"}
+        )
+        DailyLog.objects.filter(pk=log.pk).update(
+            food_protein=Decimal("7.0"), protein=7
+        )
+
+        report = StringIO()
+        call_command("verify_daily_totals", stdout=report)
+        assert "protein 7.0 != 50.5" in report.getvalue()
+        assert _totals(log)["protein"] == 7
+
+        repaired = StringIO()
+        call_command("verify_daily_totals", "--repair", stdout=repaired)
+        assert "Repaired 1" in repaired.getvalue()
+        assert _totals(log)["food_protein"] == Decimal("50.5")
+        assert _totals(log)["protein"] == 51
+
+        clean = StringIO()
+        call_command("verify_daily_totals", stdout=clean)
+        assert "No drifted daily totals" in clean.getvalue()
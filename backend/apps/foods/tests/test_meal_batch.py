@@ -0,0 +1,138 @@
+from decimal import Decimal
+
+import pytest
+
+from apps.foods.models import FoodEntry
+from apps.foods.services import recompute_daily_log_totals
+from apps.logs.models import DailyLog
+from apps.sync.models import SyncChange
+
+
+def _batch_url(log):
+    return f"/api/v1/logs/{log.date}/meals/batch/"
+
+
+@pytest.mark.django_db
+class TestMealBatch:
+    def test_creates_updates_and_deletes_in_one_request(self, meal_day, create_food):
+        user, client, log = meal_day
+        url = _batch_url(log)
+        oats = create_food("Oats", category="grain", calories_per_100g=400)
+        whey = create_food(
+            "Whey",
+            category="protein_source",
+            calories_per_100g=400,
+            protein_per_100g=Decimal("80"),
+        )
+        kept = FoodEntry.objects.create(
+            daily_log=log,
+            food=oats,
+            meal_type="breakfast",
+            quantity_grams=Decimal("50"),
+        )
+        dropped = FoodEntry.objects.create(
+            daily_log=log, food=oats, meal_type="snack", quantity_grams=Decimal("30")
+        )
+        recompute_daily_log_totals(log)
+
+        response = client.post(
+            url,
+            {
+                "create": [
+                    {
+                        "food": str(whey.pk),
+                        "meal_type": "breakfast",
+                        "quantity_grams": "30",
+                    },
+                    {
+                        "food": str(oats.pk),
+                        "meal_type": "dinner",
+                        "quantity_grams": "100",
+                    },
+                ],
+                "update": [{"id": str(kept.pk), "quantity_grams": "75"}],
+                "delete": [str(dropped.pk)],
+            },
+            format="json",
+        )
+
+        assert response.status_code == 200
+        rows = response.json()["data"]
+        assert sorted((row["food_name"], row["calories"]) for row in rows) == [
+            ("Oats", 300),
+            ("Oats", 400),
+            ("Whey", 120),
+        ]
+        log.refresh_from_db()
+        assert log.calories == 820
+        assert log.protein == 42  # 7.5 + 24 + 10
+        assert not FoodEntry.objects.filter(pk=dropped.pk).exists()
+        assert all(
+            entry.date == log.date for entry in FoodEntry.objects.filter(daily_log=log)
+        )
+        journal = dict(
+            SyncChange.objects.filter(
+                user=user, kind=SyncChange.KindChoices.FOOD_ENTRY
+            ).values_list("object_id", "deleted")
+        )
+        assert journal[dropped.pk] is True
+        assert journal[kept.pk] is False
+        assert len(journal) == 4
+
+    def test_rejects_the_whole_batch_on_any_invalid_operation(
+        self, meal_day, create_food, create_onboarded_user
+    ):
+        user, client, log = meal_day
+        url = _batch_url(log)
+        other, _ = create_onboarded_user()
+        oats = create_food("Oats", category="grain", calories_per_100g=400)
+        foreign = create_food("Secret Mix", is_custom=True, created_by=other)
+        other_log = DailyLog.objects.create(
+            user=other, date=log.date, weight=Decimal("70.0")
+        )
+        theirs = FoodEntry.objects.create(
+            daily_log=other_log,
+            food=oats,
+            meal_type="lunch",
+            quantity_grams=Decimal("50"),
+        )
+        valid = {"food": str(oats.pk), "meal_type": "lunch", "quantity_grams": "100"}
+
+        bad_food = client.post(
+            url, {"create": [valid, {**valid, "food": str(foreign.pk)}]}, format="json"
+        )
+        bad_entry = client.post(
+            url, {"create": [valid], "delete": [str(theirs.pk)]}, format="json"
+        )
+        empty = client.post(url, {}, format="json")
+
+        assert bad_food.status_code == 400
+        assert bad_entry.status_code == 400
+        assert empty.status_code == 400
+        assert not FoodEntry.objects.filter(daily_log=log).exists()
+        assert FoodEntry.objects.filter(pk=theirs.pk).exists()
+
+    def test_query_count_does_not_grow_with_batch_size(
+        self, meal_day, create_food, django_assert_max_num_queries
+    ):
+        user, client, log = meal_day
+        url = _batch_url(log)
+        oats = create_food("Oats", category="grain", calories_per_100g=400)
+        item = {"food": str(oats.pk), "meal_type": "lunch", "quantity_grams": "50"}
+        client.post(url, {"create": [item]}, format="json")  # warm the catalog
+
+        with django_assert_max_num_queries(30) as small:
+            client.post(url, {"create": [item]}, format="json")
+        with django_assert_max_num_queries(len(small.captured_queries)):
+            client.post(url, {"create": [item] * 12}, format="json")
+
+        assert FoodEntry.objects.filter(daily_log=log).count() == 14
+
+    def test_missing_log_is_404(self, create_onboarded_user):
+        _, client = create_onboarded_user()
+
+        response = client.post(
+            "/api/v1/logs/2020-01-01/meals/batch/", {"delete": []}, format="json"
+        )
+
+        assert response.status_code == 404
@@ -0,0 +1,179 @@
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+
+from apps.foods.catalog import custom_foods, resolve_food, visible_foods
+from apps.foods.models import FoodEntry
+from apps.foods.search import NgramIndex, rank_score, trigrams
+from apps.logs.models import DailyLog
+
+
+def _names(response):
+    return [food["name"] for food in response.json()["data"]["results"]]
+
+
+class TestRanking:
+    def test_trigrams_match_pg_trgm_padding(self):
+        assert trigrams("Dal") == {"  d", " da", "dal", "al "}
+
+    def test_prefix_and_usage_raise_the_score(self):
+        assert rank_score("chick", "Chicken Breast", 0.8) > rank_score(
+            "chick", "Roast Chicken", 0.8
+        )
+        assert rank_score("rice", "Brown Rice", 0.6, uses=10) > rank_score(
+            "rice", "Wild Rice", 0.6
+        )
+
+    def test_index_tolerates_typos_and_matches_substrings(self):
+        index = NgramIndex([(1, "Paneer Tikka"), (2, "Chicken Curry"), (3, "Apple")])
+
+        assert {food_id for food_id, _ in index.candidates("panner", 0.5)} == {1}
+        assert {food_id for food_id, _ in index.candidates("ick", 0.5)} == {2}
+        assert {food_id for food_id, _ in index.candidates("pp", 0.5)} == {3}
+
+
+@pytest.mark.django_db
+class TestFoodSearch:
+    def test_typo_tolerant_ranked_search(self, create_onboarded_user, create_food):
+        _, client = create_onboarded_user()
+        create_food("Paneer Tikka")
+        create_food("Palak Paneer")
+        create_food("Banana", category="fruit")
+
+        response = client.get("/api/v1/foods/?search=panner")
+
+        assert response.status_code == 200
+        assert sorted(_names(response)) == ["Palak Paneer", "Paneer Tikka"]
+
+    def test_keeps_visibility_rule_and_filters(
+        self, create_onboarded_user, create_food
+    ):
+        user, client = create_onboarded_user()
+        other, _ = create_onboarded_user()
+        create_food("Oat Milk", is_custom=True, created_by=user)
+        create_food("Oat Bar", is_custom=True, created_by=other)
+        create_food("Oats", category="grain")
+
+        names = _names(client.get("/api/v1/foods/?search=oat"))
+        grains = _names(client.get("/api/v1/foods/?search=oat&category=grain"))
+
+        assert sorted(names) == ["Oat Milk", "Oats"]
+        assert grains == ["Oats"]
+
+    def test_recently_logged_foods_rank_first(self, create_onboarded_user, create_food):
+        user, client = create_onboarded_user()
+        create_food("Brown Rice", category="grain")
+        basmati = create_food("Basmati Rice", category="grain")
+        log = DailyLog.objects.create(
+            user=user, date=timezone.now().date(), weight=Decimal("75.0")
+        )
+        for _ in range(5):
+            FoodEntry.objects.create(
+                daily_log=log,
+                food=basmati,
+                meal_type="lunch",
+                quantity_grams=Decimal("150"),
+            )
+
+        assert _names(client.get("/api/v1/foods/?search=rice"))[0] == "Basmati Rice"
+
+    def test_listing_without_search_is_unchanged(
+        self, create_onboarded_user, create_food
+    ):
+        _, client = create_onboarded_user()
+        create_food("Banana", category="fruit")
+        create_food("Apple", category="fruit")
+
+        assert _names(client.get("/api/v1/foods/")) == ["Apple", "Banana"]
+
+
+@pytest.mark.django_db
+class TestFoodCatalog:
+    def test_system_foods_resolve_without_queries(
+        self, create_onboarded_user, django_assert_num_queries, create_food
+    ):
+        user, client = create_onboarded_user()
+        oats = create_food("Oats", category="grain")
+        log = DailyLog.objects.create(
+            user=user, date=timezone.now().date(), weight=Decimal("75.0")
+        )
+        assert resolve_food(user, oats.pk).name == "Oats"
+        custom_foods(user.pk)
+
+        with django_assert_num_queries(0):
+            assert resolve_food(user, oats.pk).calories_per_100g == 200
+            assert [food.name for food in visible_foods(user)] == ["Oats"]
+            entry = FoodEntry(
+                daily_log=log, food_id=oats.pk, quantity_grams=Decimal("50")
+            )
+            entry.compute_nutrients()
+
+        assert entry.calories == 100
+
+    def test_snapshot_reloads_after_catalog_changes(
+        self, create_onboarded_user, create_food
+    ):
+        user, client = create_onboarded_user()
+        create_food("Oats", category="grain")
+        assert [food.name for food in visible_foods(user)] == ["Oats"]
+
+        rice = create_food("Rice", category="grain")
+        mine = create_food("My Shake", is_custom=True, created_by=user)
+        assert [food.name for food in visible_foods(user)] == [
+            "My Shake",
+            "Oats",
+            "Rice",
+        ]
+
+        rice.delete()
+        mine.delete()
+        assert [food.name for food in visible_foods(user)] == ["Oats"]
+
+    def test_meal_entries_only_accept_visible_foods(
+        self, create_onboarded_user, create_food
+    ):
+        user, client = create_onboarded_user()
+        other, _ = create_onboarded_user()
+        oats = create_food("Oats", category="grain")
+        foreign = create_food("Secret Mix", is_custom=True, created_by=other)
+        today = timezone.now().date()
+        DailyLog.objects.create(user=user, date=today, weight=Decimal("75.0"))
+        url = f"/api/v1/logs/{today}/meals/"
+
+        ok = client.post(
+            url,
+            {"food": str(oats.pk), "meal_type": "breakfast", "quantity_grams": "80"},
+        )
+        denied = client.post(
+            url, {"food": str(foreign.pk), "meal_type": "lunch", "quantity_grams": "80"}
+        )
+        detail = client.get(f"/api/v1/foods/{foreign.pk}/")
+
+        assert ok.status_code == 201
+        assert ok.json()["data"]["food_name"] == "Oats"
+        assert ok.json()["data"]["calories"] == 160
+        assert denied.status_code == 400
+        assert detail.status_code == 404
+
+    def test_paged_listing_merges_custom_foods_in_order(
+        self, create_onboarded_user, create_food
+    ):
+        user, client = create_onboarded_user()
+        for name in ("Dal", "Apple", "Egg", "Banana"):
+            create_food(
+                name,
+                category="fruit" if name in ("Apple", "Banana") else "protein_source",
+            )
+        create_food("Chia Pudding", category="fruit", is_custom=True, created_by=user)
+
+        foods = visible_foods(user, category="fruit")
+        first = client.get("/api/v1/foods/", {"page_size": 2})
+        second = client.get("/api/v1/foods/", {"page_size": 2, "page": 2})
+
+        assert len(foods) == 3
+        assert [food.name for food in foods[1:]] == ["Banana", "Chia Pudding"]
+        assert foods[-1].name == "Chia Pudding"
+        assert _names(first) == ["Apple", "Banana"]
+        assert _names(second) == ["Chia Pudding", "Dal"]
+        assert first.json()["data"]["count"] == 5
@@ -1,24 +1,34 @@
+from django.conf import settings
+from django.db import transaction
 from django.db.models import Q
+from django.http import Http404
 from rest_framework import generics, status
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from apps.core.mixins import OwnerQuerySetMixin
 from apps.core.permissions import IsEmailVerified, IsOnboarded
-from apps.core.throttling import ReadRateThrottle, WriteRateThrottle
+from apps.core.throttling import ReadRateThrottle, TypeaheadRateThrottle, WriteRateThrottle
 from apps.logs.models import DailyLog
 
+from .autocomplete import autocomplete
+from .catalog import resolve_food, visible_foods
 from .models import Food, FoodEntry
-from .serializers import FoodEntrySerializer, FoodSerializer
-from .services import recompute_daily_log_totals
+from .search import search_foods
+from .serializers import FoodEntrySerializer, FoodSerializer, MealBatchSerializer
+from .services import apply_meal_batch, apply_totals_delta, entry_nutrients, nutrient_delta
 
 
 # ──── Food CRUD ────
 
 
 class FoodListCreateView(generics.ListCreateAPIView):
-    """List/search foods or create a custom food."""
+    """List/search foods or create a custom food.
+
+    With ``?search=`` the results are ranked by relevance (see ``search.py``)
+    instead of listed alphabetically.
+    """
 
     serializer_class = FoodSerializer
     permission_classes = [IsAuthenticated, IsEmailVerified, IsOnboarded]
@@ -31,19 +41,45 @@ class FoodListCreateView(generics.ListCreateAPIView):
     def get_queryset(self):
         if getattr(self, "swagger_fake_view", False):
             return Food.objects.none()
-        qs = Food.objects.filter(
+        return Food.objects.filter(
             Q(is_custom=False) | Q(created_by=self.request.user)
         )
-        search = self.request.query_params.get("search")
+
+    def list(self, request, *args, **kwargs):
+        # Served from the catalog snapshot and the user's custom foods.
+        search = request.query_params.get("search", "").strip()
+        filters = {
+            "diet_type": request.query_params.get("diet_type"),
+            "category": request.query_params.get("category"),
+        }
         if search:
-            qs = qs.filter(name__icontains=search)
-        diet_type = self.request.query_params.get("diet_type")
-        if diet_type:
-            qs = qs.filter(diet_type=diet_type)
-        category = self.request.query_params.get("category")
-        if category:
-            qs = qs.filter(category=category)
-        return qs
+            foods = search_foods(request.user, search, **filters)
+        else:
+            foods = visible_foods(request.user, **filters)
+        page = self.paginate_queryset(foods)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+
+class FoodAutocompleteView(generics.GenericAPIView):
+    """Typeahead: top ``[id, name, kcal, protein]`` rows for ``?q=`` (see ``autocomplete.py``).
+
+    Unpaginated and served entirely from memory; ``?limit=`` caps the rows.
+    """
+
+    permission_classes = [IsAuthenticated, IsEmailVerified, IsOnboarded]
+    throttle_classes = [TypeaheadRateThrottle]
+    swagger_schema = None
+
+    def get(self, request):
+        limit = request.query_params.get("limit")
+        maximum = settings.FOOD_AUTOCOMPLETE_MAX_RESULTS
+        if limit is not None:
+            if not limit.isdigit() or not 0 < int(limit) <= maximum:
+                raise ValidationError({"limit": f"Must be between 1 and {maximum}."})
+            limit = int(limit)
+        query = request.query_params.get("q", "")
+        return Response(autocomplete(request.user, query, limit))
 
 
 class FoodDetailView(generics.RetrieveAPIView):
@@ -60,6 +96,12 @@ class FoodDetailView(generics.RetrieveAPIView):
             Q(is_custom=False) | Q(created_by=self.request.user)
         )
 
+    def get_object(self):
+        food = resolve_food(self.request.user, self.kwargs["pk"])
+        if food is None:
+            raise Http404
+        return food
+
 
 class FoodDeleteView(generics.DestroyAPIView):
     """Delete a custom food (owner only)."""
@@ -112,11 +154,41 @@ class FoodEntryListCreateView(generics.ListCreateAPIView):
             )
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save(daily_log=log)
-        recompute_daily_log_totals(log)
+        with transaction.atomic():
+            entry = serializer.save(daily_log=log)
+            apply_totals_delta(log, nutrient_delta(new=entry_nutrients(entry)))
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
+class FoodEntryBatchView(generics.GenericAPIView):
+    """Create, update and delete several of a day's meal entries at once.
+
+    Body: ``{"create": [{"food", "meal_type", "quantity_grams"}, ...],
+    "update": [{"id", ...changed fields}, ...], "delete": [<id>, ...]}``.
+    All or nothing; totals are recomputed once. Returns the day's entries.
+    """
+
+    serializer_class = MealBatchSerializer
+    permission_classes = [IsAuthenticated, IsEmailVerified, IsOnboarded]
+    throttle_classes = [WriteRateThrottle]
+
+    def post(self, request, date):
+        log = DailyLog.objects.filter(user=request.user, date=date).first()
+        if log is None:
+            return Response(
+                {"message": "No daily log found for this date. Create a daily log first."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        serializer = self.get_serializer(
+            data=request.data, context={**self.get_serializer_context(), "daily_log": log}
+        )
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            apply_meal_batch(log, **serializer.validated_data)
+        entries = FoodEntry.objects.filter(daily_log=log)
+        return Response(FoodEntrySerializer(entries, many=True).data)
+
+
 class FoodEntryDetailView(generics.RetrieveUpdateDestroyAPIView):
     """Get, update, or delete a food entry."""
 
@@ -138,10 +210,15 @@ class FoodEntryDetailView(generics.RetrieveUpdateDestroyAPIView):
         )
 
     def perform_update(self, serializer):
-        instance = serializer.save()
-        recompute_daily_log_totals(instance.daily_log)
+        old = entry_nutrients(serializer.instance)
+        with transaction.atomic():
+            instance = serializer.save()
+            apply_totals_delta(
+                instance.daily_log, nutrient_delta(old=old, new=entry_nutrients(instance))
+            )
 
     def perform_destroy(self, instance):
         log = instance.daily_log
-        instance.delete()
-        recompute_daily_log_totals(log)
+        with transaction.atomic():
+            instance.delete()
+            apply_totals_delta(log, nutrient_delta(old=entry_nutrients(instance)))
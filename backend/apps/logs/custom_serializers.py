@@ -28,3 +28,25 @@ class CustomMetricEntrySerializer(serializers.ModelSerializer):
         if value.user != user or not value.is_active:
             raise serializers.ValidationError("Invalid metric definition.")
         return value
+
+
+class CustomMetricValueSerializer(serializers.Serializer):
+    definition = serializers.UUIDField()
+    value = serializers.DecimalField(max_digits=8, decimal_places=2)
+
+
+class CustomMetricBatchSerializer(serializers.Serializer):
+    """A day's custom metric values, written together."""
+
+    entries = CustomMetricValueSerializer(many=True, allow_empty=False)
+
+    def validate_entries(self, entries):
+        ids = [entry["definition"] for entry in entries]
+        if len(set(ids)) != len(ids):
+            raise serializers.ValidationError("Each metric may appear only once.")
+        definitions = CustomMetricDefinition.objects.filter(
+            user=self.context["request"].user, is_active=True
+        ).in_bulk(ids)
+        if len(definitions) != len(ids):
+            raise serializers.ValidationError("Invalid metric definition.")
+        return entries
@@ -1,12 +1,22 @@
+from django.db import transaction
+from django.http import Http404
 from rest_framework import generics, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from apps.core.params import parse_date_param
 from apps.core.permissions import IsEmailVerified, IsOnboarded
 from apps.core.throttling import ReadRateThrottle, WriteRateThrottle
 
-from .custom_serializers import CustomMetricDefinitionSerializer, CustomMetricEntrySerializer
-from .models import CustomMetricDefinition, CustomMetricEntry, DailyLog
+from .custom_serializers import (
+    CustomMetricBatchSerializer,
+    CustomMetricDefinitionSerializer,
+    CustomMetricEntrySerializer,
+)
+from .models import CustomMetricDefinition, CustomMetricEntry, CustomMetricStats, DailyLog
+from .services import upsert_custom_entries
+from .stats import stats_payload
 
 
 class CustomMetricDefinitionListCreateView(generics.ListCreateAPIView):
@@ -73,7 +83,7 @@ class CustomMetricEntryListCreateView(generics.ListCreateAPIView):
             return CustomMetricEntry.objects.none()
         return CustomMetricEntry.objects.filter(
             daily_log=log, definition__user=self.request.user
-        )
+        ).select_related("definition")
 
     def create(self, request, *args, **kwargs):
         log = self._get_daily_log()
@@ -86,3 +96,78 @@ class CustomMetricEntryListCreateView(generics.ListCreateAPIView):
         serializer.is_valid(raise_exception=True)
         serializer.save(daily_log=log)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class CustomMetricEntryBatchView(generics.GenericAPIView):
+    """Upsert all of a day's custom metric values in one request.
+
+    Body: ``{"entries": [{"definition": <id>, "value": <number>}, ...]}``.
+    Returns the day's entries after the write.
+    """
+
+    serializer_class = CustomMetricBatchSerializer
+    permission_classes = [IsAuthenticated, IsEmailVerified, IsOnboarded]
+    throttle_classes = [WriteRateThrottle]
+
+    def post(self, request, date):
+        log = DailyLog.objects.filter(user=request.user, date=date).first()
+        if log is None:
+            return Response(
+                {"message": "No daily log found for this date."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            upsert_custom_entries(log, serializer.validated_data["entries"])
+        entries = CustomMetricEntry.objects.filter(daily_log=log).select_related(
+            "definition"
+        )
+        return Response(CustomMetricEntrySerializer(entries, many=True).data)
+
+
+class CustomMetricSeriesView(generics.GenericAPIView):
+    """Date -> value series for one custom metric, optionally ?from=&to=."""
+
+    permission_classes = [IsAuthenticated, IsEmailVerified, IsOnboarded]
+    throttle_classes = [ReadRateThrottle]
+    swagger_schema = None
+
+    def get(self, request, pk):
+        start = parse_date_param(request.query_params.get("from"), "from")
+        end = parse_date_param(request.query_params.get("to"), "to")
+        if start and end and start > end:
+            raise ValidationError({"from": "Must not be after 'to'."})
+
+        entries = CustomMetricEntry.objects.filter(
+            definition_id=pk, definition__user=request.user
+        )
+        if start:
+            entries = entries.filter(date__gte=start)
+        if end:
+            entries = entries.filter(date__lte=end)
+        series = [
+            {"date": day, "value": value}
+            for day, value in entries.order_by("date").values_list("date", "value")
+        ]
+        if not series and not CustomMetricDefinition.objects.filter(
+            pk=pk, user=request.user
+        ).exists():
+            raise Http404
+        return Response(series)
+
+
+class CustomMetricStatsView(generics.GenericAPIView):
+    """Precomputed count, mean, spread, rolling averages and percentiles."""
+
+    permission_classes = [IsAuthenticated, IsEmailVerified, IsOnboarded]
+    throttle_classes = [ReadRateThrottle]
+    swagger_schema = None
+
+    def get(self, request, pk):
+        stat = CustomMetricStats.objects.filter(
+            definition_id=pk, definition__user=request.user
+        ).first()
+        if stat is None:
+            raise Http404
+        return Response(stats_payload(stat))
@@ -0,0 +1,176 @@
+"""Streaming export of a user's DailyLog history as CSV or NDJSON.
+
+Logs, food entries and custom metric entries are read with independent
+date-ordered ``.iterator()`` queries (server-side cursors on PostgreSQL) and
+merged on the log date while the response streams, so memory use does not
+depend on how much history is exported. CSV output can be fed straight back
+into ``/logs/import/``.
+"""
+
+import csv
+import io
+import json
+from itertools import groupby
+from operator import itemgetter
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from apps.foods.models import FoodEntry
+
+from .models import CustomMetricDefinition, CustomMetricEntry, DailyLog
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FIELDS = [
+    "date",
+    "weight",
+    "calories",
+    "protein",
+    "carbs",
+    "fats",
+    "fibre",
+    "steps",
+    "water",
+    "sleep",
+    "workout",
+    "workout_type",
+    "fruit",
+    "protein_hit",
+    "calories_ok",
+]
+
+FOOD_FIELDS = [
+    "meal_type",
+    "food__name",
+    "quantity_grams",
+    "calories",
+    "protein",
+    "carbs",
+    "fats",
+    "fibre",
+]
+
+CUSTOM_METRIC_PREFIX = "custom:"
+
+
+def _by_date(rows):
+    """Group ``(date, *values)`` rows, already ordered by date, into ``{date: [values]}`` runs."""
+    for day, group in groupby(rows, key=itemgetter(0)):
+        yield day, [row[1:] for row in group]
+
+
+def _date_range(queryset, field, start, end):
+    if start:
+        queryset = queryset.filter(**{f"{field}__gte": start})
+    if end:
+        queryset = queryset.filter(**{f"{field}__lte": end})
+    return queryset
+
+
+def iter_export_records(
+    user,
+    start=None,
+    end=None,
+    include_foods=False,
+    include_custom=False,
+    chunk_size=EXPORT_CHUNK_SIZE,
+):
+    """Yield one dict per DailyLog, oldest first.
+
+    With ``include_foods`` each record gets a ``foods`` list; with
+    ``include_custom`` a ``custom_metrics`` ``{name: value}`` mapping.
+    """
+    logs = _date_range(DailyLog.objects.filter(user=user), "date", start, end)
+    rows = (
+        logs.order_by("date")
+        .values_list(*EXPORT_FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
+
+    foods = custom = iter(())
+    if include_foods:
+        entries = _date_range(
+            FoodEntry.objects.filter(daily_log__user=user),
+            "daily_log__date",
+            start,
+            end,
+        )
+        foods = _by_date(
+            entries.order_by("daily_log__date", "created_at")
+            .values_list("daily_log__date", *FOOD_FIELDS)
+            .iterator(chunk_size=chunk_size)
+        )
+    if include_custom:
+        entries = _date_range(
+            CustomMetricEntry.objects.filter(daily_log__user=user),
+            "daily_log__date",
+            start,
+            end,
+        )
+        custom = _by_date(
+            entries.order_by("daily_log__date")
+            .values_list("daily_log__date", "definition__name", "value")
+            .iterator(chunk_size=chunk_size)
+        )
+
+    next_foods = next(foods, None)
+    next_custom = next(custom, None)
+    for row in rows:
+        record = dict(zip(EXPORT_FIELDS, row))
+        day = record["date"]
+        if include_foods:
+            record["foods"] = []
+            if next_foods and next_foods[0] == day:
+                record["foods"] = [
+                    dict(zip(FOOD_FIELDS, entry)) for entry in next_foods[1]
+                ]
+                for entry in record["foods"]:
+                    entry["food"] = entry.pop("food__name")
+                next_foods = next(foods, None)
+        if include_custom:
+            record["custom_metrics"] = {}
+            if next_custom and next_custom[0] == day:
+                record["custom_metrics"] = dict(next_custom[1])
+                next_custom = next(custom, None)
+        yield record
+
+
+def iter_ndjson(records):
+    for record in records:
+        yield json.dumps(record, cls=DjangoJSONEncoder) + "\n"
+
+
+def iter_csv(records, user, include_foods=False, include_custom=False):
+    """Yield CSV text: one row per log, custom metrics as ``custom:<name>`` columns.
+
+    Food entries, when included, are a JSON list in a single ``foods`` column.
+    """
+    metric_names = []
+    if include_custom:
+        metric_names = list(
+            CustomMetricDefinition.objects.filter(user=user)
+            .order_by("name")
+            .values_list("name", flat=True)
+        )
+    header = EXPORT_FIELDS + (["foods"] if include_foods else [])
+    header += [f"{CUSTOM_METRIC_PREFIX}{name}" for name in metric_names]
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return text
+
+    writer.writerow(header)
+    yield flush()
+    for record in records:
+        row = [record[field] for field in EXPORT_FIELDS]
+        if include_foods:
+            row.append(json.dumps(record["foods"], cls=DjangoJSONEncoder))
+        custom = record.get("custom_metrics", {})
+        row += [custom.get(name, "") for name in metric_names]
+        writer.writerow(row)
+        yield flush()
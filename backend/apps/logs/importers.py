@@ -0,0 +1,216 @@
+"""Bulk import of DailyLog history from CSV or NDJSON uploads.
+
+Rows are parsed lazily from the upload, validated a chunk at a time with
+``DailyLogSerializer`` and written with one ``bulk_create(update_conflicts)``
+per chunk and set of supplied columns, so a multi-year history costs a
+handful of queries rather than a request per day. A column missing from a
+row leaves the stored value alone. Imported rows follow the same rules as
+the API: no future dates, and existing logs older than the edit window are
+left untouched.
+"""
+
+import csv
+import io
+import json
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import as_serializer_error
+
+from apps.users.models import UserTarget
+
+from .models import DailyLog
+from .serializers import DailyLogSerializer
+from .services import compute_daily_evaluations
+from .signals import daily_logs_bulk_changed
+
+IMPORT_CHUNK_SIZE = 500
+MAX_IMPORT_ROWS = 10000
+EDIT_WINDOW_DAYS = 7
+
+IMPORT_FIELDS = [
+    field
+    for field in DailyLogSerializer.Meta.fields
+    if field not in DailyLogSerializer.Meta.read_only_fields
+]
+
+EVALUATION_FIELDS = ["protein_hit", "calories_ok"]
+
+
+class ImportFormatError(ValueError):
+    """The upload could not be parsed at all."""
+
+
+def iter_csv_rows(stream):
+    """Yield ``(line_number, row)`` from a CSV upload with a header row.
+
+    Empty cells are dropped so the model defaults apply.
+    """
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig"))
+    if not reader.fieldnames or "date" not in reader.fieldnames:
+        raise ImportFormatError("CSV header must include a 'date' column.")
+    for row in reader:
+        yield reader.line_num, {
+            key: value.strip()
+            for key, value in row.items()
+            if key in IMPORT_FIELDS and value is not None and value.strip() != ""
+        }
+
+
+def iter_ndjson_rows(stream):
+    """Yield ``(line_number, row)`` from newline-delimited JSON objects."""
+    for line_number, line in enumerate(
+        io.TextIOWrapper(stream, encoding="utf-8-sig"), 1
+    ):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            yield line_number, None
+            continue
+        yield line_number, row if isinstance(row, dict) else None
+
+
+def _row_date(row):
+    """The row's date if it parses, for looking up the stored log early."""
+    try:
+        return parse_date(str(row.get("date") or ""))
+    except ValueError:
+        return None
+
+
+def _chunks(rows, size):
+    chunk = []
+    for item in rows:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def import_daily_logs(user, rows, chunk_size=IMPORT_CHUNK_SIZE):
+    """Validate and upsert ``(line_number, row)`` pairs for ``user``.
+
+    Returns ``{"created", "updated", "rejected"}`` where ``rejected`` lists
+    ``{"line", "errors"}`` for every row that was not written. Later rows
+    for a date already seen in the same upload are rejected.
+    """
+    target = UserTarget.objects.filter(user=user).first()
+    edit_cutoff = timezone.now().date() - timedelta(days=EDIT_WINDOW_DAYS)
+    # One serializer instance validates every row; its fields are built once.
+    validator = DailyLogSerializer()
+    # Evaluations are only rewritten when they can be computed, as in the API.
+    derived_fields = (
+        [*EVALUATION_FIELDS, "updated_at"] if target is not None else ["updated_at"]
+    )
+    seen_dates = set()
+    written_dates = set()
+    created = updated = processed = 0
+    rejected = []
+
+    with transaction.atomic():
+        for chunk in _chunks(rows, chunk_size):
+            processed += len(chunk)
+            if processed > MAX_IMPORT_ROWS:
+                raise ImportFormatError(
+                    f"Imports are limited to {MAX_IMPORT_ROWS} rows per file."
+                )
+            # Stored logs, so rows are validated against them (a row without
+            # ``workout`` keeps the stored one) and evaluations see stored intake.
+            existing = {
+                log.date: log
+                for log in DailyLog.objects.filter(
+                    user=user,
+                    date__in={_row_date(row) for _, row in chunk if row is not None}
+                    - {None},
+                )
+                .order_by()
+                .only("date", "protein", "calories", "workout")
+            }
+            valid = []
+            for line, row in chunk:
+                if row is None:
+                    rejected.append(
+                        {
+                            "line": line,
+                            "errors": {"non_field_errors": ["Not a JSON object."]},
+                        }
+                    )
+                    continue
+                validator.instance = existing.get(_row_date(row))
+                try:
+                    data = validator.run_validation(row)
+                except ValidationError as exc:
+                    rejected.append({"line": line, "errors": as_serializer_error(exc)})
+                    continue
+                if data["date"] in seen_dates:
+                    rejected.append(
+                        {
+                            "line": line,
+                            "errors": {"date": ["Duplicate date in this file."]},
+                        }
+                    )
+                    continue
+                seen_dates.add(data["date"])
+                valid.append((line, data))
+
+            groups = {}
+            for line, data in valid:
+                if data["date"] in existing and data["date"] < edit_cutoff:
+                    rejected.append(
+                        {
+                            "line": line,
+                            "errors": {
+                                "date": [
+                                    f"A log already exists; logs older than "
+                                    f"{EDIT_WINDOW_DAYS} days cannot be modified."
+                                ]
+                            },
+                        }
+                    )
+                    continue
+                if data.get("workout") is False:
+                    data["workout_type"] = None
+                supplied = tuple(sorted(field for field in data if field != "date"))
+                if target is not None:
+                    stored = existing.get(data["date"])
+                    data["protein_hit"], data["calories_ok"] = (
+                        compute_daily_evaluations(
+                            {
+                                "protein": data.get(
+                                    "protein", stored.protein if stored else 0
+                                ),
+                                "calories": data.get(
+                                    "calories", stored.calories if stored else 0
+                                ),
+                            },
+                            target,
+                        )
+                    )
+                groups.setdefault(supplied, []).append(DailyLog(user=user, **data))
+                if data["date"] in existing:
+                    updated += 1
+                else:
+                    created += 1
+
+            for supplied, objs in groups.items():
+                DailyLog.objects.bulk_create(
+                    objs,
+                    update_conflicts=True,
+                    unique_fields=["user", "date"],
+                    update_fields=[*supplied, *derived_fields],
+                )
+                written_dates.update(obj.date for obj in objs)
+
+    if written_dates:
+        daily_logs_bulk_changed.send(
+            sender=DailyLog, user_id=user.pk, dates=written_dates
+        )
+    rejected.sort(key=lambda item: item["line"])
+    return {"created": created, "updated": updated, "rejected": rejected}
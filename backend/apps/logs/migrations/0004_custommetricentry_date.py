@@ -0,0 +1,28 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_entry_dates(apps, schema_editor):
+    CustomMetricEntry = apps.get_model("logs", "CustomMetricEntry")
+    DailyLog = apps.get_model("logs", "DailyLog")
+    CustomMetricEntry.objects.update(
+        date=Subquery(
+            DailyLog.objects.filter(pk=OuterRef("daily_log_id")).values("date")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("logs", "0003_custommetricdefinition_remove_dailylog_cardio_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="custommetricentry",
+            name="date",
+            field=models.DateField(null=True),
+        ),
+        migrations.RunPython(backfill_entry_dates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("logs", "0004_custommetricentry_date"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="custommetricentry",
+            name="date",
+            field=models.DateField(),
+        ),
+        migrations.AddIndex(
+            model_name="custommetricentry",
+            index=models.Index(
+                fields=["definition", "date"], name="idx_custom_entries_def_date"
+            ),
+        ),
+    ]
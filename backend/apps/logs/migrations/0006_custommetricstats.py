@@ -0,0 +1,88 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, FloatField, Max, Min, Sum
+from django.db.models.functions import Cast
+
+
+def create_stats_rows(apps, schema_editor):
+    CustomMetricDefinition = apps.get_model("logs", "CustomMetricDefinition")
+    CustomMetricEntry = apps.get_model("logs", "CustomMetricEntry")
+    CustomMetricStats = apps.get_model("logs", "CustomMetricStats")
+    value = Cast("value", FloatField())
+    aggregates = {
+        row["definition_id"]: row
+        for row in CustomMetricEntry.objects.order_by()
+        .values("definition_id")
+        .annotate(
+            count=Count("id"),
+            total=Sum(value),
+            sum_squares=Sum(value * value),
+            min_value=Min("value"),
+            max_value=Max("value"),
+        )
+    }
+    stats = []
+    for definition_id in CustomMetricDefinition.objects.values_list("id", flat=True):
+        row = aggregates.get(definition_id, {})
+        stats.append(
+            CustomMetricStats(
+                definition_id=definition_id,
+                count=row.get("count", 0),
+                total=row.get("total") or 0,
+                sum_squares=row.get("sum_squares") or 0,
+                min_value=row.get("min_value"),
+                max_value=row.get("max_value"),
+            )
+        )
+    CustomMetricStats.objects.bulk_create(stats, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("logs", "0005_custommetricentry_date_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CustomMetricStats",
+            fields=[
+                (
+                    "definition",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="logs.custommetricdefinition",
+                    ),
+                ),
+                ("count", models.IntegerField(default=0)),
+                ("total", models.FloatField(default=0)),
+                ("sum_squares", models.FloatField(default=0)),
+                (
+                    "min_value",
+                    models.DecimalField(decimal_places=2, max_digits=8, null=True),
+                ),
+                (
+                    "max_value",
+                    models.DecimalField(decimal_places=2, max_digits=8, null=True),
+                ),
+                ("rolling_7_avg", models.FloatField(null=True)),
+                ("rolling_30_avg", models.FloatField(null=True)),
+                ("percentiles", models.JSONField(default=dict)),
+                ("stale", models.BooleanField(default=True)),
+                ("computed_at", models.DateTimeField(null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "custom_metric_stats",
+                "indexes": [
+                    models.Index(fields=["stale"], name="idx_custom_stats_stale")
+                ],
+            },
+        ),
+        migrations.RunPython(create_stats_rows, migrations.RunPython.noop),
+    ]
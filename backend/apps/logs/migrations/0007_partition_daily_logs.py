@@ -0,0 +1,35 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+from apps.core.partitions import partition_table, unpartition_table
+
+
+def partition(apps, schema_editor):
+    partition_table(schema_editor, "daily_logs", "date")
+
+
+def unpartition(apps, schema_editor):
+    unpartition_table(schema_editor, "daily_logs", "date")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("logs", "0006_custommetricstats"),
+        # Drops the food_entries -> daily_logs foreign key.
+        ("foods", "0003_foodentry_date_not_null"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="custommetricentry",
+            name="daily_log",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="custom_entries",
+                to="logs.dailylog",
+            ),
+        ),
+        migrations.RunPython(partition, unpartition),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:02
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+FOOD_TOTALS = ("calories", "protein", "carbs", "fats", "fibre")
+
+
+def backfill_food_totals(apps, schema_editor):
+    DailyLog = apps.get_model("logs", "DailyLog")
+    FoodEntry = apps.get_model("foods", "FoodEntry")
+    entries = (
+        FoodEntry.objects.filter(daily_log_id=OuterRef("pk"))
+        .order_by()
+        .values("daily_log_id")
+    )
+    DailyLog.objects.update(
+        **{
+            f"food_{field}": Coalesce(
+                Subquery(entries.annotate(total=Sum(field)).values("total")), Value(0)
+            )
+            for field in FOOD_TOTALS
+        }
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("logs", "0007_partition_daily_logs"),
+        ("foods", "0006_foodcatalogversion"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dailylog",
+            name="food_calories",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="dailylog",
+            name="food_carbs",
+            field=models.DecimalField(decimal_places=1, default=0, max_digits=7),
+        ),
+        migrations.AddField(
+            model_name="dailylog",
+            name="food_fats",
+            field=models.DecimalField(decimal_places=1, default=0, max_digits=7),
+        ),
+        migrations.AddField(
+            model_name="dailylog",
+            name="food_fibre",
+            field=models.DecimalField(decimal_places=1, default=0, max_digits=7),
+        ),
+        migrations.AddField(
+            model_name="dailylog",
+            name="food_protein",
+            field=models.DecimalField(decimal_places=1, default=0, max_digits=7),
+        ),
+        migrations.RunPython(backfill_food_totals, migrations.RunPython.noop),
+    ]
@@ -69,6 +69,13 @@ class DailyLog(models.Model):
         choices=WorkoutTypeChoices.choices,
     )
     fruit = models.BooleanField(default=False)
+    # Exact running sums of this log's meal entries; the rounded macro
+    # columns above are derived from them (see apps/foods/services.py).
+    food_calories = models.IntegerField(default=0)
+    food_protein = models.DecimalField(max_digits=7, decimal_places=1, default=0)
+    food_carbs = models.DecimalField(max_digits=7, decimal_places=1, default=0)
+    food_fats = models.DecimalField(max_digits=7, decimal_places=1, default=0)
+    food_fibre = models.DecimalField(max_digits=7, decimal_places=1, default=0)
     protein_hit = models.BooleanField(default=False)
     calories_ok = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -85,6 +92,23 @@ class DailyLog(models.Model):
     def __str__(self):
         return f"{self.user.email} - {self.date}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Keep the loaded values so signal handlers can see what changed.
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        previous_date = getattr(self, "_loaded_values", {}).get("date")
+        if previous_date is not None and previous_date != self.date:
+            # Keep the denormalized entry dates in step with the log.
+            self.custom_entries.update(date=self.date)
+            self.food_entries.update(date=self.date)
+        # Later saves of this instance move the log from the date just written.
+        self._loaded_values = {**getattr(self, "_loaded_values", {}), "date": self.date}
+
 
 class CustomMetricDefinition(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -114,17 +138,76 @@ class CustomMetricEntry(models.Model):
         on_delete=models.CASCADE,
         related_name="entries",
     )
+    # No database constraint: daily_logs is partitioned on PostgreSQL and its
+    # primary key is (id, date). Deletes still cascade through the ORM.
     daily_log = models.ForeignKey(
         DailyLog,
         on_delete=models.CASCADE,
         related_name="custom_entries",
+        db_constraint=False,
     )
+    # Denormalized from daily_log.date so per-metric series need no join.
+    date = models.DateField()
     value = models.DecimalField(max_digits=8, decimal_places=2)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         db_table = "custom_metric_entries"
         unique_together = ["definition", "daily_log"]
+        indexes = [
+            models.Index(
+                fields=["definition", "date"], name="idx_custom_entries_def_date"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.definition.name}: {self.value}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        if self.date is None and self.daily_log_id:
+            self.date = self.daily_log.date
+        super().save(*args, **kwargs)
+        # Later saves of this instance replace the value just written.
+        self._loaded_values = {"value": self.value, "date": self.date}
+
+
+class CustomMetricStats(models.Model):
+    """Aggregates for one custom metric, served by the stats endpoint as-is.
+
+    ``count``, ``total``, ``sum_squares``, ``min_value`` and ``max_value``
+    are folded in on every entry write. Rolling averages and percentiles are
+    recomputed by the metrics worker for rows marked ``stale``.
+    """
+
+    definition = models.OneToOneField(
+        CustomMetricDefinition,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+    )
+    count = models.IntegerField(default=0)
+    total = models.FloatField(default=0)
+    sum_squares = models.FloatField(default=0)
+    min_value = models.DecimalField(max_digits=8, decimal_places=2, null=True)
+    max_value = models.DecimalField(max_digits=8, decimal_places=2, null=True)
+    rolling_7_avg = models.FloatField(null=True)
+    rolling_30_avg = models.FloatField(null=True)
+    percentiles = models.JSONField(default=dict)
+    stale = models.BooleanField(default=True)
+    computed_at = models.DateTimeField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "custom_metric_stats"
+        indexes = [
+            models.Index(fields=["stale"], name="idx_custom_stats_stale"),
+        ]
+
+    def __str__(self):
+        return f"Stats for {self.definition_id}"
@@ -0,0 +1,91 @@
+"""Draft DailyLog payloads for the "prefill from yesterday" form.
+
+A draft for a date carries over the weight and workout of the most recent
+earlier log and uses the median steps, water and sleep of the
+``PREFILL_WINDOW_DAYS`` days before it. The newest ``PREFILL_CACHED_LOGS``
+logs of each user are kept in the ``LOGS_PREFILL_CACHE_ALIAS`` cache and
+rewritten on every DailyLog write (see ``signals.py``), so drafting for
+today reads nothing from the database; only dates older than the cached
+rows fall back to a query.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+from statistics import median
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .models import DailyLog
+
+PREFILL_WINDOW_DAYS = 14
+PREFILL_CACHED_LOGS = 2 * PREFILL_WINDOW_DAYS
+
+_FIELDS = ("date", "weight", "steps", "water", "sleep", "workout", "workout_type")
+
+
+def _cache():
+    return caches[settings.LOGS_PREFILL_CACHE_ALIAS]
+
+
+def _cache_key(user_id):
+    return f"logs:prefill:{user_id}"
+
+
+def _recent_rows(queryset, limit):
+    return list(queryset.order_by("-date").values_list(*_FIELDS)[:limit])
+
+
+def refresh_prefill_cache(user_id):
+    """Rewrite the user's cached recent logs; returns them newest first."""
+    rows = _recent_rows(DailyLog.objects.filter(user_id=user_id), PREFILL_CACHED_LOGS)
+    entry = {"rows": rows, "complete": len(rows) < PREFILL_CACHED_LOGS}
+    _cache().set(
+        _cache_key(user_id), entry, timeout=settings.LOGS_PREFILL_CACHE_TIMEOUT
+    )
+    return entry
+
+
+def _rows_before(user_id, day):
+    """Logs dated before ``day``, newest first, covering the prefill window."""
+    entry = _cache().get(_cache_key(user_id))
+    if entry is None:
+        entry = refresh_prefill_cache(user_id)
+    rows = entry["rows"]
+    window_start = day - timedelta(days=PREFILL_WINDOW_DAYS)
+    # The cache holds every log since its oldest row, so it answers any date
+    # whose window starts at or after that row.
+    if entry["complete"] or (rows and rows[-1][0] <= window_start):
+        return [row for row in rows if row[0] < day]
+    return _recent_rows(
+        DailyLog.objects.filter(user_id=user_id, date__lt=day), PREFILL_WINDOW_DAYS
+    )
+
+
+def _median_decimal(values):
+    return str(Decimal(median(values)).quantize(Decimal("0.1"))) if values else "0.0"
+
+
+def build_prefill(user_id, day):
+    """Return the draft payload for ``day``."""
+    rows = _rows_before(user_id, day)
+    window_start = day - timedelta(days=PREFILL_WINDOW_DAYS)
+    window = [dict(zip(_FIELDS, row)) for row in rows if row[0] >= window_start]
+    previous = dict(zip(_FIELDS, rows[0])) if rows else None
+
+    workout_types = []
+    for row in window:
+        if row["workout_type"] and row["workout_type"] not in workout_types:
+            workout_types.append(row["workout_type"])
+
+    return {
+        "date": day,
+        "source_date": previous["date"] if previous else None,
+        "weight": str(previous["weight"]) if previous else None,
+        "steps": round(median([row["steps"] for row in window])) if window else 0,
+        "water": _median_decimal([row["water"] for row in window]),
+        "sleep": _median_decimal([row["sleep"] for row in window]),
+        "workout": previous["workout"] if previous else False,
+        "workout_type": previous["workout_type"] if previous else None,
+        "recent_workout_types": workout_types,
+    }
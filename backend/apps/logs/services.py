@@ -1,5 +1,10 @@
 from datetime import timedelta
 
+import uuid
+
+from django.db import connections, router, transaction
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.db.models.signals import post_save
 from django.utils import timezone
 
 
@@ -21,6 +26,270 @@ def compute_daily_evaluations(log_data, user_target):
     return protein_hit, calories_ok
 
 
+def evaluation_conditions(user_target):
+    """Return ``(protein_hit, calories_ok)`` as Q objects over DailyLog columns.
+
+    Same rules as ``compute_daily_evaluations``; the +/-10% calorie band is
+    turned into integer bounds so the database compares exactly.
+    """
+    calorie_target = user_target.calorie_target
+    protein_hit = Q(protein__gte=user_target.protein_target)
+    calories_ok = Q(
+        calories__gte=-(-9 * calorie_target // 10),
+        calories__lte=11 * calorie_target // 10,
+    )
+    return protein_hit, calories_ok
+
+
+def reevaluate_daily_logs(user_id, user_target, chunk_days=366):
+    """Recompute protein_hit / calories_ok for a user's whole history.
+
+    Walks the history in ``chunk_days`` date ranges; each range costs one
+    SELECT of the dates whose flags change and one set-based UPDATE of just
+    those rows. Returns the set of dates that changed and sends
+    ``daily_logs_bulk_changed`` for them.
+    """
+    from apps.logs.models import DailyLog
+    from apps.logs.signals import daily_logs_bulk_changed
+
+    protein_hit, calories_ok = evaluation_conditions(user_target)
+    stale = (
+        (protein_hit & Q(protein_hit=False))
+        | (~protein_hit & Q(protein_hit=True))
+        | (calories_ok & Q(calories_ok=False))
+        | (~calories_ok & Q(calories_ok=True))
+    )
+    logs = DailyLog.objects.filter(user_id=user_id)
+    bounds = logs.order_by("date").values_list("date", flat=True)
+    first, last = bounds.first(), bounds.last()
+    changed = set()
+    if first is None:
+        return changed
+
+    start = first
+    with transaction.atomic():
+        while start <= last:
+            end = start + timedelta(days=chunk_days - 1)
+            chunk = logs.filter(date__gte=start, date__lte=end).filter(stale)
+            dates = list(chunk.values_list("date", flat=True))
+            if dates:
+                chunk.update(
+                    protein_hit=ExpressionWrapper(protein_hit, output_field=BooleanField()),
+                    calories_ok=ExpressionWrapper(calories_ok, output_field=BooleanField()),
+                    updated_at=timezone.now(),
+                )
+                changed.update(dates)
+            start = end + timedelta(days=1)
+
+    if changed:
+        daily_logs_bulk_changed.send(sender=DailyLog, user_id=user_id, dates=changed)
+    return changed
+
+
+# Columns an upsert may write; anything not supplied falls back to the model
+# default on insert and is left unchanged on update.
+UPSERT_COLUMNS = [
+    "weight",
+    "calories",
+    "protein",
+    "carbs",
+    "fats",
+    "fibre",
+    "steps",
+    "water",
+    "sleep",
+    "workout",
+    "workout_type",
+    "fruit",
+]
+
+# Running sums of the day's meal entries, kept by apps/foods/services.py: a
+# new log starts them at zero and an upsert never overwrites them.
+FOOD_TOTAL_COLUMNS = ["food_calories", "food_protein", "food_carbs", "food_fats", "food_fibre"]
+
+
+def _convert_row(connection, fields, row):
+    """Apply the backend and field converters a normal query would run."""
+    values = []
+    for field, value in zip(fields, row):
+        column = field.get_col(field.model._meta.db_table)
+        converters = connection.ops.get_db_converters(column)
+        converters += field.get_db_converters(connection)
+        for converter in converters:
+            value = converter(value, column, connection)
+        values.append(value)
+    return values
+
+
+def upsert_daily_log(user, data):
+    """Create or update ``user``'s log for ``data["date"]`` in one statement.
+
+    Runs ``INSERT ... SELECT ... ON CONFLICT (user_id, date) DO UPDATE ...
+    RETURNING``: protein_hit / calories_ok are evaluated in SQL against the
+    user's ``user_targets`` row (same rules as ``compute_daily_evaluations``),
+    fields missing from ``data`` keep their stored values on update, and two
+    concurrent writes for the same day cannot collide. ``post_save`` is sent
+    as for a normal save. Returns ``(log, created)``.
+    """
+    from apps.logs.models import DailyLog
+
+    opts = DailyLog._meta
+    db = router.db_for_write(DailyLog)
+    connection = connections[db]
+    qn = connection.ops.quote_name
+    table = qn(opts.db_table)
+    now = timezone.now()
+    new_id = uuid.uuid4()
+
+    supplied = [name for name in UPSERT_COLUMNS if name in data]
+    insert_values = {
+        name: data[name] if name in data else opts.get_field(name).get_default()
+        for name in UPSERT_COLUMNS
+    }
+
+    def prep(name, value):
+        return opts.get_field(name).get_db_prep_save(value, connection)
+
+    def post_value(name):
+        # The row's value after the update: the new one if supplied, else the stored one.
+        return f"EXCLUDED.{qn(name)}" if name in supplied else f"{table}.{qn(name)}"
+
+    def target_of(column, user_ref):
+        return (
+            f"(SELECT {qn(column)} FROM {qn('user_targets')} "
+            f"WHERE {qn('user_id')} = {user_ref})"
+        )
+
+    # Evaluations for the inserted row (parameters) and for the updated row
+    # (the new value if supplied, else the stored one); both mirror
+    # compute_daily_evaluations, with the calorie band in exact integer form.
+    protein_rule = "COALESCE({protein} >= {target}, {fallback})"
+    calorie_rule = "COALESCE(ABS({calories} - {target}) * 10 <= {target}, {fallback})"
+    stored_user = f"{table}.{qn('user_id')}"
+
+    columns = [
+        "id", "user_id", "date", *UPSERT_COLUMNS, *FOOD_TOTAL_COLUMNS,
+        "protein_hit", "calories_ok", "created_at", "updated_at",
+    ]
+    values = ["%s"] * (3 + len(UPSERT_COLUMNS) + len(FOOD_TOTAL_COLUMNS)) + [
+        protein_rule.format(
+            protein="%s", target=target_of("protein_target", "%s"), fallback="FALSE"
+        ),
+        calorie_rule.format(
+            calories="%s", target=target_of("calorie_target", "%s"), fallback="FALSE"
+        ),
+        "%s",
+        "%s",
+    ]
+    set_clauses = [
+        f"{qn(name)} = EXCLUDED.{qn(name)}"
+        for name in supplied
+        if name != "workout_type"
+    ]
+    if "workout_type" in supplied:
+        # A type only sticks to a day that (still) has a workout, as in
+        # DailyLogSerializer.validate, even if ``workout`` changed meanwhile.
+        set_clauses.append(
+            f"{qn('workout_type')} = CASE WHEN {post_value('workout')} "
+            f"THEN EXCLUDED.{qn('workout_type')} ELSE NULL END"
+        )
+    set_clauses += [
+        f"{qn('protein_hit')} = "
+        + protein_rule.format(
+            protein=post_value("protein"),
+            target=target_of("protein_target", stored_user),
+            fallback=f"{table}.{qn('protein_hit')}",
+        ),
+        f"{qn('calories_ok')} = "
+        + calorie_rule.format(
+            calories=post_value("calories"),
+            target=target_of("calorie_target", stored_user),
+            fallback=f"{table}.{qn('calories_ok')}",
+        ),
+        f"{qn('updated_at')} = EXCLUDED.{qn('updated_at')}",
+    ]
+    returning = list(opts.concrete_fields)
+    sql = (
+        f"INSERT INTO {table} ({', '.join(qn(column) for column in columns)}) "
+        f"VALUES ({', '.join(values)}) "
+        f"ON CONFLICT ({qn('user_id')}, {qn('date')}) DO UPDATE SET {', '.join(set_clauses)} "
+        f"RETURNING {', '.join(f'{table}.{qn(field.column)}' for field in returning)}"
+    )
+    user_pk = opts.get_field("user").target_field.get_db_prep_save(user.pk, connection)
+    params = [
+        prep("id", new_id),
+        user_pk,
+        prep("date", data["date"]),
+        *(prep(name, insert_values[name]) for name in UPSERT_COLUMNS),
+        *(prep(name, 0) for name in FOOD_TOTAL_COLUMNS),
+        insert_values["protein"],
+        user_pk,
+        insert_values["calories"],
+        user_pk,
+        user_pk,
+        prep("created_at", now),
+        prep("updated_at", now),
+    ]
+
+    with transaction.atomic(using=db, savepoint=False):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+        values = _convert_row(connection, returning, row)
+        log = DailyLog.from_db(db, [field.attname for field in returning], values)
+        created = log.pk == new_id
+        post_save.send(
+            sender=DailyLog,
+            instance=log,
+            created=created,
+            update_fields=None,
+            raw=False,
+            using=db,
+        )
+    return log, created
+
+
+def upsert_custom_entries(daily_log, entries):
+    """Write ``[{"definition", "value"}, ...]`` for one log in one statement.
+
+    Upserts on ``(definition, daily_log)`` and sends
+    ``custom_entries_bulk_changed`` with the replaced values in place of the
+    per-row ``post_save``.
+    """
+    from apps.logs.models import CustomMetricEntry
+    from apps.logs.signals import custom_entries_bulk_changed
+
+    definition_ids = [entry["definition"] for entry in entries]
+    previous = dict(
+        CustomMetricEntry.objects.filter(
+            daily_log=daily_log, definition_id__in=definition_ids
+        ).values_list("definition_id", "value")
+    )
+    CustomMetricEntry.objects.bulk_create(
+        [
+            CustomMetricEntry(
+                definition_id=entry["definition"],
+                daily_log=daily_log,
+                date=daily_log.date,
+                value=entry["value"],
+            )
+            for entry in entries
+        ],
+        update_conflicts=True,
+        unique_fields=["definition", "daily_log"],
+        update_fields=["value"],
+    )
+    custom_entries_bulk_changed.send(
+        sender=CustomMetricEntry,
+        user_id=daily_log.user_id,
+        daily_log_id=daily_log.pk,
+        changes=[
+            (entry["definition"], previous.get(entry["definition"]), entry["value"])
+            for entry in entries
+        ],
+    )
+
+
 def check_weekly_workout_variety(user):
     """Check if user has done at least 2 different workout types this week (Mon-Sun)."""
     from apps.logs.models import DailyLog
@@ -38,15 +307,20 @@ def check_weekly_workout_variety(user):
         workout_type__isnull=False,
     ).values_list("workout_type", flat=True)
 
-    types_done = list(set(logs))
-    meets_rule = len(types_done) >= 2
+    return summarize_workout_variety(logs)
+
+
+def summarize_workout_variety(workout_types, min_types=2):
+    """Apply the weekly variety rule (at least ``min_types`` types) to workout types."""
+    types_done = list(set(workout_types))
+    meets_rule = len(types_done) >= min_types
 
     if meets_rule:
         message = f"Great variety! You've done {len(types_done)} workout types this week."
-    elif len(types_done) == 1:
+    elif len(types_done) >= 1:
         message = "Try a different workout type this week for better variety."
     else:
-        message = "No workouts logged this week yet. Try to mix at least 2 types."
+        message = f"No workouts logged this week yet. Try to mix at least {min_types} types."
 
     return {
         "types_done": types_done,
@@ -0,0 +1,66 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .models import (
+    CustomMetricDefinition,
+    CustomMetricEntry,
+    CustomMetricStats,
+    DailyLog,
+)
+from .prefill import refresh_prefill_cache
+from .stats import apply_entry_change
+
+# Sent with sender=DailyLog after a bulk write that bypassed post_save, e.g. an
+# import. Receivers get ``user_id`` and ``dates`` (the set of dates written).
+daily_logs_bulk_changed = Signal()
+
+# Sent with sender=CustomMetricEntry after a bulk upsert of a day's custom
+# values. Receivers get ``user_id``, ``daily_log_id`` and ``changes``, a list
+# of ``(definition_id, old_value, new_value)`` with old_value None for inserts.
+custom_entries_bulk_changed = Signal()
+
+
+@receiver(post_save, sender=DailyLog)
+def refresh_prefill_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh_prefill_cache(instance.user_id)
+
+
+@receiver(post_delete, sender=DailyLog)
+def refresh_prefill_on_delete(sender, instance, origin=None, **kwargs):
+    if not isinstance(origin, get_user_model()):
+        refresh_prefill_cache(instance.user_id)
+
+
+@receiver(daily_logs_bulk_changed, sender=DailyLog)
+def refresh_prefill_on_bulk_change(sender, user_id, **kwargs):
+    refresh_prefill_cache(user_id)
+
+
+@receiver(post_save, sender=CustomMetricDefinition)
+def create_metric_stats(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        CustomMetricStats.objects.get_or_create(definition=instance)
+
+
+@receiver(post_save, sender=CustomMetricEntry)
+def update_metric_stats_on_save(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    old = None if created else getattr(instance, "_loaded_values", {}).get("value")
+    apply_entry_change(instance.definition_id, old=old, new=instance.value)
+
+
+@receiver(post_delete, sender=CustomMetricEntry)
+def update_metric_stats_on_delete(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, (get_user_model(), CustomMetricDefinition)):
+        # The stats row is being deleted along with its definition.
+        return
+    apply_entry_change(instance.definition_id, old=instance.value)
+
+
+@receiver(custom_entries_bulk_changed, sender=CustomMetricEntry)
+def update_metric_stats_on_bulk_change(sender, changes, **kwargs):
+    for definition_id, old, new in changes:
+        apply_entry_change(definition_id, old=old, new=new)
@@ -0,0 +1,152 @@
+"""Maintenance of ``CustomMetricStats``.
+
+Entry writes fold into the streaming aggregates with a single UPDATE:
+inserts adjust count/sum/sum of squares and can only widen min/max, while a
+replaced or removed value re-reads the bounds from the definition's entries
+in the same statement. Rolling averages and percentiles depend on the whole
+series and on today's date, so the metrics worker recomputes them with NumPy
+for rows marked stale or last computed before today, re-deriving the
+streaming aggregates exactly at the same time.
+"""
+
+from datetime import datetime, time, timezone as dt_timezone
+from itertools import groupby
+from operator import itemgetter
+
+import numpy as np
+from django.db.models import DecimalField, F, Max, Min, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.utils import timezone
+
+from .models import CustomMetricEntry, CustomMetricStats
+
+PERCENTILES = (10, 25, 50, 75, 90)
+ROLLING_WINDOWS = (7, 30)
+
+
+def _bound(definition_id, aggregate):
+    entries = (
+        CustomMetricEntry.objects.filter(definition_id=definition_id)
+        .order_by()
+        .values("definition_id")
+        .annotate(bound=aggregate("value"))
+        .values("bound")
+    )
+    return Subquery(entries[:1])
+
+
+def apply_entry_change(definition_id, old=None, new=None):
+    """Fold one entry write into the definition's aggregates in one UPDATE.
+
+    ``old`` is the value being replaced or removed, ``new`` the value written;
+    either may be None. Must run after the entry row itself was written.
+    """
+    old_value = float(old) if old is not None else 0.0
+    new_value = float(new) if new is not None else 0.0
+    # An int, not bools: PostgreSQL has no integer + boolean operator.
+    count_delta = int(new is not None) - int(old is not None)
+    updates = {
+        "count": F("count") + count_delta,
+        "total": F("total") + (new_value - old_value),
+        "sum_squares": F("sum_squares") + (new_value**2 - old_value**2),
+        "stale": True,
+        "updated_at": timezone.now(),
+    }
+    if old is None:
+        value = Value(new, output_field=DecimalField(max_digits=8, decimal_places=2))
+        updates["min_value"] = Least(Coalesce("min_value", value), value)
+        updates["max_value"] = Greatest(Coalesce("max_value", value), value)
+    else:
+        updates["min_value"] = _bound(definition_id, Min)
+        updates["max_value"] = _bound(definition_id, Max)
+    CustomMetricStats.objects.filter(definition_id=definition_id).update(**updates)
+
+
+def summarize_series(dates, values, today):
+    """Rolling averages and percentiles for one metric's date-ordered series."""
+    days = np.asarray(dates, dtype="datetime64[D]")
+    values = np.asarray(values, dtype=float)
+    age = (np.datetime64(today, "D") - days).astype(int)
+    summary = {}
+    for window in ROLLING_WINDOWS:
+        in_window = values[(age >= 0) & (age < window)]
+        summary[f"rolling_{window}_avg"] = (
+            round(float(in_window.mean()), 2) if in_window.size else None
+        )
+    summary["percentiles"] = (
+        {
+            f"p{q}": round(float(v), 2)
+            for q, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))
+        }
+        if values.size
+        else {}
+    )
+    summary["count"] = int(values.size)
+    summary["total"] = float(values.sum())
+    summary["sum_squares"] = float(np.dot(values, values))
+    return summary
+
+
+def refresh_metric_stats(batch_size=200):
+    """Recompute one batch of stale stats rows; returns how many were updated.
+
+    A row written to while the batch was being computed is left stale so
+    the next pass picks it up with the new entry included.
+    """
+    claimed_at = timezone.now()
+    today = claimed_at.date()
+    day_start = datetime.combine(today, time.min, tzinfo=dt_timezone.utc)
+    ids = list(
+        CustomMetricStats.objects.filter(
+            Q(stale=True) | Q(computed_at__isnull=True) | Q(computed_at__lt=day_start)
+        ).values_list("definition_id", flat=True)[:batch_size]
+    )
+    if not ids:
+        return 0
+
+    summaries = {
+        definition_id: {
+            **summarize_series([], [], today),
+            "min_value": None,
+            "max_value": None,
+        }
+        for definition_id in ids
+    }
+    rows = (
+        CustomMetricEntry.objects.filter(definition_id__in=ids)
+        .order_by("definition_id", "date")
+        .values_list("definition_id", "date", "value")
+    )
+    for definition_id, group in groupby(rows.iterator(), key=itemgetter(0)):
+        _, dates, values = zip(*group)
+        summaries[definition_id] = {
+            **summarize_series(dates, values, today),
+            "min_value": min(values),
+            "max_value": max(values),
+        }
+
+    updated = 0
+    for definition_id, summary in summaries.items():
+        updated += CustomMetricStats.objects.filter(
+            definition_id=definition_id, updated_at__lte=claimed_at
+        ).update(**summary, stale=False, computed_at=claimed_at)
+    return updated
+
+
+def stats_payload(stat):
+    mean = stat.total / stat.count if stat.count else None
+    stddev = None
+    if stat.count:
+        variance = max(stat.sum_squares / stat.count - mean * mean, 0.0)
+        stddev = round(variance**0.5, 2)
+    return {
+        "count": stat.count,
+        "mean": round(mean, 2) if mean is not None else None,
+        "stddev": stddev,
+        "min": stat.min_value,
+        "max": stat.max_value,
+        "rolling_7_avg": stat.rolling_7_avg,
+        "rolling_30_avg": stat.rolling_30_avg,
+        "percentiles": stat.percentiles,
+        "computed_at": stat.computed_at,
+    }
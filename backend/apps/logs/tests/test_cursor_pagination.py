@@ -0,0 +1,87 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.logs.models import DailyLog
+
+
+def _seed(user, days):
+    today = timezone.now().date()
+    for offset in range(days):
+        DailyLog.objects.create(
+            user=user, date=today - timedelta(days=offset), weight=Decimal("75.0")
+        )
+
+
+@pytest.mark.django_db
+class TestDateCursorPagination:
+    def test_walks_forward_and_back_without_count(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        _seed(user, 45)
+        expected = [
+            str(day)
+            for day in DailyLog.objects.filter(user=user)
+            .order_by("-date")
+            .values_list("date", flat=True)
+        ]
+
+        seen = []
+        pages = []
+        url = "/api/v1/logs/?cursor="
+        with CaptureQueriesContext(connection) as queries:
+            while url:
+                body = client.get(url).json()
+                pages.append(body)
+                seen += [log["date"] for log in body["data"]["results"]]
+                cursor = body["meta"]["next_cursor"]
+                url = f"/api/v1/logs/?cursor={cursor}" if cursor else None
+
+        assert seen == expected
+        assert [len(page["data"]["results"]) for page in pages] == [20, 20, 5]
+        assert pages[0]["meta"]["previous_cursor"] is None
+        assert not any("COUNT(" in query["sql"] for query in queries.captured_queries)
+
+        back = client.get(
+            f"/api/v1/logs/?cursor={pages[2]['meta']['previous_cursor']}"
+        ).json()
+        assert [log["date"] for log in back["data"]["results"]] == expected[20:40]
+        assert back["meta"]["next_cursor"]
+
+    def test_page_number_mode_is_unchanged(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        _seed(user, 25)
+
+        body = client.get("/api/v1/logs/?page=2").json()
+
+        assert body["data"]["count"] == 25
+        assert len(body["data"]["results"]) == 5
+
+    def test_cursor_respects_filters_and_page_size(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        _seed(user, 30)
+        since = timezone.now().date() - timedelta(days=9)
+
+        body = client.get(f"/api/v1/logs/?cursor=&page_size=4&date__gte={since}").json()
+        cursor = body["meta"]["next_cursor"]
+        rest = client.get(
+            f"/api/v1/logs/?cursor={cursor}&page_size=100&date__gte={since}"
+        ).json()
+
+        assert len(body["data"]["results"]) == 4
+        assert len(rest["data"]["results"]) == 6
+        assert rest["meta"]["next_cursor"] is None
+
+    def test_invalid_cursor(self, create_onboarded_user):
+        _, client = create_onboarded_user()
+
+        assert client.get("/api/v1/logs/?cursor=garbage").status_code == 404
+        assert (
+            client.get(
+                "/api/v1/measurements/?cursor=bnwyMDI0LTAxLTAxfHh5eg"
+            ).status_code
+            == 404
+        )
@@ -0,0 +1,155 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from apps.logs.models import (
+    CustomMetricDefinition,
+    CustomMetricEntry,
+    CustomMetricStats,
+    DailyLog,
+)
+from apps.logs.stats import refresh_metric_stats
+
+
+def _entry(user, definition, offset, value):
+    log, _ = DailyLog.objects.get_or_create(
+        user=user,
+        date=timezone.now().date() - timedelta(days=offset),
+        defaults={"weight": Decimal("75.0")},
+    )
+    return CustomMetricEntry.objects.create(
+        definition=definition, daily_log=log, value=value
+    )
+
+
+@pytest.mark.django_db
+class TestCustomMetricStats:
+    def test_streaming_aggregates_follow_writes(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        hr = CustomMetricDefinition.objects.create(
+            user=user, name="resting_hr", unit="bpm"
+        )
+        first = _entry(user, hr, 0, Decimal("60"))
+        _entry(user, hr, 1, Decimal("55"))
+        _entry(user, hr, 2, Decimal("70"))
+
+        stat = CustomMetricStats.objects.get(definition=hr)
+        assert (stat.count, stat.total, stat.sum_squares) == (
+            3,
+            185.0,
+            3600 + 3025 + 4900,
+        )
+        assert (stat.min_value, stat.max_value) == (Decimal("55"), Decimal("70"))
+        assert stat.stale is True
+
+        first.value = Decimal("80")
+        first.save()
+        CustomMetricEntry.objects.filter(value=Decimal("55")).get().delete()
+
+        stat.refresh_from_db()
+        assert (stat.count, stat.total) == (2, 150.0)
+        assert (stat.min_value, stat.max_value) == (Decimal("70"), Decimal("80"))
+
+    def test_count_follows_create_update_and_delete(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        sleep = CustomMetricDefinition.objects.create(
+            user=user, name="sleep_score", unit="pts"
+        )
+        bool_params = []
+
+        def record(execute, sql, sql_params, many, context):
+            if sql.startswith('UPDATE "custom_metric_stats"'):
+                bool_params.append(sum(isinstance(param, bool) for param in sql_params))
+            return execute(sql, sql_params, many, context)
+
+        def count():
+            return CustomMetricStats.objects.get(definition=sleep).count
+
+        with connection.execute_wrapper(record):
+            entry = _entry(user, sleep, 0, Decimal("80"))
+            assert count() == 1
+            _entry(user, sleep, 1, Decimal("70"))
+            assert count() == 2
+            entry.value = Decimal("90")
+            entry.save()
+            assert count() == 2
+            entry.delete()
+            assert count() == 1
+
+        # Only ``stale = true``; PostgreSQL rejects ``"count" + true``.
+        assert bool_params == [1, 1, 1, 1]
+
+    def test_batch_upsert_updates_aggregates(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        mood = CustomMetricDefinition.objects.create(
+            user=user, name="mood", unit="1-10"
+        )
+        entry = _entry(user, mood, 0, Decimal("4"))
+
+        response = client.post(
+            f"/api/v1/logs/{entry.date}/custom-entries/batch/",
+            {"entries": [{"definition": str(mood.pk), "value": 9}]},
+            format="json",
+        )
+
+        assert response.status_code == 200
+        stat = CustomMetricStats.objects.get(definition=mood)
+        assert (stat.count, stat.total, stat.sum_squares) == (1, 9.0, 81.0)
+        assert (stat.min_value, stat.max_value) == (Decimal("9"), Decimal("9"))
+
+    def test_refresh_computes_rolling_values_and_percentiles(
+        self, create_onboarded_user
+    ):
+        user, _ = create_onboarded_user()
+        steps = CustomMetricDefinition.objects.create(user=user, name="steps", unit="k")
+        for offset in range(40):
+            _entry(user, steps, offset, Decimal(offset))
+
+        assert refresh_metric_stats() == 1
+        assert refresh_metric_stats() == 0
+
+        stat = CustomMetricStats.objects.get(definition=steps)
+        assert stat.stale is False
+        assert stat.rolling_7_avg == 3.0
+        assert stat.rolling_30_avg == 14.5
+        assert stat.percentiles["p50"] == 19.5
+        assert stat.count == 40
+
+    def test_refresh_counts_only_rows_it_updated(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        steps = CustomMetricDefinition.objects.create(user=user, name="steps", unit="k")
+        _entry(user, steps, 0, Decimal("5"))
+        # Written "after" the claim, e.g. by a host whose clock runs ahead.
+        CustomMetricStats.objects.filter(definition=steps).update(
+            updated_at=timezone.now() + timedelta(minutes=5)
+        )
+
+        assert refresh_metric_stats() == 0
+        assert CustomMetricStats.objects.get(definition=steps).stale is True
+
+    def test_stats_endpoint(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        other, _ = create_onboarded_user()
+        hr = CustomMetricDefinition.objects.create(
+            user=user, name="resting_hr", unit="bpm"
+        )
+        foreign = CustomMetricDefinition.objects.create(
+            user=other, name="steps", unit="n"
+        )
+        _entry(user, hr, 0, Decimal("60"))
+        _entry(user, hr, 1, Decimal("64"))
+        refresh_metric_stats()
+
+        response = client.get(f"/api/v1/logs/custom-metrics/{hr.pk}/stats/")
+        foreign_response = client.get(
+            f"/api/v1/logs/custom-metrics/{foreign.pk}/stats/"
+        )
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert (data["count"], data["mean"], data["stddev"]) == (2, 62.0, 2.0)
+        assert data["rolling_7_avg"] == 62.0
+        assert foreign_response.status_code == 404
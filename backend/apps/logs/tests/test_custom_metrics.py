@@ -0,0 +1,166 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.logs.models import CustomMetricDefinition, CustomMetricEntry, DailyLog
+
+
+def _log(user, offset=0):
+    return DailyLog.objects.create(
+        user=user,
+        date=timezone.now().date() - timedelta(days=offset),
+        weight=Decimal("75.0"),
+    )
+
+
+@pytest.mark.django_db
+class TestCustomMetricBatch:
+    def test_batch_upserts_a_days_values(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        log = _log(user)
+        hr = CustomMetricDefinition.objects.create(
+            user=user, name="resting_hr", unit="bpm"
+        )
+        mood = CustomMetricDefinition.objects.create(
+            user=user, name="mood", unit="1-10"
+        )
+        CustomMetricEntry.objects.create(
+            definition=hr, daily_log=log, value=Decimal("60")
+        )
+        url = f"/api/v1/logs/{log.date}/custom-entries/batch/"
+
+        response = client.post(
+            url,
+            {
+                "entries": [
+                    {"definition": str(hr.pk), "value": "58.5"},
+                    {"definition": str(mood.pk), "value": 7},
+                ]
+            },
+            format="json",
+        )
+
+        assert response.status_code == 200
+        by_name = {
+            entry["metric_name"]: entry["value"] for entry in response.json()["data"]
+        }
+        assert by_name == {"resting_hr": "58.50", "mood": "7.00"}
+        assert CustomMetricEntry.objects.filter(daily_log=log).count() == 2
+        assert set(CustomMetricEntry.objects.values_list("date", flat=True)) == {
+            log.date
+        }
+
+    def test_batch_rejects_foreign_or_duplicate_definitions(
+        self, create_onboarded_user
+    ):
+        user, client = create_onboarded_user()
+        other, _ = create_onboarded_user()
+        log = _log(user)
+        foreign = CustomMetricDefinition.objects.create(
+            user=other, name="steps", unit="n"
+        )
+        mine = CustomMetricDefinition.objects.create(
+            user=user, name="mood", unit="1-10"
+        )
+        url = f"/api/v1/logs/{log.date}/custom-entries/batch/"
+
+        foreign_response = client.post(
+            url,
+            {"entries": [{"definition": str(foreign.pk), "value": 1}]},
+            format="json",
+        )
+        duplicate_response = client.post(
+            url,
+            {
+                "entries": [
+                    {"definition": str(mine.pk), "value": 1},
+                    {"definition": str(mine.pk), "value": 2},
+                ]
+            },
+            format="json",
+        )
+
+        assert foreign_response.status_code == 400
+        assert duplicate_response.status_code == 400
+        assert not CustomMetricEntry.objects.exists()
+
+    def test_day_list_has_no_n_plus_one(
+        self, create_onboarded_user, django_assert_max_num_queries
+    ):
+        user, client = create_onboarded_user()
+        log = _log(user)
+        for i in range(5):
+            definition = CustomMetricDefinition.objects.create(
+                user=user, name=f"m{i}", unit="u"
+            )
+            CustomMetricEntry.objects.create(
+                definition=definition, daily_log=log, value=i
+            )
+
+        with django_assert_max_num_queries(6):
+            response = client.get(f"/api/v1/logs/{log.date}/custom-entries/")
+        assert response.json()["data"]["count"] == 5
+
+
+@pytest.mark.django_db
+class TestCustomMetricSeries:
+    def test_series_is_one_query_over_the_date_index(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        hr = CustomMetricDefinition.objects.create(
+            user=user, name="resting_hr", unit="bpm"
+        )
+        for offset in range(90):
+            CustomMetricEntry.objects.create(
+                definition=hr,
+                daily_log=_log(user, offset),
+                value=Decimal(60 + offset % 5),
+            )
+        start = timezone.now().date() - timedelta(days=29)
+        url = f"/api/v1/logs/custom-metrics/{hr.pk}/series/?from={start}"
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        series = response.json()["data"]
+        entry_queries = [
+            query
+            for query in queries.captured_queries
+            if "custom_metric_entries" in query["sql"]
+        ]
+        assert len(entry_queries) == 1
+        assert "daily_logs" not in entry_queries[0]["sql"]
+        assert len(series) == 30
+        assert series[0]["date"] == str(start)
+        assert [point["date"] for point in series] == sorted(
+            point["date"] for point in series
+        )
+
+    def test_entry_dates_follow_a_moved_log(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        log = _log(user, 3)
+        hr = CustomMetricDefinition.objects.create(
+            user=user, name="resting_hr", unit="bpm"
+        )
+        entry = CustomMetricEntry.objects.create(definition=hr, daily_log=log, value=60)
+
+        log = DailyLog.objects.get(pk=log.pk)
+        log.date = log.date - timedelta(days=1)
+        log.save()
+
+        entry.refresh_from_db()
+        assert entry.date == log.date
+
+    def test_unknown_or_foreign_definition_is_404(self, create_onboarded_user):
+        _, client = create_onboarded_user()
+        other, _ = create_onboarded_user()
+        foreign = CustomMetricDefinition.objects.create(
+            user=other, name="mood", unit="1-10"
+        )
+
+        assert (
+            client.get(f"/api/v1/logs/custom-metrics/{foreign.pk}/series/").status_code
+            == 404
+        )
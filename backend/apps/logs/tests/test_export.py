@@ -0,0 +1,106 @@
+import csv
+import io
+import json
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+
+from apps.foods.models import Food, FoodEntry
+from apps.logs.models import CustomMetricDefinition, CustomMetricEntry, DailyLog
+
+
+def _seed(user, days):
+    today = timezone.now().date()
+    return [
+        DailyLog.objects.create(
+            user=user,
+            date=today - timedelta(days=offset),
+            weight=Decimal("75.0"),
+            calories=2000,
+            protein=150,
+        )
+        for offset in range(days)
+    ]
+
+
+def _body(response):
+    return b"".join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestDailyLogExport:
+    def test_csv_export_round_trips_through_import(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        _seed(user, 5)
+
+        response = client.get("/api/v1/logs/export/?format=csv")
+
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/csv")
+        assert response["Content-Disposition"].startswith(
+            'attachment; filename="fitness-logs-'
+        )
+        rows = list(csv.DictReader(io.StringIO(_body(response))))
+        assert [row["date"] for row in rows] == sorted(row["date"] for row in rows)
+        assert len(rows) == 5
+
+        other, other_client = create_onboarded_user()
+        upload = SimpleUploadedFile(
+            "export.csv", _body(client.get("/api/v1/logs/export/")).encode()
+        )
+        report = other_client.post(
+            "/api/v1/logs/import/", {"file": upload}, format="multipart"
+        )
+        assert report.json()["data"]["created"] == 5
+
+    def test_ndjson_with_foods_and_custom_metrics(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        logs = _seed(user, 3)
+        food = Food.objects.create(
+            name="Oats",
+            category="grain",
+            diet_type="vegan",
+            calories_per_100g=380,
+            protein_per_100g=Decimal("13.0"),
+            carbs_per_100g=Decimal("67.0"),
+            fats_per_100g=Decimal("7.0"),
+            fibre_per_100g=Decimal("10.0"),
+        )
+        FoodEntry.objects.create(
+            daily_log=logs[1],
+            food=food,
+            meal_type="breakfast",
+            quantity_grams=Decimal("80.0"),
+        )
+        mood = CustomMetricDefinition.objects.create(
+            user=user, name="mood", unit="1-10"
+        )
+        CustomMetricEntry.objects.create(
+            definition=mood, daily_log=logs[0], value=Decimal("7")
+        )
+
+        response = client.get(
+            "/api/v1/logs/export/?format=ndjson&include=foods,custom_metrics"
+        )
+
+        records = [json.loads(line) for line in _body(response).splitlines()]
+        assert [len(record["foods"]) for record in records] == [0, 1, 0]
+        assert records[1]["foods"][0]["food"] == "Oats"
+        assert records[2]["custom_metrics"] == {"mood": "7.00"}
+        assert records[0]["custom_metrics"] == {}
+
+    def test_date_range_and_validation(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        _seed(user, 10)
+        today = timezone.now().date()
+
+        response = client.get(
+            f"/api/v1/logs/export/?format=ndjson&from={today - timedelta(days=2)}&to={today}"
+        )
+        assert len(_body(response).splitlines()) == 3
+
+        assert client.get("/api/v1/logs/export/?format=xml").status_code == 400
+        assert client.get("/api/v1/logs/export/?include=weights").status_code == 400
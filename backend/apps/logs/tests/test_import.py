@@ -0,0 +1,202 @@
+import json
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.dashboard.models import DirtyMonth, UserStreakState, WeeklyMetrics
+from apps.logs.importers import import_daily_logs
+from apps.logs.models import DailyLog
+from apps.users.models import UserTarget
+
+
+def _csv(lines):
+    return SimpleUploadedFile(
+        "history.csv", "\n".join(lines).encode(), content_type="text/csv"
+    )
+
+
+@pytest.mark.django_db
+class TestDailyLogImport:
+    def test_csv_import_creates_logs_and_computes_flags(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        today = timezone.now().date()
+        lines = ["date,weight,calories,protein,workout,workout_type"]
+        for offset in range(1, 401):
+            day = today - timedelta(days=offset)
+            lines.append(f"{day},75.0,2000,{150 if offset % 2 else 50},true,cardio")
+
+        response = client.post(
+            "/api/v1/logs/import/", {"file": _csv(lines)}, format="multipart"
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["data"] == {"created": 400, "updated": 0, "rejected": []}
+        assert body["message"].startswith("Imported 400 logs")
+        assert DailyLog.objects.filter(user=user).count() == 400
+        assert DailyLog.objects.filter(user=user, protein_hit=True).count() == 200
+        assert DailyLog.objects.filter(user=user, calories_ok=True).count() == 400
+        # Derived state follows the bulk write.
+        assert UserStreakState.objects.get(user=user).workout_best == 400
+        assert WeeklyMetrics.objects.filter(user=user).exists()
+        assert DirtyMonth.objects.filter(user=user).exists()
+
+    def test_rejected_rows_are_reported_by_line(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        today = timezone.now().date()
+        old = today - timedelta(days=30)
+        DailyLog.objects.create(user=user, date=old, weight=Decimal("70.0"))
+        lines = [
+            "date,weight,calories,protein",
+            f"{today - timedelta(days=1)},75.0,2000,150",
+            f"{today + timedelta(days=1)},75.0,2000,150",
+            f"{today - timedelta(days=2)},,2000,150",
+            f"{today - timedelta(days=1)},76.0,2000,150",
+            f"{old},75.0,2000,150",
+            f"{today},75.0,2100,140",
+        ]
+
+        response = client.post(
+            "/api/v1/logs/import/", {"file": _csv(lines)}, format="multipart"
+        )
+
+        data = response.json()["data"]
+        assert data["created"] == 2
+        assert [item["line"] for item in data["rejected"]] == [3, 4, 5, 6]
+        assert "date" in data["rejected"][0]["errors"]
+        assert "weight" in data["rejected"][1]["errors"]
+        assert DailyLog.objects.get(user=user, date=old).weight == Decimal("70.0")
+
+    def test_ndjson_upserts_recent_logs(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        today = timezone.now().date()
+        DailyLog.objects.create(user=user, date=today, weight=Decimal("70.0"))
+        payload = "\n".join(
+            [
+                json.dumps(
+                    {
+                        "date": str(today),
+                        "weight": 71.5,
+                        "calories": 2000,
+                        "protein": 150,
+                    }
+                ),
+                "",
+                "not json",
+            ]
+        )
+        upload = SimpleUploadedFile(
+            "history.ndjson", payload.encode(), content_type="application/x-ndjson"
+        )
+
+        response = client.post(
+            "/api/v1/logs/import/", {"file": upload}, format="multipart"
+        )
+
+        data = response.json()["data"]
+        assert data["updated"] == 1
+        assert data["rejected"][0]["line"] == 3
+        log = DailyLog.objects.get(user=user, date=today)
+        assert log.weight == Decimal("71.5")
+        assert log.protein_hit is True
+
+    def test_omitted_columns_keep_stored_values(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        today = timezone.now().date()
+        DailyLog.objects.create(
+            user=user,
+            date=today,
+            weight=Decimal("70.0"),
+            calories=2000,
+            protein=150,
+            steps=9000,
+            water=Decimal("2.5"),
+            workout=True,
+            workout_type="strength",
+            protein_hit=True,
+            calories_ok=True,
+        )
+        yesterday = today - timedelta(days=1)
+        lines = ["date,weight,steps", f"{today},71.0,", f"{yesterday},72.0,4000"]
+
+        response = client.post(
+            "/api/v1/logs/import/", {"file": _csv(lines)}, format="multipart"
+        )
+
+        assert response.json()["data"]["updated"] == 1
+        log = DailyLog.objects.get(user=user, date=today)
+        assert log.weight == Decimal("71.0")
+        assert (log.steps, log.water, log.workout, log.workout_type) == (
+            9000,
+            Decimal("2.5"),
+            True,
+            "strength",
+        )
+        assert (log.protein_hit, log.calories_ok) == (True, True)
+        assert DailyLog.objects.get(user=user, date=yesterday).steps == 4000
+
+    def test_partial_rows_keep_workout_and_untargeted_flags(
+        self, create_onboarded_user
+    ):
+        user, client = create_onboarded_user()
+        UserTarget.objects.filter(user=user).delete()
+        today = timezone.now().date()
+        DailyLog.objects.create(
+            user=user,
+            date=today,
+            weight=Decimal("70.0"),
+            workout=True,
+            workout_type="cardio",
+            protein_hit=True,
+            calories_ok=True,
+        )
+        lines = ["date,weight,workout_type", f"{today},70.5,weight_training"]
+
+        response = client.post(
+            "/api/v1/logs/import/", {"file": _csv(lines)}, format="multipart"
+        )
+
+        assert response.json()["data"]["updated"] == 1
+        log = DailyLog.objects.get(user=user, date=today)
+        assert (log.workout, log.workout_type) == (True, "weight_training")
+        assert (log.protein_hit, log.calories_ok) == (True, True)
+
+    def test_one_target_read_and_one_lookup_per_chunk(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        today = timezone.now().date()
+        rows = [
+            (i + 2, {"date": str(today - timedelta(days=i + 1)), "weight": "75.0"})
+            for i in range(1200)
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            report = import_daily_logs(user, iter(rows), chunk_size=500)
+
+        statements = [query["sql"] for query in queries.captured_queries]
+        assert report["created"] == 1200
+        assert sum('FROM "user_targets"' in sql for sql in statements) == 1
+        assert (
+            sum(
+                sql.startswith(
+                    'SELECT "daily_logs"."id", "daily_logs"."date", "daily_logs"."calories"'
+                )
+                for sql in statements
+            )
+            == 3
+        )
+
+    def test_missing_date_column(self, create_onboarded_user):
+        _, client = create_onboarded_user()
+
+        response = client.post(
+            "/api/v1/logs/import/",
+            {"file": _csv(["weight", "75.0"])},
+            format="multipart",
+        )
+
+        assert response.status_code == 400
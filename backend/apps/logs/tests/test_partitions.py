@@ -0,0 +1,182 @@
+import importlib
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.apps import apps as global_apps
+from django.db import connection
+from django.utils import timezone
+
+from apps.core import partitions
+from apps.foods.models import Food, FoodEntry
+from apps.logs.models import DailyLog
+
+postgres_only = pytest.mark.skipif(
+    connection.vendor != "postgresql",
+    reason="Table partitioning needs PostgreSQL (pytest --ds=config.settings.test_postgres)",
+)
+
+
+def _migration(app, name):
+    return importlib.import_module(f"apps.{app}.migrations.{name}")
+
+
+def _constraints(table):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(%s) AND contype IN ('c', 'f', 'u', 'x') "
+            "ORDER BY conname",
+            [table],
+        )
+        return cursor.fetchall()
+
+
+class TestPartitionHelpers:
+    def test_month_arithmetic(self):
+        assert partitions.add_months(date(2024, 11, 1), 3) == date(2025, 2, 1)
+        assert partitions.add_months(date(2024, 1, 1), -1) == date(2023, 12, 1)
+        assert list(partitions.month_range(date(2024, 11, 20), date(2025, 1, 5))) == [
+            date(2024, 11, 1),
+            date(2024, 12, 1),
+            date(2025, 1, 1),
+        ]
+
+    def test_partition_names_round_trip(self):
+        name = partitions.partition_name("daily_logs", date(2024, 3, 1))
+
+        assert name == "daily_logs_p2024_03"
+        assert partitions.partition_month("daily_logs", name) == date(2024, 3, 1)
+        assert partitions.partition_month("daily_logs", "daily_logs_default") is None
+        assert partitions.partition_month("food_entries", name) is None
+
+
+@pytest.mark.django_db
+class TestFoodEntryDate:
+    def test_entry_date_follows_its_log(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        today = timezone.now().date()
+        log = DailyLog.objects.create(user=user, date=today, weight=Decimal("75.0"))
+        food = Food.objects.create(
+            name="Oats",
+            category="grain",
+            diet_type="vegetarian",
+            calories_per_100g=380,
+            protein_per_100g=Decimal("13"),
+            carbs_per_100g=Decimal("67"),
+            fats_per_100g=Decimal("7"),
+            fibre_per_100g=Decimal("10"),
+        )
+        entry = FoodEntry.objects.create(
+            daily_log=log,
+            food=food,
+            meal_type="breakfast",
+            quantity_grams=Decimal("50"),
+        )
+        assert entry.date == today
+
+        log.date = today - timedelta(days=1)
+        log.save()
+
+        entry.refresh_from_db()
+        assert entry.date == log.date
+
+
+@postgres_only
+@pytest.mark.django_db
+class TestPostgresPartitions:
+    def test_tables_are_partitioned(self):
+        for table in partitions.PARTITIONED_TABLES:
+            assert partitions.is_partitioned(connection, table)
+            names = partitions.list_partitions(connection, table)
+            assert f"{table}_default" in names
+            assert (
+                partitions.partition_name(table, timezone.now().date().replace(day=1))
+                in names
+            )
+
+    def test_orm_reads_and_writes_across_partitions(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        today = timezone.now().date()
+        for offset in (0, 45, 400):
+            DailyLog.objects.create(
+                user=user, date=today - timedelta(days=offset), weight=Decimal("75.0")
+            )
+        log = DailyLog.objects.get(user=user, date=today - timedelta(days=45))
+        log.date = today - timedelta(days=1)
+        log.save()
+
+        assert DailyLog.objects.filter(user=user).count() == 3
+        assert DailyLog.objects.filter(
+            pk=log.pk, date=today - timedelta(days=1)
+        ).exists()
+
+    def test_recent_window_prunes_to_one_partition(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        month = timezone.now().date().replace(day=1)
+        query = DailyLog.objects.filter(
+            user=user, date__gte=month, date__lte=month + timedelta(days=27)
+        )
+
+        plan = query.explain()
+
+        assert partitions.partition_name("daily_logs", month) in plan
+        assert "daily_logs_default" not in plan
+        assert (
+            partitions.partition_name("daily_logs", partitions.add_months(month, -1))
+            not in plan
+        )
+
+    def test_create_and_detach(self):
+        later = partitions.add_months(timezone.now().date().replace(day=1), 12)
+
+        created = partitions.create_partitions(connection, "daily_logs", later, later)
+        assert created == [partitions.partition_name("daily_logs", later)]
+        assert (
+            partitions.create_partitions(connection, "daily_logs", later, later) == []
+        )
+
+        detached = partitions.detach_partitions(
+            connection, "daily_logs", partitions.add_months(later, 1)
+        )
+        assert partitions.partition_name("daily_logs", later) in detached
+        assert partitions.partition_name(
+            "daily_logs", later
+        ) not in partitions.list_partitions(connection, "daily_logs")
+
+
+@postgres_only
+@pytest.mark.django_db
+class TestPartitionMigrations:
+    def test_migrations_round_trip_then_detach(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        today = timezone.now().date()
+        old = today - timedelta(days=400)
+        for day in (today, old):
+            DailyLog.objects.create(user=user, date=day, weight=Decimal("75.0"))
+        logs = _migration("logs", "0007_partition_daily_logs")
+        foods = _migration("foods", "0004_partition_food_entries")
+        before = {table: _constraints(table) for table in partitions.PARTITIONED_TABLES}
+
+        with connection.schema_editor() as editor:
+            foods.unpartition(global_apps, editor)
+            logs.unpartition(global_apps, editor)
+        for table in partitions.PARTITIONED_TABLES:
+            assert not partitions.is_partitioned(connection, table)
+        with connection.schema_editor() as editor:
+            logs.partition(global_apps, editor)
+            foods.partition(global_apps, editor)
+
+        for table in partitions.PARTITIONED_TABLES:
+            assert partitions.is_partitioned(connection, table)
+            assert _constraints(table) == before[table]
+        assert DailyLog.objects.filter(user=user).count() == 2
+
+        old_month = partitions.month_start(old)
+        detached = partitions.detach_partitions(
+            connection, "daily_logs", partitions.add_months(old_month, 1)
+        )
+        assert detached == [partitions.partition_name("daily_logs", old_month)]
+        assert list(
+            DailyLog.objects.filter(user=user).values_list("date", flat=True)
+        ) == [today]
@@ -0,0 +1,91 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+
+from apps.logs.models import DailyLog
+from apps.logs.prefill import build_prefill
+
+
+def _log(user, offset, **fields):
+    return DailyLog.objects.create(
+        user=user,
+        date=timezone.now().date() - timedelta(days=offset),
+        weight=fields.pop("weight", Decimal("75.0")),
+        **fields,
+    )
+
+
+@pytest.mark.django_db
+class TestPrefill:
+    def test_draft_from_recent_logs(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        _log(user, 3, steps=4000, water=Decimal("2.0"), sleep=Decimal("6.0"))
+        _log(
+            user,
+            2,
+            steps=9000,
+            water=Decimal("3.0"),
+            sleep=Decimal("8.0"),
+            workout=True,
+            workout_type="cardio",
+        )
+        _log(
+            user,
+            1,
+            weight=Decimal("74.2"),
+            steps=6000,
+            water=Decimal("2.5"),
+            sleep=Decimal("7.0"),
+            workout=True,
+            workout_type="weight_training",
+        )
+
+        response = client.get("/api/v1/logs/prefill/")
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["source_date"] == str(timezone.now().date() - timedelta(days=1))
+        assert data["weight"] == "74.2"
+        assert (data["steps"], data["water"], data["sleep"]) == (6000, "2.5", "7.0")
+        assert data["workout_type"] == "weight_training"
+        assert data["recent_workout_types"] == ["weight_training", "cardio"]
+
+    def test_common_case_reads_nothing(
+        self, create_onboarded_user, django_assert_num_queries
+    ):
+        user, _ = create_onboarded_user()
+        _log(user, 1, steps=5000)
+        today = timezone.now().date()
+
+        with django_assert_num_queries(0):
+            draft = build_prefill(user.pk, today)
+
+        assert draft["steps"] == 5000
+
+    def test_cache_follows_writes(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        today = timezone.now().date()
+        log = _log(user, 1, steps=5000)
+        assert build_prefill(user.pk, today)["steps"] == 5000
+
+        log.steps = 7000
+        log.save()
+        assert build_prefill(user.pk, today)["steps"] == 7000
+
+        log.delete()
+        assert build_prefill(user.pk, today)["source_date"] is None
+
+    def test_dates_older_than_the_cache_query_the_window(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        for offset in range(40):
+            _log(user, offset, steps=1000 * offset)
+
+        response = client.get(
+            f"/api/v1/logs/prefill/?date={timezone.now().date() - timedelta(days=35)}"
+        )
+
+        data = response.json()["data"]
+        assert data["source_date"] == str(timezone.now().date() - timedelta(days=36))
+        assert data["steps"] == 37500
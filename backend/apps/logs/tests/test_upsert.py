@@ -0,0 +1,155 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.dashboard.models import UserStreakState
+from apps.logs.models import DailyLog
+from apps.logs.services import compute_daily_evaluations, upsert_daily_log
+from apps.users.models import UserTarget
+
+
+@pytest.mark.django_db
+class TestUpsertDailyLog:
+    def test_insert_then_update_in_single_statements(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        today = timezone.now().date()
+
+        with CaptureQueriesContext(connection) as queries:
+            log, created = upsert_daily_log(
+                user,
+                {
+                    "date": today,
+                    "weight": Decimal("75.0"),
+                    "calories": 2150,
+                    "protein": 160,
+                    "steps": 9000,
+                },
+            )
+        assert created is True
+        assert queries.captured_queries[0]["sql"].startswith('INSERT INTO "daily_logs"')
+        assert log.protein_hit is True
+        assert log.calories_ok is True
+
+        updated, created = upsert_daily_log(
+            user, {"date": today, "weight": Decimal("74.5"), "calories": 2500}
+        )
+
+        assert created is False
+        assert updated.pk == log.pk
+        assert updated.created_at == log.created_at
+        stored = DailyLog.objects.get(pk=log.pk)
+        assert stored.weight == Decimal("74.5")
+        assert stored.steps == 9000
+        assert stored.protein == 160
+        assert stored.protein_hit is True
+        assert stored.calories_ok is False
+
+    def test_flags_match_python_rules_at_the_band_edges(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        target = UserTarget.objects.get(user=user)
+        start = timezone.now().date() - timedelta(days=20)
+
+        for offset, calories in enumerate([1799, 1800, 2000, 2200, 2201]):
+            log, _ = upsert_daily_log(
+                user,
+                {
+                    "date": start + timedelta(days=offset),
+                    "weight": Decimal("75.0"),
+                    "calories": calories,
+                    "protein": 149 + offset % 2,
+                },
+            )
+            assert (log.protein_hit, log.calories_ok) == compute_daily_evaluations(
+                {"protein": log.protein, "calories": calories}, target
+            )
+
+    def test_without_targets_flags_default_false(self, create_user):
+        user = create_user()
+
+        log, _ = upsert_daily_log(
+            user,
+            {"date": timezone.now().date(), "weight": Decimal("75.0"), "protein": 500},
+        )
+
+        assert log.protein_hit is False
+
+    def test_post_save_hooks_run(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+
+        response = client.post(
+            "/api/v1/logs/",
+            {
+                "date": str(timezone.now().date()),
+                "weight": 75.0,
+                "protein": 200,
+                "calories": 2000,
+                "workout": True,
+                "workout_type": "cardio",
+            },
+            format="json",
+        )
+        again = client.post(
+            "/api/v1/logs/",
+            {"date": str(timezone.now().date()), "weight": 76.0},
+            format="json",
+        )
+
+        assert response.status_code == 201
+        assert again.status_code == 200
+        assert again.json()["data"]["weight"] == "76.0"
+        assert again.json()["data"]["workout"] is True
+        state = UserStreakState.objects.get(user=user)
+        assert state.workout_current == 1
+        assert state.protein_current == 1
+
+    def test_update_with_its_receivers_costs_ten_queries(
+        self, create_onboarded_user, django_assert_num_queries
+    ):
+        user, _ = create_onboarded_user()
+        today = timezone.now().date()
+        upsert_daily_log(user, {"date": today, "weight": Decimal("75.0")})
+
+        # The upsert, then prefill (1), streaks (2), dirty month (1), weekly
+        # rollup (2) and the sync journal (3); no savepoints in between.
+        with django_assert_num_queries(10):
+            upsert_daily_log(
+                user, {"date": today, "weight": Decimal("74.0"), "protein": 160}
+            )
+
+    def test_workout_type_alone_keeps_the_stored_workout(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        today = str(timezone.now().date())
+        client.post(
+            "/api/v1/logs/",
+            {"date": today, "weight": 75.0, "workout": True, "workout_type": "cardio"},
+            format="json",
+        )
+
+        response = client.post(
+            "/api/v1/logs/",
+            {"date": today, "weight": 75.0, "workout_type": "weight_training"},
+            format="json",
+        )
+
+        assert response.status_code == 200
+        stored = DailyLog.objects.get(user=user, date=today)
+        assert stored.workout is True
+        assert stored.workout_type == "weight_training"
+
+    def test_workout_type_is_dropped_when_the_stored_day_has_no_workout(
+        self, create_onboarded_user
+    ):
+        user, _ = create_onboarded_user()
+        today = timezone.now().date()
+        upsert_daily_log(user, {"date": today, "weight": Decimal("75.0")})
+
+        log, _ = upsert_daily_log(
+            user, {"date": today, "weight": Decimal("75.0"), "workout_type": "cardio"}
+        )
+
+        assert log.workout is False
+        assert log.workout_type is None
@@ -6,9 +6,15 @@ app_name = "logs"
 
 urlpatterns = [
     path("logs/", views.DailyLogListCreateView.as_view(), name="log-list-create"),
+    path("logs/export/", views.DailyLogExportView.as_view(), name="log-export"),
+    path("logs/import/", views.DailyLogImportView.as_view(), name="log-import"),
+    path("logs/prefill/", views.DailyLogPrefillView.as_view(), name="log-prefill"),
     path("logs/today/", views.DailyLogTodayView.as_view(), name="log-today"),
     path("logs/custom-metrics/", custom_views.CustomMetricDefinitionListCreateView.as_view(), name="custom-metric-list-create"),
     path("logs/custom-metrics/<uuid:pk>/", custom_views.CustomMetricDefinitionDeleteView.as_view(), name="custom-metric-delete"),
+    path("logs/custom-metrics/<uuid:pk>/series/", custom_views.CustomMetricSeriesView.as_view(), name="custom-metric-series"),
+    path("logs/custom-metrics/<uuid:pk>/stats/", custom_views.CustomMetricStatsView.as_view(), name="custom-metric-stats"),
+    path("logs/<str:date>/custom-entries/batch/", custom_views.CustomMetricEntryBatchView.as_view(), name="custom-entry-batch"),
     path("logs/<str:date>/custom-entries/", custom_views.CustomMetricEntryListCreateView.as_view(), name="custom-entry-list-create"),
     path("logs/<str:date>/", views.DailyLogDetailView.as_view(), name="log-detail"),
 ]
@@ -1,18 +1,38 @@
+import csv
+
+from django.http import StreamingHttpResponse
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from rest_framework import generics, status
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from apps.core.mixins import OwnerQuerySetMixin
+from apps.core.negotiation import FirstRendererNegotiation
+from apps.core.pagination import DateCursorPagination
+from apps.core.params import parse_date_param
 from apps.core.permissions import IsEmailVerified, IsOnboarded
 from apps.core.throttling import ReadRateThrottle, WriteRateThrottle
-
+from apps.dashboard.cache import UserDataConditionalMixin
+
+from .exporters import iter_csv, iter_export_records, iter_ndjson
+from .importers import (
+    ImportFormatError,
+    import_daily_logs,
+    iter_csv_rows,
+    iter_ndjson_rows,
+)
 from .models import DailyLog
+from .prefill import build_prefill
 from .serializers import DailyLogSerializer
+from .services import upsert_daily_log
 
 
-class DailyLogListCreateView(OwnerQuerySetMixin, generics.ListCreateAPIView):
+class DailyLogListCreateView(
+    UserDataConditionalMixin, OwnerQuerySetMixin, generics.ListCreateAPIView
+):
     """List paginated daily logs or create a new one.
 
     POST behaves as upsert: if a log already exists for the given date,
@@ -20,6 +40,7 @@ class DailyLogListCreateView(OwnerQuerySetMixin, generics.ListCreateAPIView):
     """
 
     serializer_class = DailyLogSerializer
+    pagination_class = DateCursorPagination
     permission_classes = [IsAuthenticated, IsEmailVerified, IsOnboarded]
     queryset = DailyLog.objects.all()
     filterset_fields = {"date": ["gte", "lte", "exact"]}
@@ -30,18 +51,25 @@ class DailyLogListCreateView(OwnerQuerySetMixin, generics.ListCreateAPIView):
         return [WriteRateThrottle()]
 
     def create(self, request, *args, **kwargs):
-        date = request.data.get("date")
-        if date:
-            existing = self.get_queryset().filter(date=date).first()
-            if existing:
-                serializer = self.get_serializer(existing, data=request.data)
-                serializer.is_valid(raise_exception=True)
-                serializer.save()
-                return Response(serializer.data, status=status.HTTP_200_OK)
-        return super().create(request, *args, **kwargs)
-
-
-class DailyLogDetailView(OwnerQuerySetMixin, generics.RetrieveUpdateDestroyAPIView):
+        # Validate against the stored log, if any, so omitted fields such as
+        # ``workout`` are read from it rather than from the model defaults.
+        try:
+            day = parse_date(str(request.data.get("date") or ""))
+        except ValueError:
+            day = None
+        existing = self.get_queryset().filter(date=day).first() if day else None
+        serializer = self.get_serializer(existing, data=request.data)
+        serializer.is_valid(raise_exception=True)
+        log, created = upsert_daily_log(request.user, serializer.validated_data)
+        return Response(
+            self.get_serializer(log).data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+
+class DailyLogDetailView(
+    UserDataConditionalMixin, OwnerQuerySetMixin, generics.RetrieveUpdateDestroyAPIView
+):
     """Get, update, or delete a daily log by date."""
 
     serializer_class = DailyLogSerializer
@@ -74,7 +102,9 @@ class DailyLogDetailView(OwnerQuerySetMixin, generics.RetrieveUpdateDestroyAPIVi
         return super().destroy(request, *args, **kwargs)
 
 
-class DailyLogTodayView(OwnerQuerySetMixin, generics.RetrieveAPIView):
+class DailyLogTodayView(
+    UserDataConditionalMixin, OwnerQuerySetMixin, generics.RetrieveAPIView
+):
     """Shortcut to get today's log."""
 
     serializer_class = DailyLogSerializer
@@ -98,3 +128,110 @@ class DailyLogTodayView(OwnerQuerySetMixin, generics.RetrieveAPIView):
             )
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
+
+
+class DailyLogPrefillView(generics.GenericAPIView):
+    """Draft log for ?date= (default today) built from the user's recent logs."""
+
+    permission_classes = [IsAuthenticated, IsEmailVerified, IsOnboarded]
+    throttle_classes = [ReadRateThrottle]
+    swagger_schema = None
+
+    def get(self, request):
+        day = parse_date_param(request.query_params.get("date"), "date")
+        return Response(build_prefill(request.user.pk, day or timezone.now().date()))
+
+
+class DailyLogImportView(generics.GenericAPIView):
+    """Import daily log history from a CSV or NDJSON upload (multipart ``file``).
+
+    Valid rows are upserted by date; the response reports every rejected row
+    by line number.
+    """
+
+    permission_classes = [IsAuthenticated, IsEmailVerified, IsOnboarded]
+    throttle_classes = [WriteRateThrottle]
+    parser_classes = [MultiPartParser]
+    swagger_schema = None
+
+    CSV_TYPES = ("text/csv", "application/csv")
+    NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": "Upload a CSV or NDJSON file."})
+        name = upload.name.lower()
+        if name.endswith(".csv") or upload.content_type in self.CSV_TYPES:
+            rows = iter_csv_rows(upload.file)
+        elif (
+            name.endswith((".ndjson", ".jsonl"))
+            or upload.content_type in self.NDJSON_TYPES
+        ):
+            rows = iter_ndjson_rows(upload.file)
+        else:
+            raise ValidationError(
+                {"file": "Unsupported file type; use .csv or .ndjson."}
+            )
+
+        try:
+            report = import_daily_logs(request.user, rows)
+        except (ImportFormatError, UnicodeDecodeError, csv.Error) as exc:
+            raise ValidationError({"file": str(exc)})
+
+        imported = report["created"] + report["updated"]
+        report["message"] = (
+            f"Imported {imported} logs; {len(report['rejected'])} rows rejected."
+        )
+        return Response(report)
+
+
+class DailyLogExportView(generics.GenericAPIView):
+    """Stream the user's log history as ?format=csv|ndjson, optionally ?from=&to=.
+
+    ``?include=foods,custom_metrics`` adds meal entries and custom metric
+    values. The body is streamed as a download and bypasses the JSON envelope.
+    """
+
+    permission_classes = [IsAuthenticated, IsEmailVerified, IsOnboarded]
+    throttle_classes = [ReadRateThrottle]
+    content_negotiation_class = FirstRendererNegotiation
+    swagger_schema = None
+
+    FORMATS = {
+        "csv": "text/csv; charset=utf-8",
+        "ndjson": "application/x-ndjson",
+    }
+    INCLUDES = {"foods", "custom_metrics"}
+
+    def get(self, request):
+        params = request.query_params
+        export_format = params.get("format", "csv")
+        if export_format not in self.FORMATS:
+            raise ValidationError({"format": "Use 'csv' or 'ndjson'."})
+        start = parse_date_param(params.get("from"), "from")
+        end = parse_date_param(params.get("to"), "to")
+        if start and end and start > end:
+            raise ValidationError({"from": "Must not be after 'to'."})
+        include = {item for item in params.get("include", "").split(",") if item}
+        if include - self.INCLUDES:
+            raise ValidationError(
+                {"include": f"Allowed values: {', '.join(sorted(self.INCLUDES))}."}
+            )
+
+        options = {
+            "include_foods": "foods" in include,
+            "include_custom": "custom_metrics" in include,
+        }
+        records = iter_export_records(request.user, start, end, **options)
+        if export_format == "csv":
+            body = iter_csv(records, request.user, **options)
+        else:
+            body = iter_ndjson(records)
+
+        filename = "fitness-logs-{}-{}.{}".format(
+            start or "start", end or timezone.now().date(), export_format
+        )
+        response = StreamingHttpResponse(body, content_type=self.FORMATS[export_format])
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
@@ -3,6 +3,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from apps.core.mixins import OwnerQuerySetMixin
+from apps.core.pagination import DateCursorPagination
 from apps.core.permissions import IsEmailVerified, IsOnboarded
 from apps.core.throttling import ReadRateThrottle, WriteRateThrottle
 
@@ -15,6 +16,7 @@ class MeasurementListCreateView(OwnerQuerySetMixin, generics.ListCreateAPIView):
     """List measurements or create a new one (immutable — no update)."""
 
     serializer_class = BodyMeasurementSerializer
+    pagination_class = DateCursorPagination
     permission_classes = [IsAuthenticated, IsEmailVerified, IsOnboarded]
     queryset = BodyMeasurement.objects.all()
 
@@ -0,0 +1,89 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:42
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("users", "0002_usertarget_carbs_target_usertarget_fats_target_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SyncCounter",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="sync_counter",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("seq", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "db_table": "sync_counters",
+            },
+        ),
+        migrations.CreateModel(
+            name="SyncChange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("daily_log", "Daily Log"),
+                            ("food_entry", "Food Entry"),
+                            ("custom_metric_entry", "Custom Metric Entry"),
+                            ("measurement", "Body Measurement"),
+                            ("target", "User Target"),
+                        ],
+                        max_length=30,
+                    ),
+                ),
+                ("object_id", models.UUIDField()),
+                ("seq", models.BigIntegerField()),
+                ("deleted", models.BooleanField(default=False)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sync_changes",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "sync_changes",
+                "indexes": [
+                    models.Index(
+                        fields=["user", "seq"], name="idx_sync_changes_user_seq"
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="syncchange",
+            constraint=models.UniqueConstraint(
+                fields=("user", "kind", "object_id"), name="uniq_sync_change_object"
+            ),
+        ),
+    ]
@@ -0,0 +1,54 @@
+from django.db import migrations
+
+# (app label, model, kind, path to the owning user's id)
+SYNCED = (
+    ("users", "UserTarget", "target", "user_id"),
+    ("logs", "DailyLog", "daily_log", "user_id"),
+    ("foods", "FoodEntry", "food_entry", "daily_log__user_id"),
+    ("logs", "CustomMetricEntry", "custom_metric_entry", "definition__user_id"),
+    ("measurements", "BodyMeasurement", "measurement", "user_id"),
+)
+BATCH_SIZE = 1000
+
+
+def backfill(apps, schema_editor):
+    """Journal every existing object so a first sync from 0 returns them all."""
+    SyncChange = apps.get_model("sync", "SyncChange")
+    SyncCounter = apps.get_model("sync", "SyncCounter")
+    counters = {}
+    batch = []
+    for app_label, model_name, kind, user_path in SYNCED:
+        model = apps.get_model(app_label, model_name)
+        rows = model.objects.order_by().values_list(user_path, "pk")
+        for user_id, object_id in rows.iterator(chunk_size=BATCH_SIZE):
+            counters[user_id] = counters.get(user_id, 0) + 1
+            batch.append(
+                SyncChange(
+                    user_id=user_id,
+                    kind=kind,
+                    object_id=object_id,
+                    seq=counters[user_id],
+                )
+            )
+            if len(batch) >= BATCH_SIZE:
+                SyncChange.objects.bulk_create(batch)
+                batch = []
+    SyncChange.objects.bulk_create(batch)
+    SyncCounter.objects.bulk_create(
+        [SyncCounter(user_id=user_id, seq=seq) for user_id, seq in counters.items()],
+        batch_size=BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sync", "0001_initial"),
+        ("foods", "0001_initial"),
+        ("logs", "0006_custommetricstats"),
+        ("measurements", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
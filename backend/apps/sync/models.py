@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.db import models
+
+
+class SyncCounter(models.Model):
+    """A user's change counter; the highest sequence number handed out."""
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="sync_counter",
+    )
+    seq = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = "sync_counters"
+
+    def __str__(self):
+        return f"{self.user_id} @ {self.seq}"
+
+
+class SyncChange(models.Model):
+    """The latest change to one synced object; deletes leave a tombstone."""
+
+    class KindChoices(models.TextChoices):
+        DAILY_LOG = "daily_log", "Daily Log"
+        FOOD_ENTRY = "food_entry", "Food Entry"
+        CUSTOM_METRIC_ENTRY = "custom_metric_entry", "Custom Metric Entry"
+        MEASUREMENT = "measurement", "Body Measurement"
+        TARGET = "target", "User Target"
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="sync_changes",
+    )
+    kind = models.CharField(max_length=30, choices=KindChoices.choices)
+    object_id = models.UUIDField()
+    seq = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+
+    class Meta:
+        db_table = "sync_changes"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "kind", "object_id"], name="uniq_sync_change_object"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["user", "seq"], name="idx_sync_changes_user_seq"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} #{self.seq} {self.kind} {self.object_id}"
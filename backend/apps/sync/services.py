@@ -0,0 +1,140 @@
+"""Change journal behind the delta sync endpoint.
+
+Every write to a synced model is recorded as a ``SyncChange`` row keyed by
+``(user, kind, object_id)`` and stamped with the next value of the user's
+``SyncCounter``. The row is overwritten on each change, so the journal is
+bounded by the number of objects and a sync after watermark ``N`` reads
+only rows with ``seq > N``. The counter row is locked until the recording
+transaction commits, so sequence numbers become visible in order and a
+client never skips past a change that commits late.
+"""
+
+from django.conf import settings
+from django.db import transaction
+
+from apps.foods.models import FoodEntry
+from apps.foods.serializers import FoodEntrySerializer
+from apps.logs.custom_serializers import CustomMetricEntrySerializer
+from apps.logs.models import CustomMetricEntry, DailyLog
+from apps.logs.serializers import DailyLogSerializer
+from apps.measurements.models import BodyMeasurement
+from apps.measurements.serializers import BodyMeasurementSerializer
+from apps.users.models import UserTarget
+from apps.users.serializers import UserTargetSerializer
+
+from .models import SyncChange, SyncCounter
+
+Kind = SyncChange.KindChoices
+
+# kind -> (response key, user-scoped queryset factory, serializer, extra fields)
+SYNCED = {
+    Kind.DAILY_LOG: (
+        "daily_logs",
+        lambda user: DailyLog.objects.filter(user=user),
+        DailyLogSerializer,
+        {},
+    ),
+    Kind.FOOD_ENTRY: (
+        "food_entries",
+        lambda user: FoodEntry.objects.filter(daily_log__user=user).select_related(
+            "food", "daily_log"
+        ),
+        FoodEntrySerializer,
+        {"date": lambda entry: entry.daily_log.date},
+    ),
+    Kind.CUSTOM_METRIC_ENTRY: (
+        "custom_metric_entries",
+        lambda user: CustomMetricEntry.objects.filter(
+            definition__user=user
+        ).select_related("definition"),
+        CustomMetricEntrySerializer,
+        {"date": lambda entry: entry.date},
+    ),
+    Kind.MEASUREMENT: (
+        "measurements",
+        lambda user: BodyMeasurement.objects.filter(user=user),
+        BodyMeasurementSerializer,
+        {},
+    ),
+    Kind.TARGET: (
+        "targets",
+        lambda user: UserTarget.objects.filter(user=user),
+        UserTargetSerializer,
+        {},
+    ),
+}
+
+
+def record_changes(user_id, changes):
+    """Stamp ``[(kind, object_id, deleted), ...]`` with the user's next sequence numbers."""
+    latest = {}
+    for kind, object_id, deleted in changes:
+        latest.pop((kind, object_id), None)
+        latest[(kind, object_id)] = deleted
+    if not latest:
+        return
+    # Called from write signals; share their transaction rather than nest one.
+    with transaction.atomic(savepoint=False):
+        counter, _ = SyncCounter.objects.select_for_update().get_or_create(
+            user_id=user_id
+        )
+        start = counter.seq
+        counter.seq += len(latest)
+        counter.save(update_fields=["seq"])
+        SyncChange.objects.bulk_create(
+            [
+                SyncChange(
+                    user_id=user_id,
+                    kind=kind,
+                    object_id=object_id,
+                    seq=start + offset,
+                    deleted=deleted,
+                )
+                for offset, ((kind, object_id), deleted) in enumerate(latest.items(), 1)
+            ],
+            update_conflicts=True,
+            unique_fields=["user", "kind", "object_id"],
+            update_fields=["seq", "deleted"],
+        )
+
+
+def changes_since(user, since=0, limit=None):
+    """Return the sync payload for changes after watermark ``since``.
+
+    At most ``limit`` changes are returned, oldest first; ``has_more`` tells
+    the client to call again with the returned watermark.
+    """
+    limit = limit or settings.SYNC_PAGE_SIZE
+    rows = list(
+        SyncChange.objects.filter(user=user, seq__gt=since)
+        .order_by("seq")
+        .values_list("kind", "object_id", "seq", "deleted")[: limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    changed = {kind: [] for kind in SYNCED}
+    deleted = {key: [] for key, *_ in SYNCED.values()}
+    for kind, object_id, _, is_deleted in rows:
+        if is_deleted:
+            deleted[SYNCED[kind][0]].append(object_id)
+        else:
+            changed[kind].append(object_id)
+
+    payload = {}
+    for kind, (key, queryset, serializer_class, extra) in SYNCED.items():
+        objects = queryset(user).filter(pk__in=changed[kind]) if changed[kind] else []
+        items = []
+        for obj in objects:
+            data = serializer_class(obj).data
+            for field, value in extra.items():
+                data[field] = value(obj)
+            items.append(data)
+        payload[key] = items
+
+    return {
+        "watermark": rows[-1][2] if rows else since,
+        "has_more": has_more,
+        "changes": payload,
+        "deleted": deleted,
+    }
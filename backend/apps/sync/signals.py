@@ -0,0 +1,102 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.foods.models import FoodEntry
+from apps.foods.signals import food_entries_bulk_changed
+from apps.logs.models import CustomMetricDefinition, CustomMetricEntry, DailyLog
+from apps.logs.signals import custom_entries_bulk_changed, daily_logs_bulk_changed
+from apps.measurements.models import BodyMeasurement
+from apps.users.models import User, UserTarget
+
+from .models import SyncChange
+from .services import record_changes
+
+Kind = SyncChange.KindChoices
+
+_USER_OWNED = {
+    DailyLog: Kind.DAILY_LOG,
+    BodyMeasurement: Kind.MEASUREMENT,
+    UserTarget: Kind.TARGET,
+}
+
+
+def _owner_id(instance, origin=None):
+    if isinstance(instance, FoodEntry):
+        if isinstance(origin, DailyLog):
+            return origin.user_id
+        if FoodEntry.daily_log.is_cached(instance):
+            return instance.daily_log.user_id
+        return (
+            DailyLog.objects.filter(pk=instance.daily_log_id)
+            .values_list("user_id", flat=True)
+            .first()
+        )
+    if isinstance(instance, CustomMetricEntry):
+        if isinstance(origin, (DailyLog, CustomMetricDefinition)):
+            return origin.user_id
+        if CustomMetricEntry.definition.is_cached(instance):
+            return instance.definition.user_id
+        return (
+            CustomMetricDefinition.objects.filter(pk=instance.definition_id)
+            .values_list("user_id", flat=True)
+            .first()
+        )
+    return instance.user_id
+
+
+def _kind(sender):
+    if sender is FoodEntry:
+        return Kind.FOOD_ENTRY
+    if sender is CustomMetricEntry:
+        return Kind.CUSTOM_METRIC_ENTRY
+    return _USER_OWNED[sender]
+
+
+@receiver(post_save, sender=DailyLog)
+@receiver(post_save, sender=FoodEntry)
+@receiver(post_save, sender=CustomMetricEntry)
+@receiver(post_save, sender=BodyMeasurement)
+@receiver(post_save, sender=UserTarget)
+def record_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    record_changes(_owner_id(instance), [(_kind(sender), instance.pk, False)])
+
+
+@receiver(post_delete, sender=DailyLog)
+@receiver(post_delete, sender=FoodEntry)
+@receiver(post_delete, sender=CustomMetricEntry)
+@receiver(post_delete, sender=BodyMeasurement)
+@receiver(post_delete, sender=UserTarget)
+def record_delete(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, User):
+        return
+    user_id = _owner_id(instance, origin)
+    if user_id is not None:
+        record_changes(user_id, [(_kind(sender), instance.pk, True)])
+
+
+@receiver(daily_logs_bulk_changed, sender=DailyLog)
+def record_bulk_logs(sender, user_id, dates, **kwargs):
+    ids = DailyLog.objects.filter(user_id=user_id, date__in=dates).values_list(
+        "pk", flat=True
+    )
+    record_changes(user_id, [(Kind.DAILY_LOG, pk, False) for pk in ids])
+
+
+@receiver(custom_entries_bulk_changed, sender=CustomMetricEntry)
+def record_bulk_custom_entries(sender, user_id, daily_log_id, changes, **kwargs):
+    ids = CustomMetricEntry.objects.filter(
+        daily_log_id=daily_log_id,
+        definition_id__in=[definition_id for definition_id, _, _ in changes],
+    ).values_list("pk", flat=True)
+    record_changes(user_id, [(Kind.CUSTOM_METRIC_ENTRY, pk, False) for pk in ids])
+
+
+@receiver(food_entries_bulk_changed, sender=FoodEntry)
+def record_bulk_food_entries(sender, user_id, saved, deleted, **kwargs):
+    record_changes(
+        user_id,
+        [(Kind.FOOD_ENTRY, pk, False) for pk in saved]
+        + [(Kind.FOOD_ENTRY, pk, True) for pk in deleted],
+    )
@@ -0,0 +1,96 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from apps.logs.models import DailyLog
+from apps.measurements.models import BodyMeasurement
+from apps.sync.models import SyncChange
+from apps.sync.services import changes_since
+
+
+def _log(user, offset=0):
+    return DailyLog.objects.create(
+        user=user,
+        date=timezone.now().date() - timedelta(days=offset),
+        weight=Decimal("75.0"),
+    )
+
+
+@pytest.mark.django_db
+class TestSync:
+    def test_full_then_delta_sync(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        first = _log(user, 1)
+
+        full = client.get("/api/v1/sync/").json()["data"]
+        assert [log["id"] for log in full["changes"]["daily_logs"]] == [str(first.pk)]
+        assert len(full["changes"]["targets"]) == 1
+
+        second = _log(user, 0)
+        measurement = BodyMeasurement.objects.create(user=user, date=second.date)
+        delta = client.get(f"/api/v1/sync/?since={full['watermark']}").json()["data"]
+
+        assert [log["id"] for log in delta["changes"]["daily_logs"]] == [str(second.pk)]
+        assert [m["id"] for m in delta["changes"]["measurements"]] == [
+            str(measurement.pk)
+        ]
+        assert delta["changes"]["targets"] == []
+        assert delta["watermark"] > full["watermark"]
+
+        idle = client.get(f"/api/v1/sync/?since={delta['watermark']}").json()["data"]
+        assert idle["watermark"] == delta["watermark"]
+        assert all(not items for items in idle["changes"].values())
+
+    def test_deletes_leave_tombstones(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        log = _log(user)
+        watermark = client.get("/api/v1/sync/").json()["data"]["watermark"]
+
+        response = client.delete(f"/api/v1/logs/{log.date}/")
+        assert response.status_code in (200, 204)
+
+        delta = client.get(f"/api/v1/sync/?since={watermark}").json()["data"]
+        assert delta["deleted"]["daily_logs"] == [str(log.pk)]
+        assert delta["changes"]["daily_logs"] == []
+
+    def test_journal_keeps_one_row_per_object(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        log = _log(user)
+        for steps in range(5):
+            log.steps = steps
+            log.save()
+
+        assert SyncChange.objects.filter(user=user, kind="daily_log").count() == 1
+
+    @override_settings(SYNC_PAGE_SIZE=2)
+    def test_pages_through_large_change_sets(self, create_onboarded_user):
+        user, _ = create_onboarded_user()
+        logs = {str(_log(user, offset).pk) for offset in range(3)}
+
+        seen, since, pages = set(), 0, 0
+        while True:
+            page = changes_since(user, since)
+            seen.update(log["id"] for log in page["changes"]["daily_logs"])
+            since, pages = page["watermark"], pages + 1
+            if not page["has_more"]:
+                break
+
+        assert logs <= seen
+        assert pages == 2
+
+    def test_rejects_bad_watermark(self, create_onboarded_user):
+        _, client = create_onboarded_user()
+
+        assert client.get("/api/v1/sync/?since=-1").status_code == 400
+
+    def test_other_users_changes_are_invisible(self, create_onboarded_user):
+        user, client = create_onboarded_user()
+        other, _ = create_onboarded_user()
+        _log(other)
+
+        data = client.get("/api/v1/sync/").json()["data"]
+
+        assert data["changes"]["daily_logs"] == []
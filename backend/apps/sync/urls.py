@@ -0,0 +1,9 @@
+from django.urls import path
+
+from . import views
+
+app_name = "sync"
+
+urlpatterns = [
+    path("sync/", views.SyncView.as_view(), name="sync"),
+]
@@ -0,0 +1,23 @@
+from rest_framework import generics
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from apps.core.permissions import IsEmailVerified, IsOnboarded
+from apps.core.throttling import ReadRateThrottle
+
+from .services import changes_since
+
+
+class SyncView(generics.GenericAPIView):
+    """Changes and tombstones after ?since=<watermark> (0 for a full sync)."""
+
+    permission_classes = [IsAuthenticated, IsEmailVerified, IsOnboarded]
+    throttle_classes = [ReadRateThrottle]
+    swagger_schema = None
+
+    def get(self, request):
+        since = request.query_params.get("since", "0")
+        if not since.isdigit():
+            raise ValidationError({"since": "Must be a non-negative integer."})
+        return Response(changes_since(request.user, int(since)))
@@ -151,3 +151,10 @@ class UserTarget(models.Model):
 
     def __str__(self):
         return f"Targets for {self.user.email}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Keep the loaded values so signal handlers can see what changed.
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
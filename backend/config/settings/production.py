@@ -1,3 +1,5 @@
+from django.core.exceptions import ImproperlyConfigured
+
 from .base import *  # noqa: F401, F403
 
 DEBUG = False
@@ -15,5 +17,17 @@ SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
 X_FRAME_OPTIONS = "DENY"
 
+# Data versions, prefill drafts and custom-food invalidations live in these
+# aliases; a per-process cache would hide them from the other workers.
+for _alias in (
+    DASHBOARD_CACHE_ALIAS,  # noqa: F405
+    LOGS_PREFILL_CACHE_ALIAS,  # noqa: F405
+    FOOD_CATALOG_CACHE_ALIAS,  # noqa: F405
+):
+    if CACHES[_alias]["BACKEND"].endswith("LocMemCache"):  # noqa: F405
+        raise ImproperlyConfigured(
+            f"The {_alias!r} cache must be shared across processes in production; set REDIS_URL."
+        )
+
 MIDDLEWARE.insert(1, "whitenoise.middleware.WhiteNoiseMiddleware")  # noqa: F405
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
@@ -30,6 +30,7 @@ urlpatterns = [
     path("api/v1/", include("apps.foods.urls")),
     path("api/v1/", include(meal_urlpatterns)),
     path("api/v1/", include("apps.dashboard.urls")),
+    path("api/v1/", include("apps.sync.urls")),
     path("api/docs/", schema_view.with_ui("swagger", cache_timeout=0), name="schema-swagger-ui"),
     path("api/redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"),
 ]
@@ -4,9 +4,18 @@ import pytest
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from apps.foods.catalog import reset_catalog
 from apps.users.models import User, UserTarget
 
 
+@pytest.fixture(autouse=True)
+def _fresh_food_catalog():
+    """Tests roll back the database, so never reuse another test's catalog snapshot."""
+    reset_catalog()
+    yield
+    reset_catalog()
+
+
 @pytest.fixture
 def api_client():
     """Return an unauthenticated DRF APIClient instance."""